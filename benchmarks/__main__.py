@@ -0,0 +1,46 @@
+"""Benchmark suite of the eraser renderers
+
+Run with `python -m benchmarks`, e.g.
+
+    python -m benchmarks --save benchmarks/baselines/baseline.json
+    python -m benchmarks --compare benchmarks/baselines/baseline.json
+
+The standalone benchmarks are run with `python -m benchmarks.<name>`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import sys
+
+from . import cases  # pylint: disable=unused-import
+from .harness import CASES, add_baseline_arguments, check_baseline, run
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--scales",
+        default="1k,10k,100k",
+        help=f"comma-separated scales among {', '.join(SCALES)} (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cases", default="*", help="glob pattern of the cases (default: %(default)s)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measure")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    scales = [SCALES[scale] for scale in args.scales.split(",")]
+    selected = [
+        bench for name, bench in CASES.items() if fnmatch.fnmatch(name, args.cases)
+    ]
+    results = run(selected, scales, args.repeat)
+    return check_baseline(results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Throughput of the process-pool batch renderer by number of workers
+
+Run with `python -m benchmarks.batch_render`.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import time
+
+from diagrams.eraser import batch
+from diagrams.eraser import cloud_architecture as diagram
+
+JOBS = 200
+NODES = 2_000
+
+
+def build_service(index: int, nodes: int) -> None:
+    """Build a cloud architecture diagram of one service"""
+    vpc = diagram.Group(name=f"vpc-{index}", icon="aws-vpc")
+    previous = None
+    for number in range(nodes):
+        node = diagram.Node(name=f"node-{index}-{number}", icon="aws-ec2")
+        vpc.append(node)
+        if previous is not None:
+            previous.connect(node)
+        previous = node
+
+
+def main() -> None:
+    builders = [functools.partial(build_service, index, NODES) for index in range(JOBS)]
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+
+    started = time.perf_counter()
+    for builder in builders:
+        batch.render_job(builder)
+    baseline = time.perf_counter() - started
+    print(f"{'sequential':<12} {JOBS / baseline:>10.1f} diagrams/s")
+
+    for count in workers:
+        started = time.perf_counter()
+        batch.render_many(builders, workers=count)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{count:>2} workers   {JOBS / elapsed:>10.1f} diagrams/s"
+            f" {baseline / elapsed:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Synthetic diagrams measured by the benchmark suite
+
+Each case creates about `scale` elements in the active diagram.
+"""
+
+from __future__ import annotations
+
+from diagrams.eraser import cloud_architecture as cloud
+from diagrams.eraser import entity_relationship as er
+from diagrams.eraser import sequence
+
+from .harness import case
+
+ICONS = ("aws-ec2", "aws-rds", "aws-lambda", "aws-s3")
+
+
+@case("cloud/nodes-and-connections")
+def nodes_and_connections(scale: int) -> None:
+    """Half nodes, half connections between consecutive nodes"""
+    nodes = [
+        cloud.Node(name=f"node-{index}", icon=ICONS[index % len(ICONS)])
+        for index in range(scale // 2)
+    ]
+    for source, target in zip(nodes, nodes[1:]):
+        source.connect(target)
+
+
+@case("cloud/grouped-nodes")
+def grouped_nodes(scale: int) -> None:
+    """Groups of 100 nodes in a single top-level group"""
+    root = cloud.Group(name="region", icon="aws-region")
+    group = None
+    for index in range(scale):
+        if index % 100 == 0:
+            group = cloud.Group(name=f"subnet-{index // 100}", icon="aws-vpc")
+            root.append(group)
+        group.append(cloud.Node(name=f"node-{index}", icon="aws-ec2"))
+
+
+@case("cloud/deep-groups")
+def deep_groups(scale: int) -> None:
+    """A chain of nested groups ending with a node"""
+    parent = cloud.Group(name="group-0", icon="aws-vpc")
+    for index in range(1, scale):
+        group = cloud.Group(name=f"group-{index}", icon="aws-vpc")
+        parent.append(group)
+        parent = group
+    parent.append(cloud.Node(name="leaf", icon="aws-ec2"))
+
+
+@case("er/wide-entities")
+def wide_entities(scale: int) -> None:
+    """Entities of 1,000 attributes, each referencing the first entity"""
+    first_id = None
+    for index in range(max(scale // 1000, 1)):
+        entity = er.Entity(name=f"table_{index}", icon="database")
+        for number in range(min(scale, 1000)):
+            attribute = entity.add_attribute(f"column_{number}", "string", "")
+            if first_id is None:
+                first_id = attribute
+            elif number == 0:
+                attribute.many_to_one(first_id)
+
+
+@case("sequence/actions")
+def actions(scale: int) -> None:
+    """Requests and responses between ten participants"""
+    nodes = [sequence.Node(name=f"service-{index}") for index in range(10)]
+    for index in range(scale // 2):
+        client, server = nodes[index % 10], nodes[(index + 1) % 10]
+        client.request(f"request {index}", server)
+        server.response(f"response {index}", client)
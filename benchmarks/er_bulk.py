@@ -0,0 +1,72 @@
+"""Bulk builders of entity relationship diagrams against the per-call API
+
+Run with `python -m benchmarks.er_bulk`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import entity_relationship as er
+
+TABLES = 1_000
+COLUMNS = 50
+
+
+def schema() -> tuple[list[tuple], list[tuple]]:
+    """50k columns and one foreign key per table to the previous one"""
+    columns = [
+        (f"table_{table}", f"column_{column}", "string", "pk" if column == 0 else "")
+        for table in range(TABLES)
+        for column in range(COLUMNS)
+    ]
+    foreign_keys = [
+        (f"table_{table}", "column_1", f"table_{table - 1}", "column_0")
+        for table in range(1, TABLES)
+    ]
+    return columns, foreign_keys
+
+
+def per_call(columns: list[tuple], foreign_keys: list[tuple]) -> None:
+    entities: dict[str, er.Entity] = {}
+    for table, column, data_type, metadata in columns:
+        entity = entities.get(table)
+        if entity is None:
+            entity = entities[table] = er.Entity(table)
+        entity.add_attribute(column, data_type, metadata)
+    for table, column, referenced_table, referenced_column in foreign_keys:
+        attribute = er.EntityRelationship.get_attribute(f"{table}.{column}")
+        referenced = er.EntityRelationship.get_attribute(
+            f"{referenced_table}.{referenced_column}"
+        )
+        attribute.many_to_one(referenced)
+
+
+def bulk(columns: list[tuple], foreign_keys: list[tuple]) -> None:
+    er.entities_from_rows(columns)
+    er.relationships_from_rows(foreign_keys)
+
+
+def measure(label: str, build: Callable[[list, list], None]) -> str:
+    columns, foreign_keys = schema()
+    with Diagram() as diagram:
+        started = time.perf_counter()
+        build(columns, foreign_keys)
+        built = time.perf_counter() - started
+        started = time.perf_counter()
+        output = diagram.render_to_string()
+        drawn = time.perf_counter() - started
+    print(f"{label:<10} build {built * 1000:>8.1f} ms draw {drawn * 1000:>8.1f} ms")
+    return output
+
+
+def main() -> None:
+    print(f"{TABLES * COLUMNS:,} columns in {TABLES:,} tables")
+    measure("per-call", per_call)
+    measure("bulk", bulk)
+
+
+if __name__ == "__main__":
+    main()
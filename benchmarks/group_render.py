@@ -0,0 +1,71 @@
+"""Regression benchmark for rendering deeply nested and very wide groups
+
+Run with `python -m benchmarks.group_render`, the results can be saved as a JSON
+baseline and compared with one, failing when a render time regressed:
+
+    python -m benchmarks.group_render --save benchmarks/baselines/group_render.json
+    python -m benchmarks.group_render --compare benchmarks/baselines/group_render.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from diagrams.eraser import cloud_architecture as diagram
+
+from .harness import add_baseline_arguments, check_baseline
+
+
+def deep_groups(depth: int) -> diagram.Group:
+    """Build a chain of `depth` nested groups ending with a node"""
+    root = parent = diagram.Group(name="group-0", icon="aws-vpc")
+    for index in range(1, depth):
+        group = diagram.Group(name=f"group-{index}", icon="aws-vpc")
+        parent.append(group)
+        parent = group
+    parent.append(diagram.Node(name="leaf", icon="aws-ec2"))
+    return root
+
+
+def wide_groups(width: int) -> diagram.Group:
+    """Build a group with `width` sub-groups of one node each"""
+    root = diagram.Group(name="root", icon="aws-vpc")
+    for index in range(width):
+        group = diagram.Group(name=f"group-{index}")
+        group.append(diagram.Node(name=f"node-{index}", icon="aws-ec2"))
+        root.append(group)
+    return root
+
+
+def measure(label: str, root: diagram.Group) -> float:
+    """Render a group once, printing and returning the time in seconds"""
+    started = time.perf_counter()
+    output = root.render()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed * 1000:>10.1f} ms {len(output):>12,} chars")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.group_render")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for depth in (1_000, 10_000):
+        label = f"{depth:,}-deep groups"
+        results[label] = {"render_seconds": measure(label, deep_groups(depth))}
+        diagram.CloudArchitecture.reset()
+
+    for width in (10_000, 100_000):
+        label = f"{width:,}-wide groups"
+        results[label] = {"render_seconds": measure(label, wide_groups(width))}
+        diagram.CloudArchitecture.reset()
+
+    return check_baseline(results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
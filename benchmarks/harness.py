@@ -0,0 +1,186 @@
+"""Measure the benchmark cases and compare the results with a JSON baseline"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+import attrs
+
+from diagrams.eraser import Diagram
+
+# The metrics of a result compared with the baseline
+METRICS = ("construct_seconds", "draw_seconds", "redraw_seconds", "peak_bytes")
+
+
+@attrs.define
+class Case:
+    """A synthetic diagram built at a given scale
+
+    Args:
+        name (str): The name of the case
+        build (Callable[[int], None]): Creates the graphs of the diagram for a scale,
+            the number of elements of the diagram
+    """
+
+    name: str
+    build: Callable[[int], None]
+
+
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Callable[[int], None]], Callable[[int], None]]:
+    """Register a function building a diagram as a benchmark case"""
+
+    def decorator(build: Callable[[int], None]) -> Callable[[int], None]:
+        CASES[name] = Case(name=name, build=build)
+        return build
+
+    return decorator
+
+
+class NullWriter:
+    """A file-like object discarding everything"""
+
+    def write(self, chunk: str) -> int:
+        return len(chunk)
+
+
+def measure(bench: Case, scale: int, repeat: int = 3) -> dict[str, float]:
+    """Measure a case at a scale
+
+    The times are the best of `repeat` runs, the peak memory is measured by separate
+    runs as tracing the allocations slows everything down.
+
+    Returns:
+        dict[str, float]: The value of each metric
+    """
+    result = {metric: float("inf") for metric in METRICS}
+    for _ in range(repeat):
+        gc.collect()
+        with Diagram() as diagram:
+            started = time.perf_counter()
+            bench.build(scale)
+            built = time.perf_counter()
+        diagram.write(NullWriter())
+        drawn = time.perf_counter()
+        diagram.write(NullWriter())
+        redrawn = time.perf_counter()
+
+        result["construct_seconds"] = min(result["construct_seconds"], built - started)
+        result["draw_seconds"] = min(result["draw_seconds"], drawn - built)
+        result["redraw_seconds"] = min(result["redraw_seconds"], redrawn - drawn)
+        del diagram
+
+    # the first traced run of a process also counts one-time allocations
+    for _ in range(2):
+        gc.collect()
+        tracemalloc.start()
+        with Diagram() as diagram:
+            bench.build(scale)
+        diagram.write(NullWriter())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result["peak_bytes"] = min(result["peak_bytes"], peak)
+        del diagram
+    return result
+
+
+def run(
+    cases: Iterable[Case], scales: Iterable[int], repeat: int = 3
+) -> dict[str, dict[str, float]]:
+    """Measure cases at every scale, printing the results as they come
+
+    Returns:
+        dict[str, dict[str, float]]: The results by `case/scale` key
+    """
+    results = {}
+    for bench in cases:
+        for scale in scales:
+            key = f"{bench.name}/{scale}"
+            results[key] = measure(bench, scale, repeat)
+            print(format_result(key, results[key]), flush=True)
+    return results
+
+
+def format_result(key: str, result: dict[str, float]) -> str:
+    return (
+        f"{key:<40}"
+        f" construct {result['construct_seconds'] * 1000:>10.1f} ms"
+        f" draw {result['draw_seconds'] * 1000:>10.1f} ms"
+        f" redraw {result['redraw_seconds'] * 1000:>8.1f} ms"
+        f" peak {result['peak_bytes'] / 2**20:>9.1f} MiB"
+    )
+
+
+def save(results: dict[str, dict[str, float]], path: str) -> None:
+    """Save the results as a JSON baseline"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Compare the results with a baseline
+
+    Args:
+        results (dict): The results of the current run, by key then by metric
+        baseline (dict): The results of a previous run
+        tolerance (float): The accepted relative increase of a metric, e.g. 0.25
+
+    Returns:
+        list[str]: The description of every regression
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric, current in result.items():
+            previous = baseline[key].get(metric)
+            if previous and current > previous * (1 + tolerance):
+                regressions.append(
+                    f"{key} {metric}: {previous:.6g} -> {current:.6g}"
+                    f" (+{(current / previous - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the `--save`, `--compare` and `--tolerance` options of a benchmark"""
+    parser.add_argument("--save", metavar="PATH", help="save the results as baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="accepted relative increase of a metric (default: %(default)s)",
+    )
+
+
+def check_baseline(
+    results: dict[str, dict[str, float]], args: argparse.Namespace
+) -> int:
+    """Save or compare the results as requested by the baseline options
+
+    Returns:
+        int: The exit status, 1 when a metric regressed
+    """
+    if args.save:
+        save(results, args.save)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
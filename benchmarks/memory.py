@@ -0,0 +1,91 @@
+"""Memory used per graph object
+
+Run with `python -m benchmarks.memory`.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import Callable
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as cloud
+from diagrams.eraser import entity_relationship as er
+
+COUNT = 100_000
+
+
+def measure(label: str, build: Callable[[list], None], setup=None) -> None:
+    """Print the bytes allocated per object created by `build`"""
+    with Diagram():
+        keep: list = []
+        if setup is not None:
+            setup(keep)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        build(keep)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    print(f"{label:<28} {(after - before) / COUNT:>8.1f} bytes")
+
+
+def nodes(keep: list) -> None:
+    for index in range(COUNT):
+        keep.append(cloud.Node(name=f"node-{index}"))
+
+
+def nodes_with_icon(keep: list) -> None:
+    for index in range(COUNT):
+        keep.append(cloud.Node(name=f"node-{index}", icon="aws-ec2"))
+
+
+def groups(keep: list) -> None:
+    for index in range(COUNT):
+        keep.append(cloud.Group(name=f"group-{index}"))
+
+
+def two_nodes(keep: list) -> None:
+    keep.append(cloud.Node(name="source"))
+    keep.append(cloud.Node(name="target"))
+
+
+def connections(keep: list) -> None:
+    source, target = keep
+    for _ in range(COUNT):
+        source.connect(target)
+
+
+def entity(keep: list) -> None:
+    keep.append(er.Entity(name="table"))
+
+
+def attributes(keep: list) -> None:
+    table = keep[0]
+    for index in range(COUNT):
+        table.add_attribute(f"column_{index}", "string")
+
+
+def two_attributes(keep: list) -> None:
+    keep.append(er.Entity(name="users").add_attribute("id"))
+    keep.append(er.Entity(name="posts").add_attribute("user_id"))
+
+
+def relationships(keep: list) -> None:
+    users_id, posts_user_id = keep
+    for _ in range(COUNT):
+        users_id.one_to_many(posts_user_id)
+
+
+def main() -> None:
+    measure("node", nodes)
+    measure("node with an icon", nodes_with_icon)
+    measure("group", groups)
+    measure("attribute", attributes, setup=entity)
+    measure("connection (edge)", connections, setup=two_nodes)
+    measure("relationship (edge)", relationships, setup=two_attributes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Throughput of the parser in MB/s
+
+Run with `python -m benchmarks.parse`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import time
+from typing import Callable
+
+from diagrams.eraser import Diagram, parser
+
+from .cases import grouped_nodes, nodes_and_connections, wide_entities
+
+SCALE = 100_000
+
+
+def measure(label: str, build: Callable[[int], None], parse: Callable) -> None:
+    with Diagram() as diagram:
+        build(SCALE)
+    content = diagram.render_to_string()
+    size = len(content.encode("utf-8"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "diagram.eraser")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+        started = time.perf_counter()
+        parsed = parse(path)
+        elapsed = time.perf_counter() - started
+        assert parsed.render_to_string() == content
+
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                started = time.perf_counter()
+                parse(buffer)
+                mapped = time.perf_counter() - started
+
+    print(
+        f"{label:<28} {size / 2**20:>7.1f} MB"
+        f" file {size / 2**20 / elapsed:>6.1f} MB/s"
+        f" mmap {size / 2**20 / mapped:>6.1f} MB/s"
+    )
+
+
+def main() -> None:
+    measure(
+        "cloud/nodes-and-connections",
+        nodes_and_connections,
+        parser.parse_cloud_architecture,
+    )
+    measure("cloud/grouped-nodes", grouped_nodes, parser.parse_cloud_architecture)
+    measure("er/wide-entities", wide_entities, parser.parse_entity_relationship)
+
+
+if __name__ == "__main__":
+    main()
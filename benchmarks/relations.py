@@ -0,0 +1,97 @@
+"""Rendering of the relationships of entity relationship diagrams
+
+Compares the current fast paths with the previous implementations, kept here as
+reference: qualified names formatted on every call, enum values looked up and
+formatted per relation, and one fragment per relation.
+
+Run with `python -m benchmarks.relations`.
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import timeit
+from typing import Callable, Iterator
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import entity_relationship as er
+from diagrams.eraser.relations import Relations, render_relations
+
+TABLES = 1_000
+COLUMNS = 100
+REPEAT = 5
+
+
+def legacy_qualified_name(attribute: er.Attribute) -> str:
+    # the slots are read directly, as the entity name was a plain slot
+    return sys.intern(f"{attribute._parent_name}.{attribute._name}")
+
+
+def legacy_render(relation: Relations) -> str:
+    line = f"{relation.source} {relation.relation.value} {relation.target}"
+    return line if relation.label is None else f"{line} : {relation.label}"
+
+
+def legacy_fragments(relations: list[Relations]) -> Iterator[str]:
+    for relation in relations:
+        yield legacy_render(relation)
+        yield "\n"
+
+
+def median_time(function: Callable[[], object]) -> float:
+    """The median time of a call in seconds"""
+    return statistics.median(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def report(label: str, legacy: float, current: float) -> None:
+    print(
+        f"{label:<16} legacy {legacy * 1000:>7.1f} ms"
+        f"  current {current * 1000:>7.1f} ms  x{legacy / current:.1f}"
+    )
+
+
+def main() -> None:
+    with Diagram():
+        entities = er.entities_from_rows(
+            (f"table_{table}", f"column_{column}", "string", "")
+            for table in range(TABLES)
+            for column in range(COLUMNS)
+        )
+        attributes = [
+            attribute for entity in entities.values() for attribute in entity.attributes
+        ]
+        pairs = [
+            (attribute, attributes[(index * 7919) % len(attributes)])
+            for index, attribute in enumerate(attributes)
+        ]
+        endpoints = [attribute for pair in pairs for attribute in pair]
+        print(f"{len(pairs):,} relationships")
+
+        report(
+            "qualified names",
+            median_time(lambda: [legacy_qualified_name(a) for a in endpoints]),
+            median_time(lambda: [a.qualified_name for a in endpoints]),
+        )
+
+        for source, target in pairs:
+            source.many_to_one(target)
+        relations = [
+            graph
+            for graph in er.EntityRelationship.registry().graphs
+            if isinstance(graph, Relations)
+        ]
+        report(
+            "render",
+            median_time(lambda: [legacy_render(relation) for relation in relations]),
+            median_time(lambda: [relation.render() for relation in relations]),
+        )
+        report(
+            "draw",
+            median_time(lambda: "".join(legacy_fragments(relations))),
+            median_time(lambda: render_relations(relations)),
+        )
+
+
+if __name__ == "__main__":
+    main()
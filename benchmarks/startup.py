@@ -0,0 +1,49 @@
+"""Import time of the package, as reported by `python -X importtime`
+
+Run with `python -m benchmarks.startup`.
+"""
+
+from __future__ import annotations
+
+import re
+import statistics
+import subprocess
+import sys
+
+REPEAT = 10
+
+STATEMENTS = [
+    "import diagrams.eraser",
+    "from diagrams.eraser import Diagram",
+    "import diagrams.eraser.sequence",
+    "import diagrams.eraser.cloud_architecture",
+    "import diagrams.eraser.entity_relationship",
+]
+
+IMPORT_TIME = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \| (\S+)$")
+
+
+def cumulative(statement: str) -> int:
+    """The cumulative import time of the package in microseconds"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # the outermost imports are not indented, the interpreter startup is left out
+    return sum(
+        int(match[2])
+        for match in map(IMPORT_TIME.match, process.stderr.splitlines())
+        if match is not None and match[3].startswith("diagrams")
+    )
+
+
+def main() -> None:
+    for statement in STATEMENTS:
+        times = [cumulative(statement) for _ in range(REPEAT)]
+        print(f"{statement:<44} {statistics.median(times) / 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Render Python diagram scripts to `.eraser` files
+
+Each script is executed in its own worker process within a `Diagram`, and the diagram
+is written next to it, e.g. `network.py` to `network.eraser`. Scripts whose source and
+output did not change since the previous run are skipped, `--force` renders them anyway,
+e.g. when a module they import changed.
+
+Usage:
+
+    diagrams docs/diagrams
+    diagrams "docs/**/*_diagram.py" --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import json
+import os
+import pathlib
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+from .eraser.batch import render_job
+
+__all__ = [
+    "main",
+    "render_script",
+]
+
+OUTPUT_SUFFIX = ".eraser"
+DEFAULT_MANIFEST = ".diagrams.json"
+
+
+def render_script(path: str) -> tuple[str, float]:
+    """Execute a diagram script as `__main__` and render its diagram
+
+    The script directory is importable, as when running `python <script>`, and what
+    the script prints is discarded, e.g. a final `CloudArchitecture.draw()`.
+
+    Args:
+        path (str): The path of the script
+
+    Returns:
+        tuple[str, float]: The rendered diagram and the elapsed time in seconds
+
+    Raises:
+        RuntimeError: If the script calls `sys.exit()`, which would otherwise stop the
+            worker process and the whole run
+    """
+    started = time.perf_counter()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = render_job(
+                functools.partial(runpy.run_path, path, run_name="__main__")
+            )
+    except SystemExit as error:
+        raise RuntimeError(f"the script exited with {error.code!r}") from None
+    finally:
+        del sys.path[0]
+    return output, time.perf_counter() - started
+
+
+def find_scripts(patterns: Iterable[str]) -> list[pathlib.Path]:
+    """Expand the directories and glob patterns into diagram scripts
+
+    Directories are searched recursively, modules starting with `_` are left out.
+
+    Args:
+        patterns (Iterable[str]): Paths of scripts or directories, or glob patterns
+
+    Returns:
+        list[pathlib.Path]: The scripts, sorted and without duplicates
+    """
+    scripts: set[pathlib.Path] = set()
+    for pattern in patterns:
+        paths = [pathlib.Path(path) for path in glob.glob(pattern, recursive=True)]
+        for path in paths:
+            if path.is_dir():
+                scripts.update(
+                    script
+                    for script in path.rglob("*.py")
+                    if not script.name.startswith("_")
+                )
+            elif path.suffix == ".py":
+                scripts.add(path)
+    return sorted(scripts)
+
+
+def digest(path: pathlib.Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def file_state(path: pathlib.Path) -> dict:
+    """The modification time and the hash of a file, as recorded in the manifest"""
+    return {"mtime_ns": path.stat().st_mtime_ns, "hash": digest(path)}
+
+
+def is_unchanged(path: pathlib.Path, state: dict | None) -> bool:
+    """Whether a file is the same as recorded in the manifest
+
+    The modification times are compared first, the content is only hashed when they
+    differ, e.g. after a checkout.
+    """
+    if state is None:
+        return False
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return mtime_ns == state["mtime_ns"] or digest(path) == state["hash"]
+
+
+def iter_results(
+    scripts: list[pathlib.Path], jobs: int | None
+) -> Iterator[tuple[pathlib.Path, str | None, float, BaseException | None]]:
+    """Render scripts in worker processes, yielding them as they finish
+
+    Each worker process renders a single script on Python 3.11+, so no state can leak
+    from a script to another.
+
+    Yields:
+        tuple: The script, its rendered diagram, the elapsed time and the error raised
+            by the script if any
+    """
+    options = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+    with ProcessPoolExecutor(max_workers=jobs, **options) as executor:
+        futures = {
+            executor.submit(render_script, str(script)): script for script in scripts
+        }
+        for future in as_completed(futures):
+            try:
+                output, elapsed = future.result()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                yield futures[future], None, 0.0, error
+            else:
+                yield futures[future], output, elapsed, None
+
+
+def load_manifest(path: pathlib.Path) -> dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="diagrams", description="Render Python diagram scripts to .eraser files"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="diagram scripts, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="worker processes (default: the CPU count)"
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="render the unchanged scripts too"
+    )
+    parser.add_argument(
+        "--manifest",
+        default=DEFAULT_MANIFEST,
+        help="where the state of the previous run is kept (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    manifest_path = pathlib.Path(args.manifest)
+    manifest = load_manifest(manifest_path)
+    scripts = find_scripts(args.paths)
+    if not scripts:
+        print("no diagram scripts found", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    pending = []
+    for script in scripts:
+        output = script.with_suffix(OUTPUT_SUFFIX)
+        entry = manifest.get(str(script), {})
+        if (
+            not args.force
+            and is_unchanged(script, entry.get("source"))
+            and is_unchanged(output, entry.get("output"))
+        ):
+            print(f"{'skipped':<9} {'':>10}  {script}")
+        else:
+            pending.append(script)
+
+    failures = 0
+    if pending:
+        for script, rendered, elapsed, error in iter_results(pending, args.jobs):
+            if error is not None:
+                failures += 1
+                manifest.pop(str(script), None)
+                print(f"{'failed':<9} {'':>10}  {script}: {error!r}")
+                continue
+            output = script.with_suffix(OUTPUT_SUFFIX)
+            with open(output, "w", encoding="utf-8") as file:
+                file.write(rendered)
+            manifest[str(script)] = {
+                "source": file_state(script),
+                "output": file_state(output),
+            }
+            print(f"{'rendered':<9} {elapsed * 1000:>7.1f} ms  {script}")
+
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(pending) - failures} rendered, {len(scripts) - len(pending)} skipped,"
+        f" {failures} failed in {elapsed:.2f} s"
+    )
+    return 1 if failures else 0
@@ -0,0 +1,574 @@
+"""Emitters rendering the intermediate representation to the diagrams-as-code providers
+
+Each emitter renders an `IR` in a single linear walk, one method per diagram type
+yielding the lines of its section. New providers are added by registering a subclass
+of `Emitter`.
+
+Example:
+    @register
+    class D2Emitter(Emitter):
+        name = "d2"
+
+        def cloud_architecture(self, section: Section) -> Iterator[str]:
+            ...
+
+    outputs = emit(ir.build(diagram), "eraser", "d2")
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+from .eraser.properties import NotSupportedError, Properties
+from .eraser.relations import ArrowType, EntityRelationshipType
+from .ir import (
+    IR,
+    Activation,
+    Attribute,
+    Block,
+    BlockEnd,
+    Edge,
+    Entity,
+    Group,
+    Item,
+    Node,
+    Relation,
+    Section,
+)
+
+__all__ = [
+    "EMITTERS",
+    "Emitter",
+    "EraserEmitter",
+    "MermaidEmitter",
+    "PlantUMLEmitter",
+    "DotEmitter",
+    "emit",
+    "register",
+]
+
+# The registered emitters by name
+EMITTERS: dict[str, type[Emitter]] = {}
+
+# The characters structuring the labels of the DOT records
+RECORD_SPECIAL = re.compile(r"[{}|<>]")
+
+
+def register(emitter: type[Emitter]) -> type[Emitter]:
+    """Register an emitter under its name, usable as a class decorator"""
+    EMITTERS[emitter.name] = emitter
+    return emitter
+
+
+def emit(ir: IR, *formats: str) -> dict[str, str]:
+    """Render the same IR in several formats
+
+    Args:
+        ir (IR): The IR, built once
+        *formats (str): The names of the registered emitters, e.g. `mermaid`
+
+    Returns:
+        dict[str, str]: The output by format
+
+    Raises:
+        KeyError: If a format has no registered emitter
+    """
+    return {name: EMITTERS[name]().render(ir) for name in formats}
+
+
+class Emitter:
+    """Base class of the emitters
+
+    Subclasses set the `name` of the format and implement the methods named after the
+    section kinds, see `Section`, yielding the lines of the section.
+    """
+
+    name: str
+
+    def __init__(self) -> None:
+        # the identifiers by name, and the identifiers taken, see `.identifier()`
+        self._identifiers: dict[str, str] = {}
+        self._taken: set[str] = set()
+
+    def render(self, ir: IR) -> str:
+        """Render the IR
+
+        Returns:
+            str: The lines, each one ending with a newline
+        """
+        return "".join(f"{line}\n" for line in self.emit(ir))
+
+    def emit(self, ir: IR) -> Iterator[str]:
+        """Render the IR line by line
+
+        Yields:
+            str: The lines of the sections in order
+
+        Raises:
+            NotSupportedError: If the format does not support a diagram type
+        """
+        self._identifiers.clear()
+        self._taken.clear()
+        for section in ir.sections:
+            method = getattr(self, section.kind, None)
+            if method is None:
+                raise NotSupportedError(f"{self.name} does not support {section.kind}")
+            yield from method(section)
+
+    def identifier(self, name: str) -> str:
+        """A unique identifier for a name, for the formats quoting the labels only
+
+        Names made of the same identifier characters, e.g. `web-1` and `web_1`, get a
+        numbered suffix from the second one, e.g. `web_1_2`, in the order they are
+        first seen while emitting the IR.
+
+        Args:
+            name (str): The name of a graph
+
+        Returns:
+            str: The identifier, the same one for every occurrence of the name
+        """
+        identifier = self._identifiers.get(name)
+        if identifier is None:
+            identifier = base = _identifier(name)
+            suffix = 1
+            while identifier in self._taken:
+                suffix += 1
+                identifier = f"{base}_{suffix}"
+            self._identifiers[name] = identifier
+            self._taken.add(identifier)
+        return identifier
+
+
+def _edges(section: Section) -> Iterator[Item]:
+    """The top-level items, then the edges of the edge table"""
+    yield from section.items
+    yield from section.iter_edges()
+
+
+def _unexpected(section: Section, item: Item) -> TypeError:
+    """The error for an item which is not drawn in the diagrams of a section"""
+    return TypeError(f"unexpected {type(item).__name__} in a {section.kind} section")
+
+
+def _identifier(name: str) -> str:
+    """A name usable as an identifier, see `Emitter.identifier()`"""
+    return re.sub(r"\W", "_", name) or "_"
+
+
+def _attribute_text(attribute: Attribute) -> str:
+    """The name, type and metadata of an attribute separated by single spaces"""
+    values = (attribute.name, attribute.data_type, attribute.metadata)
+    return " ".join(value for value in values if value)
+
+
+def _split(qualified_name: str) -> tuple[str, str]:
+    """Split an `entity.attribute` name, see `ir.Edge`"""
+    entity, _, attribute = qualified_name.partition(".")
+    return entity, attribute
+
+
+@register
+class EraserEmitter(Emitter):
+    """eraser.io, the same output as drawing the diagram"""
+
+    name = "eraser"
+
+    @staticmethod
+    def header(item: Node | Group | Entity) -> str:
+        properties = Properties.of(icon=item.icon, color=item.color)
+        return f"{item.name} {properties.render()}"
+
+    @staticmethod
+    def edge(edge: Edge) -> str:
+        line = f"{edge.source} {edge.relation.value} {edge.target}"
+        return line if edge.label is None else f"{line} : {edge.label}"
+
+    def cloud_architecture(self, section: Section) -> Iterator[str]:
+        for item in section.items:
+            if isinstance(item, Edge):
+                yield self.edge(item)
+                continue
+            if not isinstance(item, (Node, Group)):
+                raise _unexpected(section, item)
+            # the children of a group, then its end, are popped from a stack
+            stack: list[Node | Group | str] = [item]
+            while stack:
+                graph = stack.pop()
+                if isinstance(graph, str):
+                    yield graph
+                elif isinstance(graph, Group):
+                    yield f"{self.header(graph)} {{"
+                    stack.append("}")
+                    stack.extend(reversed(graph.children))
+                    if not graph.children:
+                        stack.append("")
+                else:
+                    yield self.header(graph)
+        if section.edges is not None:
+            yield from section.edges.iter_lines()
+
+    def entity_relationship(self, section: Section) -> Iterator[str]:
+        for item in section.items:
+            if isinstance(item, Edge):
+                yield self.edge(item)
+                continue
+            if not isinstance(item, Entity):
+                raise _unexpected(section, item)
+            yield f"{self.header(item)} {{"
+            for attribute in item.attributes:
+                line = f"{attribute.name} {attribute.data_type} {attribute.metadata}"
+                yield line.strip()
+            if not item.attributes:
+                yield ""
+            yield "}"
+        if section.edges is not None:
+            yield from section.edges.iter_lines()
+
+    def sequence(self, section: Section) -> Iterator[str]:
+        for item in section.items:
+            if isinstance(item, Edge):
+                yield self.edge(item)
+            elif isinstance(item, Activation):
+                yield f"{'activate' if item.active else 'deactivate'} {item.name}"
+            elif isinstance(item, Block):
+                label = f"[label: {item.label}]" if item.label else ""
+                yield f"{item.name} {label} {{"
+            elif isinstance(item, BlockEnd):
+                yield "}"
+            else:
+                yield self.header(item)
+
+
+@register
+class MermaidEmitter(Emitter):
+    """Mermaid flowcharts, entity relationship and sequence diagrams"""
+
+    name = "mermaid"
+
+    FLOWCHART_LINKS: dict[Relation, str] = {
+        ArrowType.LEFT_TO_RIGHT_ARROW: "-->",
+        ArrowType.RIGHT_TO_LEFT_ARROW: "-->",
+        ArrowType.BI_DIRECTIONAL_ARROW: "<-->",
+        ArrowType.LINE: "---",
+        ArrowType.DOTTED_LINE: "-.-",
+        ArrowType.DOTTED_ARROW: "-.->",
+    }
+    MESSAGES: dict[Relation, str] = {
+        ArrowType.LEFT_TO_RIGHT_ARROW: "->>",
+        ArrowType.RIGHT_TO_LEFT_ARROW: "->>",
+        ArrowType.BI_DIRECTIONAL_ARROW: "<<->>",
+        ArrowType.LINE: "->",
+        ArrowType.DOTTED_LINE: "-->",
+        ArrowType.DOTTED_ARROW: "-->>",
+    }
+    CARDINALITIES: dict[Relation, str] = {
+        EntityRelationshipType.ONE_TO_ONE: "||--||",
+        EntityRelationshipType.ONE_TO_MANY: "||--o{",
+        EntityRelationshipType.MANY_TO_ONE: "}o--||",
+        EntityRelationshipType.MANY_TO_MANY: "}o--o{",
+    }
+    KEYS = {"pk": "PK", "fk": "FK"}
+
+    @staticmethod
+    def quote(text: str) -> str:
+        return '"' + text.replace('"', "#quot;") + '"'
+
+    def cloud_architecture(self, section: Section) -> Iterator[str]:
+        yield "flowchart LR"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                source, target = self.identifier(item.source), self.identifier(
+                    item.target
+                )
+                if item.relation is ArrowType.RIGHT_TO_LEFT_ARROW:
+                    source, target = target, source
+                link = self.FLOWCHART_LINKS[item.relation]
+                if item.label is not None:
+                    link = f"{link}|{self.quote(item.label)}|"
+                yield f"    {source} {link} {target}"
+                continue
+            if not isinstance(item, (Node, Group)):
+                raise _unexpected(section, item)
+            # the groups are ended when their end is popped from the stack
+            stack: list[tuple[Node | Group | str, int]] = [(item, 1)]
+            while stack:
+                graph, depth = stack.pop()
+                indent = "    " * depth
+                if isinstance(graph, str):
+                    yield f"{indent}{graph}"
+                elif isinstance(graph, Group):
+                    identifier = self.identifier(graph.name)
+                    yield f"{indent}subgraph {identifier}[{self.quote(graph.name)}]"
+                    stack.append(("end", depth))
+                    stack.extend(
+                        (child, depth + 1) for child in reversed(graph.children)
+                    )
+                else:
+                    identifier = self.identifier(graph.name)
+                    yield f"{indent}{identifier}[{self.quote(graph.name)}]"
+
+    def entity_relationship(self, section: Section) -> Iterator[str]:
+        yield "erDiagram"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                source, source_attribute = _split(item.source)
+                target, _ = _split(item.target)
+                cardinality = self.CARDINALITIES[item.relation]
+                label = self.quote(item.label or source_attribute)
+                yield (
+                    f"    {self.identifier(source)} {cardinality} {self.identifier(target)}"
+                    f" : {label}"
+                )
+                continue
+            if not isinstance(item, Entity):
+                raise _unexpected(section, item)
+            if not item.attributes:
+                yield f"    {self.identifier(item.name)}"
+                continue
+            yield f"    {self.identifier(item.name)} {{"
+            for attribute in item.attributes:
+                line = f"{_identifier(attribute.data_type or 'string')}"
+                line = f"{line} {_identifier(attribute.name)}"
+                key = self.KEYS.get(attribute.metadata)
+                if key is not None:
+                    line = f"{line} {key}"
+                elif attribute.metadata:
+                    line = f"{line} {self.quote(attribute.metadata)}"
+                yield f"        {line}"
+            yield "    }"
+
+    def sequence(self, section: Section) -> Iterator[str]:
+        yield "sequenceDiagram"
+        depth = 1
+        for item in section.items:
+            indent = "    " * depth
+            if isinstance(item, Edge):
+                source, target = self.identifier(item.source), self.identifier(
+                    item.target
+                )
+                if item.relation is ArrowType.RIGHT_TO_LEFT_ARROW:
+                    source, target = target, source
+                message = self.MESSAGES[item.relation]
+                yield f"{indent}{source}{message}{target}: {item.label or ''}"
+            elif isinstance(item, Activation):
+                state = "activate" if item.active else "deactivate"
+                yield f"{indent}{state} {self.identifier(item.name)}"
+            elif isinstance(item, Block):
+                yield f"{indent}{item.name} {item.label or ''}".rstrip()
+                depth += 1
+            elif isinstance(item, BlockEnd):
+                depth -= 1
+                yield f"{indent[4:]}end"
+            else:
+                yield f"{indent}participant {self.identifier(item.name)} as {item.name}"
+
+
+@register
+class PlantUMLEmitter(Emitter):
+    """PlantUML component, information engineering and sequence diagrams
+
+    Each section is a diagram between `@startuml` and `@enduml`.
+    """
+
+    name = "plantuml"
+
+    ARROWS: dict[Relation, str] = {
+        ArrowType.LEFT_TO_RIGHT_ARROW: "-->",
+        ArrowType.RIGHT_TO_LEFT_ARROW: "<--",
+        ArrowType.BI_DIRECTIONAL_ARROW: "<-->",
+        ArrowType.LINE: "--",
+        ArrowType.DOTTED_LINE: "..",
+        ArrowType.DOTTED_ARROW: "..>",
+    }
+    MESSAGES: dict[Relation, str] = {
+        ArrowType.LEFT_TO_RIGHT_ARROW: "->",
+        ArrowType.RIGHT_TO_LEFT_ARROW: "<-",
+        ArrowType.BI_DIRECTIONAL_ARROW: "<->",
+        ArrowType.LINE: "->",
+        ArrowType.DOTTED_LINE: "-->",
+        ArrowType.DOTTED_ARROW: "-->",
+    }
+    CARDINALITIES: dict[Relation, str] = MermaidEmitter.CARDINALITIES
+
+    def declare(self, kind: str, name: str) -> str:
+        return f'{kind} "{name}" as {self.identifier(name)}'
+
+    @staticmethod
+    def label(label: str | None) -> str:
+        return "" if label is None else f" : {label}"
+
+    def cloud_architecture(self, section: Section) -> Iterator[str]:
+        yield "@startuml"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                source, target = self.identifier(item.source), self.identifier(
+                    item.target
+                )
+                arrow = self.ARROWS[item.relation]
+                yield f"{source} {arrow} {target}{self.label(item.label)}"
+                continue
+            if not isinstance(item, (Node, Group)):
+                raise _unexpected(section, item)
+            stack: list[tuple[Node | Group | str, int]] = [(item, 0)]
+            while stack:
+                graph, depth = stack.pop()
+                indent = "  " * depth
+                if isinstance(graph, str):
+                    yield f"{indent}{graph}"
+                elif isinstance(graph, Group):
+                    yield f"{indent}{self.declare('rectangle', graph.name)} {{"
+                    stack.append(("}", depth))
+                    stack.extend(
+                        (child, depth + 1) for child in reversed(graph.children)
+                    )
+                else:
+                    yield f"{indent}{self.declare('node', graph.name)}"
+        yield "@enduml"
+
+    def entity_relationship(self, section: Section) -> Iterator[str]:
+        yield "@startuml"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                source, source_attribute = _split(item.source)
+                target, _ = _split(item.target)
+                cardinality = self.CARDINALITIES[item.relation]
+                yield (
+                    f"{self.identifier(source)} {cardinality} {self.identifier(target)}"
+                    f"{self.label(item.label or source_attribute)}"
+                )
+                continue
+            if not isinstance(item, Entity):
+                raise _unexpected(section, item)
+            yield f"{self.declare('entity', item.name)} {{"
+            for attribute in item.attributes:
+                line = attribute.name
+                if attribute.data_type:
+                    line = f"{line} : {attribute.data_type}"
+                if attribute.metadata:
+                    line = f"{line} <<{attribute.metadata}>>"
+                yield f"  {'* ' if attribute.metadata == 'pk' else ''}{line}"
+            yield "}"
+        yield "@enduml"
+
+    def sequence(self, section: Section) -> Iterator[str]:
+        yield "@startuml"
+        depth = 0
+        for item in section.items:
+            indent = "  " * depth
+            if isinstance(item, Edge):
+                source, target = self.identifier(item.source), self.identifier(
+                    item.target
+                )
+                message = self.MESSAGES[item.relation]
+                yield f"{indent}{source} {message} {target}{self.label(item.label)}"
+            elif isinstance(item, Activation):
+                state = "activate" if item.active else "deactivate"
+                yield f"{indent}{state} {self.identifier(item.name)}"
+            elif isinstance(item, Block):
+                yield f"{indent}{item.name} {item.label or ''}".rstrip()
+                depth += 1
+            elif isinstance(item, BlockEnd):
+                depth -= 1
+                yield f"{indent[2:]}end"
+            else:
+                yield f"{indent}{self.declare('participant', item.name)}"
+        yield "@enduml"
+
+
+@register
+class DotEmitter(Emitter):
+    """Graphviz DOT, each section is a `digraph`
+
+    The groups are drawn as clusters and the entities as records. Sequences are drawn
+    as their participants and numbered messages, without the activations and blocks.
+    """
+
+    name = "dot"
+
+    ATTRIBUTES: dict[Relation, str] = {
+        ArrowType.LEFT_TO_RIGHT_ARROW: "",
+        ArrowType.RIGHT_TO_LEFT_ARROW: "dir=back",
+        ArrowType.BI_DIRECTIONAL_ARROW: "dir=both",
+        ArrowType.LINE: "dir=none",
+        ArrowType.DOTTED_LINE: "dir=none, style=dashed",
+        ArrowType.DOTTED_ARROW: "style=dashed",
+        EntityRelationshipType.ONE_TO_ONE: "dir=both, arrowtail=tee, arrowhead=tee",
+        EntityRelationshipType.ONE_TO_MANY: "dir=both, arrowtail=tee, arrowhead=crow",
+        EntityRelationshipType.MANY_TO_ONE: "dir=both, arrowtail=crow, arrowhead=tee",
+        EntityRelationshipType.MANY_TO_MANY: "dir=both, arrowtail=crow, arrowhead=crow",
+    }
+
+    @staticmethod
+    def quote(text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def edge(
+        self, source: str, target: str, relation: Relation, label: str | None
+    ) -> str:
+        attributes = self.ATTRIBUTES[relation]
+        if label is not None:
+            label = f"label={self.quote(label)}"
+            attributes = f"{attributes}, {label}" if attributes else label
+        line = f"{self.quote(source)} -> {self.quote(target)}"
+        return f"  {line} [{attributes}];" if attributes else f"  {line};"
+
+    def cloud_architecture(self, section: Section) -> Iterator[str]:
+        yield "digraph {"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                yield self.edge(item.source, item.target, item.relation, item.label)
+                continue
+            if not isinstance(item, (Node, Group)):
+                raise _unexpected(section, item)
+            stack: list[tuple[Node | Group | str, int]] = [(item, 1)]
+            while stack:
+                graph, depth = stack.pop()
+                indent = "  " * depth
+                if isinstance(graph, str):
+                    yield f"{indent}{graph}"
+                elif isinstance(graph, Group):
+                    cluster = self.quote(f"cluster_{graph.name}")
+                    yield f"{indent}subgraph {cluster} {{"
+                    yield f"{indent}  label={self.quote(graph.name)};"
+                    stack.append(("}", depth))
+                    stack.extend(
+                        (child, depth + 1) for child in reversed(graph.children)
+                    )
+                else:
+                    yield f"{indent}{self.quote(graph.name)};"
+        yield "}"
+
+    def entity_relationship(self, section: Section) -> Iterator[str]:
+        yield "digraph {"
+        yield "  node [shape=record];"
+        for item in _edges(section):
+            if isinstance(item, Edge):
+                source, source_attribute = _split(item.source)
+                target, _ = _split(item.target)
+                label = item.label or source_attribute
+                yield self.edge(source, target, item.relation, label)
+                continue
+            if not isinstance(item, Entity):
+                raise _unexpected(section, item)
+            # one field per attribute, the characters structuring records are escaped
+            fields = [_attribute_text(attribute) for attribute in item.attributes]
+            record = "|".join(
+                RECORD_SPECIAL.sub(r"\\\g<0>", value) for value in (item.name, *fields)
+            )
+            record = "{" + record.replace('"', '\\"') + "}"
+            yield f'  {self.quote(item.name)} [label="{record}"];'
+        yield "}"
+
+    def sequence(self, section: Section) -> Iterator[str]:
+        yield "digraph {"
+        number = 0
+        for item in section.items:
+            if isinstance(item, Edge):
+                number += 1
+                label = f"{number}. {item.label or ''}".rstrip()
+                yield self.edge(item.source, item.target, item.relation, label)
+            elif isinstance(item, Node):
+                yield f"  {self.quote(item.name)};"
+        yield "}"
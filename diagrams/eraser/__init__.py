@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import importlib
+
+# `typing` is slow to import and only used by annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from . import (
+        batch,
+        cache,
+        cloud_architecture,
+        entity_relationship,
+        pages,
+        parser,
+        recorder,
+        schema,
+        sequence,
+        simplify,
+        validate,
+    )
+    from .base import Diagram
+
+__all__ = [
+    "Diagram",
+]
+
+# The submodules are imported on first access, so a script only pays for the diagram
+# types it uses
+_SUBMODULES = frozenset(
+    {
+        "batch",
+        "cache",
+        "cloud_architecture",
+        "entity_relationship",
+        "pages",
+        "parser",
+        "recorder",
+        "schema",
+        "sequence",
+        "simplify",
+        "validate",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "Diagram":
+        from .base import Diagram  # pylint: disable=import-outside-toplevel
+
+        globals()["Diagram"] = Diagram
+        return Diagram
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__, *_SUBMODULES})
@@ -1,8 +1,101 @@
 from __future__ import annotations
 
+import contextvars
+import sys
+import time
+
+from . import instrument
+
+# `typing` is slow to import and only used by annotations, see `diagrams.eraser`
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import hashlib
+    from typing import (
+        Any,
+        Callable,
+        Coroutine,
+        Iterable,
+        Iterator,
+        Self,
+        Sequence,
+        TextIO,
+    )
+
+    from .cache import RenderCache
+    from .diff import Patch
+    from .properties import Properties
+
+# Flush the output once this many characters have been buffered
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def buffered(fragments: Iterable[str], buffer_size: int) -> Iterator[str]:
+    """Join small fragments into chunks of at least `buffer_size` characters
+
+    Args:
+        fragments (Iterable[str]): The fragments to join
+        buffer_size (int): The minimum size of a chunk, except for the last one
+
+    Yields:
+        str: The joined chunks
+    """
+    buffer: list[str] = []
+    size = 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= buffer_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def update_fingerprint(hasher: hashlib.blake2b, roots: Iterable[Graph]) -> None:
+    """Feed graphs and the graphs they contain to a hasher, in drawing order
+
+    Each graph adds its type, its `.state()` and its number of members, the members
+    are walked with an explicit stack, nothing is rendered.
+
+    Args:
+        hasher (hashlib.blake2b): The hasher to update
+        roots (Iterable[Graph]): The top-level graphs
+    """
+    for root in roots:
+        stack = [root]
+        while stack:
+            graph = stack.pop()
+            members = graph.members()
+            kind = type(graph).__name__
+            record = f"{kind}\x1f{graph.state()!r}\x1f{len(members)}\n"
+            hasher.update(record.encode())
+            stack.extend(reversed(members))
+
+
+class DuplicateNameError(ValueError):
+    pass
+
 
 class Graph:
-    """Base class for all graphs in the diagram"""
+    """Base class for all graphs in the diagram
+
+    Subclasses declare `__slots__` for the attributes they use, `._name`, `._parent`
+    and `._properties` included, so no graph carries a `__dict__`. They are only
+    annotated here, the relations are slotted by attrs and a second base with slots
+    would conflict with their layout.
+
+    Graphs with `unique_name` set are indexed by name in their registry, and creating
+    two of them with the same name raises `DuplicateNameError`.
+    """
+
+    __slots__ = ()
+
+    _name: str
+    _parent: Graph | None
+    _properties: Properties
+
+    unique_name = False
 
     @property
     def name(self) -> str:
@@ -11,19 +104,700 @@ class Graph:
 
     @name.setter
     def name(self, value: str) -> None:
-        """Set the graph name"""
-        self._name = value
+        """Set the graph name, see `._set_name()`"""
+        self._set_name(value)
+
+    def _set_name(self, value: str) -> None:
+        """Set the graph name, overridden by the graphs indexing their names
+
+        Names are interned as they are repeated by relations.
+
+        Args:
+            value (str): The new name
+        """
+        self._name = sys.intern(value)
+        self.invalidate()
 
     @property
-    def parent(self) -> Graph:
+    def parent(self) -> Graph | None:
         """Graph parent"""
         return self._parent
 
     @parent.setter
-    def parent(self, graph: Graph) -> None:
+    def parent(self, graph: Graph | None) -> None:
         """Set the graph parent"""
         self._parent = graph
 
+    @property
+    def properties(self) -> Properties:
+        """Graph properties"""
+        return self._properties
+
+    @properties.setter
+    def properties(self, value: Properties) -> None:
+        """Set the graph properties"""
+        self._properties = value
+        self.invalidate()
+
+    def register(self, registry: Registry) -> None:
+        """Called once the graph is added to a registry
+
+        Args:
+            registry (Registry): The registry of the graph
+        """
+
+    def invalidate(self) -> None:
+        """Notify that the output of the graph changed"""
+
+    def state(self) -> tuple:
+        """The values drawn for the graph itself, used to fingerprint the diagram
+
+        Returns:
+            tuple: The values, without the graphs of `.members()`
+        """
+        return ()
+
+    def members(self) -> Sequence[Graph]:
+        """The graphs drawn inside the graph
+
+        Returns:
+            Sequence[Graph]: The contained graphs in drawing order
+        """
+        return ()
+
     def render(self) -> str:
         """Render the graph as a string"""
         raise NotImplementedError("`.render()` should be implemented")
+
+    def fragments(self) -> Iterator[str]:
+        """Render the graph as a stream of fragments
+
+        Yields:
+            str: The fragments, they add up to `.render()`
+        """
+        yield self.render()
+
+
+class Tracked(Graph):
+    """Base class for graphs reporting their changes to their registry
+
+    Subclasses declare the `._registry` slot.
+    """
+
+    __slots__ = ()
+
+    _registry: Registry | None
+
+    def __new__(cls, *args, **kwargs) -> Self:
+        graph = super().__new__(cls)
+        graph._registry = None
+        return graph
+
+    def _set_name(self, value: str) -> None:
+        """Set the graph name, and update the index of its registry"""
+        if self._registry is not None and self.unique_name:
+            self._registry.rename(self, value)
+        super()._set_name(value)
+
+    def register(self, registry: Registry) -> None:
+        self._registry = registry
+
+    def invalidate(self) -> None:
+        """Report the graph as changed to its registry"""
+        if self._registry is not None:
+            self._registry.changed(self)
+
+
+class Memoized(Tracked):
+    """Base class for graphs memoizing their rendered output
+
+    The output is computed by `._render()` and kept until the graph, or one of the
+    graphs it contains, changes. A changed graph is marked dirty along with the graphs
+    containing it. Rendering a graph marks it and all the graphs it contains as clean,
+    so a dirty graph never has a memoized ancestor and invalidation stops at the first
+    ancestor already dirty. A top-level graph turning dirty is reported to its registry.
+    """
+
+    __slots__ = ("_parent", "_rendered", "_dirty", "_registry")
+
+    _rendered: str | None
+    _dirty: bool
+
+    def __new__(cls, *args, **kwargs) -> Self:
+        graph = super().__new__(cls)
+        graph._parent = None
+        graph._rendered = None
+        graph._dirty = True
+        return graph
+
+    def invalidate(self) -> None:
+        """Drop the memoized output of the graph and of the graphs containing it"""
+        graph = self
+        while True:
+            graph._rendered = None
+            if graph._dirty:
+                return
+            graph._dirty = True
+            if graph.parent is None:
+                break
+            graph = graph.parent
+
+        if graph._registry is not None:
+            graph._registry.changed(graph)
+
+    def render(self) -> str:
+        """Render the graph as a string, memoized until it changes"""
+        if self._rendered is None:
+            stats = instrument.active.get()
+            if stats is None:
+                self._rendered = self._render()
+            else:
+                started = time.perf_counter_ns()
+                self._rendered = self._render()
+                stats.record(
+                    "render", type(self).__name__, time.perf_counter_ns() - started
+                )
+            self._dirty = False
+        return self._rendered
+
+    def _render(self) -> str:
+        raise NotImplementedError("`._render()` should be implemented")
+
+
+class Drawable:
+    """Output methods shared by everything that renders a whole diagram
+
+    Subclasses provide the top-level graphs through `.iter_render()` and
+    `.iter_fragments()`, the rest is derived from them.
+    """
+
+    def iter_render(self) -> Iterator[str]:
+        """Render the top-level graphs one by one
+
+        Yields:
+            str: The rendered graph, without a trailing newline
+        """
+        raise NotImplementedError("`.iter_render()` should be implemented")
+
+    def iter_fragments(self) -> Iterator[str]:
+        """Render the diagram as a stream of fragments
+
+        Yields:
+            str: The fragments of the diagram, they add up to `.render_to_string()`
+        """
+        raise NotImplementedError("`.iter_fragments()` should be implemented")
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        """Feed the structure of the diagram to a hasher, see `.fingerprint()`
+
+        Args:
+            hasher (hashlib.blake2b): The hasher to update
+        """
+        raise NotImplementedError("`.update_fingerprint()` should be implemented")
+
+    def fingerprint(self) -> str:
+        """A stable hash of the structure of the diagram, computed without rendering
+
+        The fingerprint covers the graphs, their properties, the graphs they contain
+        and the relations, in drawing order. Diagrams built the same way share the
+        same fingerprint across processes, so it can key a cache of the output.
+
+        Returns:
+            str: The hex digest
+        """
+        # imported on use to keep the import of the package fast
+        import hashlib  # pylint: disable=import-outside-toplevel
+
+        hasher = hashlib.blake2b(digest_size=16)
+        self.update_fingerprint(hasher)
+        return hasher.hexdigest()
+
+    def iter_chunks(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[str]:
+        """Render the diagram as chunks of bounded size
+
+        Args:
+            buffer_size (int, optional): The size of a chunk. Defaults to 64 KiB.
+
+        Yields:
+            str: The chunks of the diagram, they add up to `.render_to_string()`
+        """
+        return buffered(self.iter_fragments(), buffer_size)
+
+    def render_to_string(self, cache: RenderCache | None = None) -> str:
+        """Render the whole diagram with a single join
+
+        Args:
+            cache (RenderCache, optional): A cache of the outputs keyed by
+                `.fingerprint()`, the diagram is not rendered on a hit.
+                Defaults to None.
+
+        Returns:
+            str: The diagram, each top-level graph terminated by a newline
+        """
+        with instrument.measure("draw", type(self).__name__):
+            if cache is None:
+                return "".join(self.iter_fragments())
+
+            key = self.fingerprint()
+            output = cache.get(key)
+            if output is None:
+                output = "".join(self.iter_fragments())
+                cache.put(key, output)
+            return output
+
+    def write(self, file: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Write the diagram to a file-like object through a bounded buffer
+
+        Args:
+            file (TextIO): The file-like object to write to
+            buffer_size (int, optional): The size of a write. Defaults to 64 KiB.
+        """
+        with instrument.measure("draw", type(self).__name__):
+            for chunk in self.iter_chunks(buffer_size):
+                file.write(chunk)
+
+    def draw(
+        self,
+        stdout: Callable | TextIO | None = None,
+        cache: RenderCache | None = None,
+    ) -> None:
+        """Draw the diagram
+
+        A file-like object is written through `.write()`, any other callable is called
+        once per top-level graph. With a cache, the output is looked up by
+        `.fingerprint()` and a callable is called once with the whole diagram.
+
+        Args:
+            stdout (Callable | TextIO, optional): A function or a file-like object to
+                handle the output. Defaults to `sys.stdout`.
+            cache (RenderCache, optional): A cache of the outputs, the diagram is not
+                rendered on a hit. Defaults to None.
+        """
+        if stdout is None:
+            stdout = sys.stdout
+
+        with instrument.measure("draw", type(self).__name__):
+            if cache is not None:
+                output = self.render_to_string(cache)
+                if hasattr(stdout, "write"):
+                    stdout.write(output)
+                elif output:
+                    stdout(output.removesuffix("\n"))
+                return
+
+            if hasattr(stdout, "write"):
+                self.write(stdout)
+                return
+
+            for output in self.iter_render():
+                stdout(output)
+
+    async def adraw(self, sink: Any, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Draw the diagram without blocking the event loop
+
+        The diagram is rendered lazily by chunks of bounded size, a chunk is only
+        rendered once the previous one is accepted by the sink, and the control goes
+        back to the event loop between chunks.
+
+        Args:
+            sink (Any): Where to write the chunks, either an `asyncio.StreamWriter`-like
+                object with `.write()` and `.drain()`, a file-like object or a callable,
+                their results are awaited when awaitable
+            buffer_size (int, optional): The size of a chunk. Defaults to 64 KiB.
+        """
+        # imported on use as asyncio is slow to import
+        import asyncio  # pylint: disable=import-outside-toplevel
+        import inspect  # pylint: disable=import-outside-toplevel
+
+        drain = getattr(sink, "drain", None)
+        write = getattr(sink, "write", sink)
+        with instrument.measure("draw", type(self).__name__):
+            for chunk in self.iter_chunks(buffer_size):
+                result = write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+                if drain is not None:
+                    await drain()
+                await asyncio.sleep(0)
+
+
+class Registry(Drawable):
+    """Stores the graphs of one diagram type, they are drawn in creation order
+
+    The graphs with a unique name are indexed by name in `.names`.
+
+    The registry also keeps a snapshot of the top-level outputs returned by the last
+    `.diff()`, along with the graphs reported as changed since then, so a diff only
+    renders the new and changed graphs.
+    """
+
+    def __init__(self) -> None:
+        self.graphs: list[Graph] = []
+        self.names: dict[str, Graph] = {}
+        self._changed: dict[int, Graph] = {}
+        # id of the graph -> (graph, output) of the top-level graphs of the snapshot
+        self._published: dict[int, tuple[Graph, str]] = {}
+        self._published_count = 0
+
+    def add(self, graph: Graph) -> None:
+        """Register a graph
+
+        Args:
+            graph (Graph): The graph to register
+
+        Raises:
+            DuplicateNameError: If a graph with the same unique name exists
+        """
+        if graph.unique_name:
+            self.index(graph.name, graph)
+        self.graphs.append(graph)
+        graph.register(self)
+
+    def index(self, name: str, graph: Graph) -> None:
+        """Index a graph by name
+
+        Args:
+            name (str): The name of the graph
+            graph (Graph): The graph
+
+        Raises:
+            DuplicateNameError: If another graph is indexed with the same name
+        """
+        other = self.names.setdefault(name, graph)
+        if other is not graph:
+            raise DuplicateNameError(
+                f"`{name}` is already the name of a {type(other).__name__}"
+            )
+
+    def rename(self, graph: Graph, name: str) -> None:
+        """Update the index before a graph is renamed
+
+        Args:
+            graph (Graph): The indexed graph
+            name (str): The new name of the graph
+
+        Raises:
+            DuplicateNameError: If another graph is indexed with the new name
+        """
+        self.index(name, graph)
+        if name != graph.name and self.names.get(graph.name) is graph:
+            del self.names[graph.name]
+
+    def get(self, name: str) -> Graph | None:
+        """Look up a graph by its unique name
+
+        Args:
+            name (str): The name of the graph
+
+        Returns:
+            Graph | None: The graph, or None if there is no graph with this name
+        """
+        return self.names.get(name)
+
+    def clear(self) -> None:
+        """Remove all the registered graphs and the snapshot"""
+        self.graphs = []
+        self.names = {}
+        self._changed = {}
+        self._published = {}
+        self._published_count = 0
+
+    def changed(self, graph: Graph) -> None:
+        """Report a top-level graph as changed since the last `.diff()`
+
+        Args:
+            graph (Graph): The changed graph
+        """
+        self._changed[id(graph)] = graph
+
+    def is_root(self, graph: Graph) -> bool:
+        """Whether the graph is rendered at the top level of the diagram
+
+        Args:
+            graph (Graph): A registered graph
+
+        Returns:
+            bool: True for all the graphs
+        """
+        return True
+
+    def roots(self) -> Iterable[Graph]:
+        """The graphs rendered at the top level of the diagram
+
+        Returns:
+            Iterable[Graph]: The top-level graphs in creation order
+        """
+        return (graph for graph in self.graphs if self.is_root(graph))
+
+    def diff(self) -> Patch:
+        """The changes since the previous call, which become the new snapshot
+
+        The first call reports all the graphs as added. Only the graphs created or
+        reported as changed since the previous call are rendered.
+
+        Returns:
+            Patch: The added, removed and changed fragments
+        """
+        from .diff import Patch  # pylint: disable=import-outside-toplevel
+
+        patch = Patch()
+        published = self._published
+        graphs = [*self._changed.values(), *self.graphs[self._published_count :]]
+        self._changed = {}
+        self._published_count = len(self.graphs)
+
+        for graph in graphs:
+            previous = published.get(id(graph))
+            if not self.is_root(graph):
+                if previous is not None:
+                    del published[id(graph)]
+                    patch.removed.append(previous[1])
+                continue
+
+            output = graph.render()
+            if previous is None:
+                patch.added.append(output)
+            elif previous[1] != output:
+                patch.changed.append((previous[1], output))
+            published[id(graph)] = (graph, output)
+        return patch
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        """Feed every top-level graph and the graphs it contains, in drawing order
+
+        See `update_fingerprint()`.
+
+        Args:
+            hasher (hashlib.blake2b): The hasher to update
+        """
+        update_fingerprint(hasher, self.roots())
+
+    def iter_render(self) -> Iterator[str]:
+        for graph in self.roots():
+            yield graph.render()
+
+    def iter_fragments(self) -> Iterator[str]:
+        for graph in self.roots():
+            yield from graph.fragments()
+            yield "\n"
+
+
+_active_diagram: contextvars.ContextVar[Diagram | None] = contextvars.ContextVar(
+    "diagram", default=None
+)
+
+
+class Diagram(Drawable):
+    """A diagram owning the graphs created within its context
+
+    While a diagram is active, graphs are registered to it instead of the global
+    registries of the diagram types. The active diagram is tracked with `contextvars`,
+    so each thread or asyncio task can build its own diagram concurrently.
+
+    Example:
+        with Diagram() as diagram:
+            proxy = Node(name="proxy")
+            proxy.connect(Node(name="service"))
+
+        diagram.draw()
+    """
+
+    def __init__(self) -> None:
+        self.registries: dict[type, Registry] = {}
+        self._tokens: list[contextvars.Token] = []
+
+    def __enter__(self) -> Diagram:
+        self._tokens.append(_active_diagram.set(self))
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        _active_diagram.reset(self._tokens.pop())
+
+    @staticmethod
+    def current() -> Diagram | None:
+        """The active diagram of the current context
+
+        Returns:
+            Diagram | None: The active diagram or None outside of any diagram
+        """
+        return _active_diagram.get()
+
+    def registry(self, diagram_type: DiagramType) -> Registry:
+        """The registry of a diagram type, created on first use
+
+        Args:
+            diagram_type (DiagramType): The metaclass of the diagram type
+
+        Returns:
+            Registry: The registry owned by this diagram
+        """
+        registry = self.registries.get(diagram_type)
+        if registry is None:
+            registry = self.registries[diagram_type] = diagram_type.registry_class()
+        return registry
+
+    def clear(self) -> None:
+        """Remove all the graphs of the diagram"""
+        self.registries = {}
+
+    def diff(self) -> Patch:
+        """The changes of all the registries since the previous call
+
+        Returns:
+            Patch: The added, removed and changed fragments
+        """
+        from .diff import Patch  # pylint: disable=import-outside-toplevel
+
+        patch = Patch()
+        for registry in self.registries.values():
+            patch.extend(registry.diff())
+        return patch
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        for diagram_type, registry in self.registries.items():
+            hasher.update(f"{diagram_type.__name__}\n".encode())
+            registry.update_fingerprint(hasher)
+
+    def iter_render(self) -> Iterator[str]:
+        for registry in self.registries.values():
+            yield from registry.iter_render()
+
+    def iter_fragments(self) -> Iterator[str]:
+        for registry in self.registries.values():
+            yield from registry.iter_fragments()
+
+
+class DiagramType(type):
+    """Base metaclass for the diagram types
+
+    Every graph created from a class of the diagram type is stored in the registry of
+    the active `Diagram`, or in the global registry of the diagram type outside of any
+    diagram. The class methods draw the registry of the current context.
+    """
+
+    registry_class: type[Registry] = Registry
+
+    def __init_subclass__(mcs, **kwargs) -> None:
+        """Create the global registry of the diagram type"""
+        super().__init_subclass__(**kwargs)
+        mcs._registry = mcs.registry_class()
+
+    def __call__(cls, *args, **kwargs) -> Graph:
+        """Initialize a graph object and register it
+
+        Returns:
+            Graph: The graph object
+        """
+        stats = instrument.active.get()
+        if stats is None:
+            graph = super().__call__(*args, **kwargs)
+            cls.registry().add(graph)
+            return graph
+
+        started = time.perf_counter_ns()
+        graph = super().__call__(*args, **kwargs)
+        registry = cls.registry()
+        registry.add(graph)
+        stats.record("construct", cls.__name__, time.perf_counter_ns() - started)
+        stats.observe_registry_size(len(registry.graphs))
+        return graph
+
+    def get_or_create(cls, name: str, *args, **kwargs) -> Graph:
+        """Look up a graph by name, or create it when there is none
+
+        It is called on a graph class, e.g. `Node.get_or_create("proxy", icon="...")`,
+        the other arguments are only used to create the graph.
+
+        Args:
+            name (str): The name of the graph
+
+        Returns:
+            Graph: The existing graph, or the new one
+
+        Raises:
+            DuplicateNameError: If the name is used by a graph of another class
+        """
+        graph = cls.registry().get(name)
+        if graph is None:
+            return cls(name, *args, **kwargs)
+        if not isinstance(graph, cls):
+            raise DuplicateNameError(
+                f"`{name}` is already the name of a {type(graph).__name__}"
+            )
+        return graph
+
+    @classmethod
+    def get(mcs, name: str) -> Graph | None:
+        """Look up a graph of the current registry, see `Registry.get()`"""
+        return mcs.registry().get(name)
+
+    @classmethod
+    def registry(mcs) -> Registry:
+        """The registry of the current context
+
+        Returns:
+            Registry: The registry of the active diagram, or the global one
+        """
+        diagram = _active_diagram.get()
+        if diagram is None:
+            return mcs._registry
+        return diagram.registry(mcs)
+
+    @classmethod
+    def iter_render(mcs) -> Iterator[str]:
+        """Render the top-level graphs one by one, see `Drawable.iter_render()`"""
+        return mcs.registry().iter_render()
+
+    @classmethod
+    def iter_fragments(mcs) -> Iterator[str]:
+        """Render the diagram as fragments, see `Drawable.iter_fragments()`"""
+        return mcs.registry().iter_fragments()
+
+    @classmethod
+    def iter_chunks(mcs, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[str]:
+        """Render the diagram as chunks, see `Drawable.iter_chunks()`"""
+        return mcs.registry().iter_chunks(buffer_size)
+
+    @classmethod
+    def fingerprint(mcs) -> str:
+        """A stable hash of the diagram, see `Drawable.fingerprint()`"""
+        return mcs.registry().fingerprint()
+
+    @classmethod
+    def render_to_string(mcs, cache: RenderCache | None = None) -> str:
+        """Render the whole diagram, see `Drawable.render_to_string()`"""
+        return mcs.registry().render_to_string(cache)
+
+    @classmethod
+    def write(mcs, file: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Write the diagram to a file-like object, see `Drawable.write()`"""
+        mcs.registry().write(file, buffer_size)
+
+    @classmethod
+    def draw(
+        mcs,
+        stdout: Callable | TextIO | None = None,
+        cache: RenderCache | None = None,
+    ) -> None:
+        """Draw the diagram, see `Drawable.draw()`"""
+        mcs.registry().draw(stdout, cache)
+
+    @classmethod
+    def adraw(
+        mcs, sink: Any, buffer_size: int = DEFAULT_BUFFER_SIZE
+    ) -> Coroutine[Any, Any, None]:
+        """Draw the diagram without blocking the event loop, see `Drawable.adraw()`"""
+        return mcs.registry().adraw(sink, buffer_size)
+
+    @classmethod
+    def diff(mcs) -> Patch:
+        """The changes since the previous call, see `Registry.diff()`"""
+        return mcs.registry().diff()
+
+    @classmethod
+    def reset(mcs) -> None:
+        """Remove all the graphs of the current registry
+
+        useful for testing, a `Diagram` starts with empty registries
+        """
+        mcs.registry().clear()
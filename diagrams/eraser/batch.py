@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator
+
+from .base import Diagram
+
+__all__ = [
+    "render_job",
+    "iter_render_many",
+    "render_many",
+]
+
+Builder = Callable[[], object]
+
+
+def render_job(builder: Builder) -> str:
+    """Build a diagram in its own scope and render it
+
+    Args:
+        builder (Callable): A function creating the graphs of the diagram
+
+    Returns:
+        str: The rendered diagram
+    """
+    with Diagram() as diagram:
+        builder()
+    return diagram.render_to_string()
+
+
+def iter_render_many(
+    builders: Iterable[Builder], workers: int | None = None
+) -> Iterator[tuple[int, str]]:
+    """Render diagrams in a process pool, yielding them as they finish
+
+    The builders are sent to the worker processes, so they have to be picklable, e.g.
+    module-level functions or `functools.partial` of them.
+
+    Args:
+        builders (Iterable[Callable]): The functions creating the diagrams
+        workers (int, optional): The number of processes. Defaults to the CPU count.
+
+    Yields:
+        tuple[int, str]: The index of the builder and its rendered diagram
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(render_job, builder): index
+            for index, builder in enumerate(builders)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def render_many(
+    builders: Iterable[Builder],
+    workers: int | None = None,
+    outputs: Iterable[str | os.PathLike] | None = None,
+) -> list[str]:
+    """Render diagrams in a process pool
+
+    Args:
+        builders (Iterable[Callable]): The functions creating the diagrams
+        workers (int, optional): The number of processes. Defaults to the CPU count.
+        outputs (Iterable[str | PathLike], optional): The files to write the diagrams
+            to, one per builder. Each file is written as soon as its diagram is
+            rendered. Defaults to None.
+
+    Returns:
+        list[str]: The rendered diagrams in the order of the builders
+    """
+    builders = list(builders)
+    paths = None if outputs is None else list(outputs)
+    if paths is not None and len(paths) != len(builders):
+        raise ValueError("`outputs` should have one file per builder")
+
+    results: list[str] = [""] * len(builders)
+    for index, output in iter_render_many(builders, workers):
+        results[index] = output
+        if paths is not None:
+            with open(paths[index], "w", encoding="utf-8") as file:
+                file.write(output)
+    return results
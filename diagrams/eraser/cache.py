@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import tempfile
+
+__all__ = [
+    "RenderCache",
+]
+
+# Evict the least recently used outputs beyond this size
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class RenderCache:
+    """Content-addressed cache of rendered diagrams in a directory
+
+    Each output is stored in its own file named after the fingerprint of the diagram,
+    see `Drawable.fingerprint()`. The modification time of a file is refreshed on every
+    hit, and once the directory grows beyond `max_bytes` the least recently used files
+    are evicted. Files are written atomically, so the directory can be shared between
+    processes.
+
+    Example:
+        cache = RenderCache(".diagrams-cache")
+        CloudArchitecture.draw(file, cache=cache)
+
+    Args:
+        directory (str | os.PathLike): The directory of the cache, created if needed
+        max_bytes (int, optional): The size of the cache. Defaults to 256 MiB.
+    """
+
+    SUFFIX = ".eraser"
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # scanned on the first write, then kept up to date by this instance
+        self._size: int | None = None
+
+    def path(self, key: str) -> pathlib.Path:
+        """The file of an output
+
+        Args:
+            key (str): The fingerprint of the diagram
+
+        Returns:
+            pathlib.Path: The path of the file, which may not exist
+        """
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def __contains__(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def get(self, key: str) -> str | None:
+        """Look up an output, marked as recently used
+
+        Args:
+            key (str): The fingerprint of the diagram
+
+        Returns:
+            str | None: The output or None if it is not cached
+        """
+        path = self.path(key)
+        try:
+            with open(path, encoding="utf-8", newline="") as file:
+                output = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # missing or evicted by another process meanwhile
+            return None
+        return output
+
+    def put(self, key: str, output: str) -> None:
+        """Store an output, evicting the least recently used ones if needed
+
+        Args:
+            key (str): The fingerprint of the diagram
+            output (str): The rendered diagram
+        """
+        data = output.encode("utf-8")
+        path = self.path(key)
+        try:
+            # an overwritten output no longer counts in the size
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data) - previous
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def size(self) -> int:
+        """The total size of the cached outputs
+
+        Returns:
+            int: The size in bytes
+        """
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self) -> None:
+        """Remove the least recently used outputs until the cache fits `max_bytes`"""
+        entries = sorted(
+            ((entry.stat(), entry.path) for entry in self._entries()),
+            key=lambda item: item[0].st_mtime_ns,
+        )
+        size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= stat.st_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Remove all the cached outputs"""
+        for entry in self._entries():
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
+
+    def _entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.name.endswith(self.SUFFIX) and entry.is_file()
+            ]
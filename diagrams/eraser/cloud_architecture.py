@@ -1,79 +1,79 @@
 from __future__ import annotations
 
 import os
-from typing import Callable, Optional
+import time
+from typing import Iterable, Iterator, Optional
 
-from .base import Graph
+from . import instrument
+from .base import DiagramType, Graph, Memoized, Tracked
 from .properties import Properties
-from .relations import ArrowType, Relations
+from .relations import ArrowType, EdgeRegistry, EdgeTable, Relations
 
 __all__ = [
     "CloudArchitecture",
     "Node",
     "Group",
+    "connect_many",
 ]
 
 
-class CloudArchitecture(type):
+class CloudArchitectureRegistry(EdgeRegistry):
+    """Registry of the cloud architecture diagrams
 
-    def __new__(mcs, name, bases, dct):
-        """Create `._graphs` list to store all the graphs"""
-        mcs._graphs = []
-        return super().__new__(mcs, name, bases, dct)
+    The connections created by `.connect()` are stored in the `.connections` edge
+    table and drawn after all the other graphs.
+    """
 
-    def __call__(cls, *args, **kwargs) -> Graph:
-        """Initialize a graph object and add it to `._graphs`
+    relation_type = ArrowType
 
-        Retruns:
-            Graph: The graph object
-        """
-        graph = super().__call__(*args, **kwargs)
-        cls._graphs.append(graph)
-        return graph
+    @property
+    def connections(self) -> EdgeTable:
+        """The edge table of the connections"""
+        return self.edges
 
-    @classmethod
-    def draw(mcs, stdout: Callable | None = None) -> None:
-        """Draw the diagram
+    def is_root(self, graph: Graph) -> bool:
+        """Whether the graph is rendered at the top level of the diagram
 
         Args:
-            stdout (Callable, optional): A function to handle the output. Defaults to None.
-        """
-        if stdout is None:
-            stdout = print
+            graph (Graph): A registered graph
 
-        for graph in mcs._graphs:
-            # sub-groups be rendered by the parent group
-            if graph.parent is None:
-                stdout(graph.render())
+        Returns:
+            bool: True for the graphs without a parent
+        """
+        # sub-groups be rendered by the parent group
+        return graph.parent is None
 
-    @classmethod
-    def reset(mcs) -> None:
-        """Reset the `._graphs` list to an empty list
 
-        useful for testing
+class CloudArchitecture(DiagramType):
+    """Metaclass of the cloud architecture diagrams"""
 
-        Args:
-            mcs (CloudArchitecture): The metaclass
-        """
-        mcs._graphs = []
+    registry_class = CloudArchitectureRegistry
 
 
-class Connection(Relations, Graph, metaclass=CloudArchitecture):
+class Connection(Relations, Tracked, metaclass=CloudArchitecture):
     """Connections represent relationships between nodes and groups.
 
-    `Connection` inherit from Relations and register to the CloudArchitecture.
+    `Connection` inherit from Relations and register to the CloudArchitecture, it is
+    drawn at its creation position. `.connect()` and `connect_many()` store the
+    connections in the edge table of the registry instead, drawn after all graphs.
 
     Refs:
         https://docs.eraser.io/docs/syntax#connections
     """
 
+    __slots__ = ("_registry",)
+
     # This is used only in the `draw()` method of Cloud Architecture Diagrams
     parent = None
 
 
-class Node(Graph, metaclass=CloudArchitecture):
+class Node(Memoized, metaclass=CloudArchitecture):
     """Class to represent a node in the diagram"""
 
+    __slots__ = ("_name", "_properties")
+
+    unique_name = True
+
     def __init__(
         self, name: str, icon: Optional[str] = None, color: Optional[str] = None
     ) -> None:
@@ -86,15 +86,30 @@ class Node(Graph, metaclass=CloudArchitecture):
         """
         self.parent = None
         self.name = name
-        self.properties = Properties(icon=icon, color=color)
+        self.properties = Properties.of(icon=icon, color=color)
 
     def connect(
-        self, target: Graph, arrow: ArrowType = ArrowType.LEFT_TO_RIGHT_ARROW
+        self,
+        target: Graph,
+        arrow: ArrowType = ArrowType.LEFT_TO_RIGHT_ARROW,
+        label: str | None = None,
     ) -> None:
-        """Connect the node to another node or group"""
-        Connection(source=self.name, target=target.name, relation=arrow)
+        """Connect the node to another node or group
+
+        Args:
+            target (Graph): The node or group to connect to
+            arrow (ArrowType, optional): The arrow of the connection.
+                Defaults to `ArrowType.LEFT_TO_RIGHT_ARROW`.
+            label (str, optional): The label of the connection. Defaults to None.
+        """
+        CloudArchitecture.registry().connections.add(
+            self.name, target.name, arrow, label
+        )
+
+    def state(self) -> tuple:
+        return (self.name, self.properties.render())
 
-    def render(self) -> str:
+    def _render(self) -> str:
         """Render the node as a string
 
         Returns:
@@ -103,8 +118,16 @@ class Node(Graph, metaclass=CloudArchitecture):
         return f"{self.name} {self.properties.render()}"
 
 
-class Group(Graph, metaclass=CloudArchitecture):
-    """Class to represent a group of nodes in the diagram"""
+class Group(Memoized, metaclass=CloudArchitecture):
+    """Class to represent a group of nodes in the diagram
+
+    `.children` should be changed through `.append()`, which invalidates the memoized
+    output of the group.
+    """
+
+    __slots__ = ("_name", "_properties", "children")
+
+    unique_name = True
 
     def __init__(
         self, name: str, icon: Optional[str] = None, color: Optional[str] = None
@@ -118,14 +141,26 @@ class Group(Graph, metaclass=CloudArchitecture):
         """
         self.parent = None
         self.name = name
-        self.properties = Properties(icon=icon, color=color)
+        self.properties = Properties.of(icon=icon, color=color)
         self.children: list[Graph] = []
 
     def connect(
-        self, target: Graph, arrow: ArrowType = ArrowType.LEFT_TO_RIGHT_ARROW
+        self,
+        target: Graph,
+        arrow: ArrowType = ArrowType.LEFT_TO_RIGHT_ARROW,
+        label: str | None = None,
     ) -> None:
-        """Connect the node to another node or group"""
-        Connection(source=self.name, target=target.name, relation=arrow)
+        """Connect the node to another node or group
+
+        Args:
+            target (Graph): The node or group to connect to
+            arrow (ArrowType, optional): The arrow of the connection.
+                Defaults to `ArrowType.LEFT_TO_RIGHT_ARROW`.
+            label (str, optional): The label of the connection. Defaults to None.
+        """
+        CloudArchitecture.registry().connections.add(
+            self.name, target.name, arrow, label
+        )
 
     def append(self, *graphs: Graph) -> None:
         """Add nodes or groups to the group
@@ -133,16 +168,102 @@ class Group(Graph, metaclass=CloudArchitecture):
         Args:
             *graphs (Graph): The nodes or groups to add
         """
+        stats = instrument.active.get()
+        if stats is not None:
+            started = time.perf_counter_ns()
         for graph in graphs:
+            if graph.parent is None:
+                # no longer drawn at the top level
+                graph.invalidate()
             graph.parent = self
             self.children.append(graph)
+        self.invalidate()
+        if stats is not None:
+            stats.record("append", "Group", time.perf_counter_ns() - started)
 
-    def render(self) -> str:
+    def state(self) -> tuple:
+        return (self.name, self.properties.render())
+
+    def members(self) -> list[Graph]:
+        return self.children
+
+    def _render(self) -> str:
         """Render the group as a string
 
         Returns:
             str: The group as a string
         """
-        header = f"{self.name} {self.properties.render()}"
-        body = "\n".join((child.render() for child in self.children))
-        return f"{header} {{{os.linesep}{body}{os.linesep}}}"
+        return "".join(self.walk())
+
+    def fragments(self) -> Iterator[str]:
+        """Render the group as a stream of fragments, memoized as a whole
+
+        Yields:
+            str: The fragments, they add up to `.render()`
+        """
+        if self._rendered is not None or instrument.active.get() is not None:
+            # rendered as a whole while instrumented, see `Memoized.render()`
+            yield self.render()
+            return
+
+        fragments = []
+        for fragment in self.walk():
+            fragments.append(fragment)
+            yield fragment
+        self._rendered = "".join(fragments)
+
+    def walk(self) -> Iterator[str]:
+        """Render the group and its children without memoizing them, see `.fragments()`
+
+        The sub-groups are walked with an explicit stack instead of recursion, so the
+        cost is linear in the size of the output and the nesting depth is unbounded.
+        The groups with a memoized output, this one included, are not walked, the
+        walked ones are marked as clean.
+
+        Yields:
+            str: The fragments of the group
+        """
+        stack: list[Graph | str] = [self]
+        while stack:
+            graph = stack.pop()
+            if isinstance(graph, str):
+                yield graph
+            elif isinstance(graph, Group):
+                if graph._rendered is not None:
+                    yield graph._rendered
+                    continue
+                graph._dirty = False
+                yield f"{graph.name} {graph.properties.render()} {{{os.linesep}"
+                stack.append(f"{os.linesep}}}")
+                children = graph.children
+                # pushed in reverse order to pop them in order
+                for index in range(len(children) - 1, -1, -1):
+                    stack.append(children[index])
+                    if index:
+                        stack.append("\n")
+            else:
+                yield from graph.fragments()
+
+
+def connect_many(
+    sources: Iterable[Graph],
+    targets: Iterable[Graph],
+    arrow: ArrowType = ArrowType.LEFT_TO_RIGHT_ARROW,
+    labels: Iterable[str | None] | None = None,
+) -> None:
+    """Connect each source to the target at the same position in bulk
+
+    Args:
+        sources (Iterable[Graph]): The nodes or groups to connect from
+        targets (Iterable[Graph]): The nodes or groups to connect to
+        arrow (ArrowType, optional): The arrow of the connections.
+            Defaults to `ArrowType.LEFT_TO_RIGHT_ARROW`.
+        labels (Iterable[str | None], optional): The labels of the connections.
+            Defaults to None.
+    """
+    CloudArchitecture.registry().connections.extend(
+        (source.name for source in sources),
+        (target.name for target in targets),
+        arrow,
+        labels,
+    )
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterator
+
+import attrs
+
+__all__ = [
+    "Patch",
+]
+
+
+@attrs.define
+class Patch:
+    """Changes of a diagram between two snapshots
+
+    The changes are expressed by fragments, the output of a top-level graph or of a
+    single relation as drawn in the diagram.
+
+    Args:
+        added (list[str]): The fragments of the new top-level graphs and relations
+        removed (list[str]): The fragments of the graphs no longer drawn at the top
+            level, e.g. a node appended to a group
+        changed (list[tuple[str, str]]): The previous and the current fragments of the
+            changed graphs
+    """
+
+    added: list[str] = attrs.field(factory=list)
+    removed: list[str] = attrs.field(factory=list)
+    changed: list[tuple[str, str]] = attrs.field(factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def extend(self, patch: Patch) -> None:
+        """Add the changes of another patch
+
+        Args:
+            patch (Patch): The patch to merge into this one
+        """
+        self.added.extend(patch.added)
+        self.removed.extend(patch.removed)
+        self.changed.extend(patch.changed)
+
+    def lines(self) -> Iterator[str]:
+        """The changes line by line, prefixed by `+ ` or `- `
+
+        Changed fragments only yield the lines which differ, compared as multisets so
+        the cost stays linear in the size of the fragments.
+
+        Yields:
+            str: The removed and added lines
+        """
+        for fragment in self.removed:
+            for line in fragment.splitlines():
+                yield f"- {line}"
+        for previous, current in self.changed:
+            previous_lines = Counter(previous.splitlines())
+            current_lines = Counter(current.splitlines())
+            for line in (previous_lines - current_lines).elements():
+                yield f"- {line}"
+            for line in (current_lines - previous_lines).elements():
+                yield f"+ {line}"
+        for fragment in self.added:
+            for line in fragment.splitlines():
+                yield f"+ {line}"
@@ -1,99 +1,342 @@
 from __future__ import annotations
 
 import os
-from typing import Callable
+import sys
+import time
+from typing import Iterable
 
-from .base import Graph
+from . import instrument
+from .base import DiagramType, DuplicateNameError, Memoized, Tracked
 from .properties import Properties
-from .relations import EntityRelationshipType, Relations
+from .relations import EdgeRegistry, EdgeTable, EntityRelationshipType, Relations
 
 __all__ = [
     "EntityRelationship",
     "Entity",
+    "entities_from_rows",
+    "relationships_from_rows",
 ]
 
 
-class EntityRelationship(type):
-    def __new__(mcs, name, bases, dct):
-        mcs._graphs = []
-        return super().__new__(mcs, name, bases, dct)
+class EntityRelationshipRegistry(EdgeRegistry):
+    """Registry of the entity relationship diagrams
 
-    def __call__(cls, *args, **kwargs):
-        graph = super().__call__(*args, **kwargs)
-        cls._graphs.append(graph)
-        return graph
+    The attributes of the entities are indexed by `entity.attribute` name in
+    `.attributes`. The relationships created by `relationships_from_rows()` are stored
+    in the `.relationships` edge table and drawn after all the other graphs.
+    """
 
-    @classmethod
-    def draw(mcs, stdout: Callable = None):
-        if stdout is None:
-            stdout = print
-        for graph in mcs._graphs:
-            stdout(graph.render())
+    relation_type = EntityRelationshipType
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.attributes: dict[str, Attribute] = {}
+
+    def clear(self) -> None:
+        super().clear()
+        self.attributes = {}
+
+    def add_attribute(self, attribute: Attribute) -> None:
+        """Index an attribute by its `entity.attribute` name
+
+        Args:
+            attribute (Attribute): The attribute of an entity
+
+        Raises:
+            DuplicateNameError: If the entity already has an attribute with this name
+        """
+        name = attribute.qualified_name
+        if self.attributes.setdefault(name, attribute) is not attribute:
+            raise DuplicateNameError(f"`{name}` is already an attribute")
+
+    def rename_attribute(self, attribute: Attribute, name: str) -> None:
+        """Update the index before an attribute, or its entity, is renamed
+
+        Args:
+            attribute (Attribute): The indexed attribute
+            name (str): The new `entity.attribute` name of the attribute
+
+        Raises:
+            DuplicateNameError: If another attribute is indexed with the new name
+        """
+        if self.attributes.setdefault(name, attribute) is not attribute:
+            raise DuplicateNameError(f"`{name}` is already an attribute")
+        previous = attribute.qualified_name
+        if name != previous and self.attributes.get(previous) is attribute:
+            del self.attributes[previous]
+
+    def get_attribute(self, name: str) -> Attribute | None:
+        """Look up an attribute by its `entity.attribute` name
+
+        Args:
+            name (str): The qualified name of the attribute, e.g. `users.id`
+
+        Returns:
+            Attribute | None: The attribute, or None if there is none with this name
+        """
+        return self.attributes.get(name)
+
+    @property
+    def relationships(self) -> EdgeTable:
+        """The edge table of the relationships"""
+        return self.edges
+
+
+class EntityRelationship(DiagramType):
+    """Metaclass of the entity relationship diagrams"""
+
+    registry_class = EntityRelationshipRegistry
 
     @classmethod
-    def reset(mcs):
-        mcs._graphs = []
+    def get_attribute(mcs, name: str) -> Attribute | None:
+        """Look up an attribute, see `EntityRelationshipRegistry.get_attribute()`"""
+        return mcs.registry().get_attribute(name)
 
 
-class Relationship(Relations, Graph, metaclass=EntityRelationship):
-    pass
+class Relationship(Relations, Tracked, metaclass=EntityRelationship):
+    __slots__ = ("_registry",)
 
 
-class Attribute(Graph):
+class Attribute(Memoized):
+    __slots__ = ("_name", "_parent_name", "_qualified_name", "_data_type", "_metadata")
+
     def __init__(
         self, parent_name: str, name: str, data_type: str = "", metadata: str = ""
     ) -> None:
-        self.parent_name = parent_name
-        self.name = name
-        self.data_type = data_type
-        self.metadata = metadata
+        # the slots are set directly, a new attribute has no entity to invalidate nor
+        # index to update yet
+        self._parent_name = parent_name
+        self._qualified_name = None
+        self._name = sys.intern(name)
+        self._data_type = data_type
+        self._metadata = metadata
 
-    def one_to_one(self, attribute: Attribute) -> None:
+    def _set_name(self, value: str) -> None:
+        """Set the attribute name, and update the index of its registry"""
+        registry = self._index()
+        if registry is not None:
+            registry.rename_attribute(self, f"{self._parent_name}.{value}")
+        super()._set_name(value)
+        self._qualified_name = None
+
+    @property
+    def parent_name(self) -> str:
+        """The name of the entity of the attribute"""
+        return self._parent_name
+
+    @parent_name.setter
+    def parent_name(self, value: str) -> None:
+        registry = self._index()
+        if registry is not None:
+            registry.rename_attribute(self, f"{value}.{self._name}")
+        self._parent_name = value
+        self._qualified_name = None
+
+    def _index(self) -> EntityRelationshipRegistry | None:
+        """The registry indexing the attribute, the one of its entity"""
+        entity = self._parent
+        return None if entity is None else entity._registry
+
+    @property
+    def data_type(self) -> str:
+        return self._data_type
+
+    @data_type.setter
+    def data_type(self, value: str) -> None:
+        self._data_type = value
+        self.invalidate()
+
+    @property
+    def metadata(self) -> str:
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: str) -> None:
+        self._metadata = value
+        self.invalidate()
+
+    @property
+    def qualified_name(self) -> str:
+        """The `entity.attribute` name used by relationships, interned
+
+        It is computed once, until the attribute or its entity name is changed.
+        """
+        qualified_name = self._qualified_name
+        if qualified_name is None:
+            qualified_name = sys.intern(f"{self._parent_name}.{self._name}")
+            self._qualified_name = qualified_name
+        return qualified_name
+
+    def relate(self, attribute: Attribute, relation: EntityRelationshipType) -> None:
+        """Create a relationship from this attribute to another one
+
+        Args:
+            attribute (Attribute): The related attribute
+            relation (EntityRelationshipType): The relation to the other attribute
+        """
         Relationship(
-            source=f"{self.parent_name}.{self.name}",
-            target=f"{attribute.parent_name}.{attribute.name}",
-            relation=EntityRelationshipType.ONE_TO_ONE,
+            source=self.qualified_name,
+            target=attribute.qualified_name,
+            relation=relation,
         )
 
+    def one_to_one(self, attribute: Attribute) -> None:
+        self.relate(attribute, EntityRelationshipType.ONE_TO_ONE)
+
     def one_to_many(self, attribute: Attribute) -> None:
-        Relationship(
-            source=f"{self.parent_name}.{self.name}",
-            target=f"{attribute.parent_name}.{attribute.name}",
-            relation=EntityRelationshipType.ONE_TO_MANY,
-        )
+        self.relate(attribute, EntityRelationshipType.ONE_TO_MANY)
 
     def many_to_one(self, attribute: Attribute) -> None:
-        Relationship(
-            source=f"{self.parent_name}.{self.name}",
-            target=f"{attribute.parent_name}.{attribute.name}",
-            relation=EntityRelationshipType.MANY_TO_ONE,
-        )
+        self.relate(attribute, EntityRelationshipType.MANY_TO_ONE)
 
     def many_to_many(self, attribute: Attribute) -> None:
-        Relationship(
-            source=f"{self.parent_name}.{self.name}",
-            target=f"{attribute.parent_name}.{attribute.name}",
-            relation=EntityRelationshipType.MANY_TO_MANY,
-        )
+        self.relate(attribute, EntityRelationshipType.MANY_TO_MANY)
+
+    def state(self) -> tuple:
+        return (self.name, self.data_type, self.metadata)
 
-    def render(self) -> str:
+    def _render(self) -> str:
         return f"{self.name} {self.data_type} {self.metadata}".strip()
 
 
-class Entity(Graph, metaclass=EntityRelationship):
+class Entity(Memoized, metaclass=EntityRelationship):
+    """Entity of the diagram
+
+    `.attributes` should be changed through `.add_attribute()`, which invalidates the
+    memoized output of the entity.
+    """
+
+    __slots__ = ("_name", "_properties", "attributes")
+
+    unique_name = True
+
     def __init__(
         self, name: str, icon: str | None = None, color: str | None = None
     ) -> None:
-        self.name = name
-        self.properties = Properties(icon=icon, color=color)
         self.attributes = []
+        self.name = name
+        self.properties = Properties.of(icon=icon, color=color)
 
-    def add_attribute(self, name: str, data_type: str = "", metadata: str = "") -> None:
+    def _set_name(self, value: str) -> None:
+        """Set the entity name, and the one of its attributes"""
+        super()._set_name(value)
+        for attribute in self.attributes:
+            attribute.parent_name = self._name
+
+    def add_attribute(
+        self, name: str, data_type: str = "", metadata: str = ""
+    ) -> Attribute:
+        stats = instrument.active.get()
+        if stats is not None:
+            started = time.perf_counter_ns()
         attribute = Attribute(self.name, name, data_type, metadata)
+        attribute.parent = self
+        if self._registry is not None:
+            self._registry.add_attribute(attribute)
         self.attributes.append(attribute)
+        self.invalidate()
+        if stats is not None:
+            stats.record("append", "Entity", time.perf_counter_ns() - started)
         return attribute
 
-    def render(self) -> str:
+    def state(self) -> tuple:
+        return (self.name, self.properties.render())
+
+    def members(self) -> list[Attribute]:
+        return self.attributes
+
+    def _render(self) -> str:
         header = f"{self.name} {self.properties.render()}"
         body = "\n".join(attribute.render() for attribute in self.attributes)
         return f"{header} {{{os.linesep}{body}{os.linesep}}}"
+
+
+def entities_from_rows(rows: Iterable[tuple[str, str, str, str]]) -> dict[str, Entity]:
+    """Create entities and their attributes in bulk
+
+    The rows are typically the columns of a database, rows of the same entity do not
+    need to be consecutive but are faster when they are. Existing entities get the new
+    attributes appended, and each entity is invalidated once.
+
+    Example:
+        entities_from_rows([
+            ("users", "id", "string", "pk"),
+            ("users", "name", "string", ""),
+            ("teams", "id", "string", "pk"),
+        ])
+
+    Args:
+        rows (Iterable[tuple[str, str, str, str]]): The
+            `(entity, attribute, data_type, metadata)` rows
+
+    Returns:
+        dict[str, Entity]: The created or extended entities by name
+
+    Raises:
+        DuplicateNameError: If an entity already has an attribute with a given name,
+            no entity nor attribute is created or changed then
+    """
+    registry = EntityRelationship.registry()
+    attributes_index = registry.attributes
+    # the rows are checked before anything is changed, so a duplicate leaves the
+    # entities and the index untouched
+    created: dict[str, Attribute] = {}
+    attributes_by_table: dict[str, list[Attribute]] = {}
+    attributes = parent_name = None
+    for table, column, data_type, metadata in rows:
+        if table != parent_name:
+            attributes = attributes_by_table.setdefault(table, [])
+            parent_name = sys.intern(table)
+
+        name = sys.intern(f"{table}.{column}")
+        if name in attributes_index or name in created:
+            raise DuplicateNameError(f"`{name}` is already an attribute")
+        # the slots are set directly, entities are invalidated once at the end
+        attribute = object.__new__(Attribute)
+        attribute._name = sys.intern(column)
+        attribute._parent_name = parent_name
+        attribute._qualified_name = name
+        attribute._data_type = data_type
+        attribute._metadata = metadata
+        attribute._rendered = None
+        attribute._dirty = True
+        attribute._registry = None
+        created[name] = attribute
+        attributes.append(attribute)
+
+    entities: dict[str, Entity] = {}
+    for table, attributes in attributes_by_table.items():
+        entity = registry.get(table) or Entity(table)
+        for attribute in attributes:
+            attribute._parent = entity
+        entity.attributes.extend(attributes)
+        entity.invalidate()
+        entities[table] = entity
+    attributes_index.update(created)
+    return entities
+
+
+def relationships_from_rows(
+    rows: Iterable[tuple[str, str, str, str]],
+    relation: EntityRelationshipType = EntityRelationshipType.MANY_TO_ONE,
+) -> None:
+    """Create relationships between attributes in bulk
+
+    The relationships are stored in the edge table of the registry, so they are drawn
+    after all the other graphs, see `EntityRelationshipRegistry.relationships`.
+
+    Example:
+        relationships_from_rows([("users", "team_id", "teams", "id")])
+
+    Args:
+        rows (Iterable[tuple[str, str, str, str]]): The foreign keys as
+            `(entity, attribute, referenced_entity, referenced_attribute)` rows
+        relation (EntityRelationshipType, optional): The relation of the attributes to
+            the referenced ones. Defaults to `EntityRelationshipType.MANY_TO_ONE`.
+    """
+    sources: list[str] = []
+    targets: list[str] = []
+    for table, column, referenced_table, referenced_column in rows:
+        sources.append(f"{table}.{column}")
+        targets.append(f"{referenced_table}.{referenced_column}")
+    EntityRelationship.registry().relationships.extend(sources, targets, relation)
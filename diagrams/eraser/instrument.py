@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import time
+
+# `typing` is slow to import and only used by annotations, see `diagrams.eraser`
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Iterator
+
+__all__ = [
+    "Stats",
+    "instrument",
+]
+
+# The stats recording the current context, the hot paths only check this variable
+# while instrumentation is disabled. Like the active `Diagram`, it is scoped to the
+# current thread or task.
+active: contextvars.ContextVar[Stats | None] = contextvars.ContextVar(
+    "active_stats", default=None
+)
+# The coarse phases being measured in the current context, see `measure()`
+open_phases: contextvars.ContextVar[frozenset[str]] = contextvars.ContextVar(
+    "open_phases", default=frozenset()
+)
+
+
+class Stats:
+    """Counts and cumulative times per phase and per graph type
+
+    The phases are:
+        construct: creating and registering a graph, by graph type
+        append: adding graphs to a group or attributes to an entity, by container type
+        properties: creating the properties of a graph
+        render: rendering a graph not memoized yet, by graph type. A group includes the
+            time of the graphs it contains.
+        draw: drawing, writing or rendering a whole diagram, by drawable type. Nested
+            calls, e.g. `.draw()` writing through `.write()`, are recorded once.
+
+    The peak registry size is the largest number of graphs in a registry.
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[str, dict[str, int]] = {}
+        self.times: dict[str, dict[str, int]] = {}
+        self.peak_registry_size = 0
+
+    def record(self, phase: str, kind: str, elapsed_ns: int) -> None:
+        """Record one call
+
+        Args:
+            phase (str): The phase, e.g. `construct`
+            kind (str): The graph type, e.g. `Node`
+            elapsed_ns (int): The time of the call in nanoseconds
+        """
+        counts = self.counts.setdefault(phase, {})
+        counts[kind] = counts.get(kind, 0) + 1
+        times = self.times.setdefault(phase, {})
+        times[kind] = times.get(kind, 0) + elapsed_ns
+
+    def observe_registry_size(self, size: int) -> None:
+        if size > self.peak_registry_size:
+            self.peak_registry_size = size
+
+    def as_dict(self) -> dict:
+        """The stats as a JSON-serializable dict
+
+        Returns:
+            dict: The `count` and `seconds` by kind in `phases`, and the
+                `peak_registry_size`
+        """
+        return {
+            "phases": {
+                phase: {
+                    kind: {"count": count, "seconds": self.times[phase][kind] / 1e9}
+                    for kind, count in sorted(counts.items())
+                }
+                for phase, counts in self.counts.items()
+            },
+            "peak_registry_size": self.peak_registry_size,
+        }
+
+    def dump(self, file: str | os.PathLike | IO[str]) -> None:
+        """Write the stats as JSON
+
+        Args:
+            file (str | os.PathLike | IO[str]): A path or a text file
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w", encoding="utf-8") as output:
+                self.dump(output)
+            return
+        # imported on use to keep the import of the package fast
+        import json  # pylint: disable=import-outside-toplevel
+
+        json.dump(self.as_dict(), file, indent=2)
+        file.write("\n")
+
+
+@contextlib.contextmanager
+def instrument(dump: str | os.PathLike | IO[str] | None = None) -> Iterator[Stats]:
+    """Record the construction and the rendering of the diagrams of the context
+
+    Instrumentation is opt-in, the hot paths cost a single variable check while it is
+    disabled. The stats are scoped with `contextvars`: the asyncio tasks created within
+    the context record into them, but threads start with an empty context and record
+    nothing unless they run in a copy of it, e.g.
+    `Thread(target=contextvars.copy_context().run, args=(build,))`.
+
+    Example:
+        with instrument("stats.json") as stats:
+            build()
+            CloudArchitecture.draw()
+
+    Args:
+        dump (str | os.PathLike | IO[str], optional): Where to write the stats as JSON
+            when the context exits. Defaults to None.
+
+    Yields:
+        Stats: The stats, recorded until the context exits
+    """
+    stats = Stats()
+    token = active.set(stats)
+    try:
+        yield stats
+    finally:
+        active.reset(token)
+        if dump is not None:
+            stats.dump(dump)
+
+
+@contextlib.contextmanager
+def measure(phase: str, kind: str) -> Iterator[None]:
+    """Record a coarse call, e.g. a draw, once even when nested
+
+    Args:
+        phase (str): The phase
+        kind (str): The graph or drawable type
+    """
+    stats = active.get()
+    phases = open_phases.get()
+    if stats is None or phase in phases:
+        yield
+        return
+
+    token = open_phases.set(phases | {phase})
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        open_phases.reset(token)
+        stats.record(phase, kind, time.perf_counter_ns() - started)
@@ -0,0 +1,290 @@
+"""Split large cloud architecture diagrams into pages of bounded size
+
+The top-level graphs are laid out on pages in drawing order, a top-level group is
+never split across pages. Each connection is drawn on the page of its source, a
+connection to a graph of another page points to a stub node instead, e.g.
+`service (page 3) [color: gray]`.
+
+The pages are rendered one at a time, so drawing a page only needs the memory of the
+page. The groups are streamed rather than memoized, both to measure them while laying
+out the pages and to draw them, only the small outputs of the nodes are kept.
+
+Example:
+    for path in write_pages("network-{}.eraser", max_bytes=1_000_000):
+        print(path)
+"""
+
+from __future__ import annotations
+
+import array
+from typing import TYPE_CHECKING, Iterator, Union
+
+from .base import Diagram, Drawable, Graph, Registry, update_fingerprint
+from .cloud_architecture import CloudArchitecture, Group
+from .relations import ArrowType, EdgeRegistry, EdgeTable, Relations
+
+if TYPE_CHECKING:
+    import hashlib
+
+__all__ = [
+    "Page",
+    "paginate",
+    "write_pages",
+]
+
+Source = Union[Diagram, Registry, None]
+
+# The stub standing for a graph drawn on another page
+STUB_NAME = "{name} (page {number})"
+STUB_PROPERTIES = "[color: gray]"
+
+
+class Page(Drawable):
+    """A page of a paginated diagram, drawn like a whole diagram
+
+    Args:
+        number (int): The number of the page, starting at 1
+        pages (dict[str, int]): The page number of every graph of the diagram
+        edges (EdgeTable): The edge table of the diagram
+    """
+
+    def __init__(self, number: int, pages: dict[str, int], edges: EdgeTable) -> None:
+        self.number = number
+        self.roots: list[Graph] = []
+        # the relations drawn at their creation position, see `Connection`
+        self.connections: list[Relations] = []
+        # the indices of the edges of the page in the edge table
+        self.edge_indices = array.array("I")
+        self._pages = pages
+        self._edges = edges
+
+    def iter_edges(self) -> Iterator[tuple[str, ArrowType, str, str | None]]:
+        """The connections of the page, with the original names
+
+        Yields:
+            tuple: The source name, the relation, the target name and the label
+        """
+        for connection in self.connections:
+            yield (
+                connection.source,
+                connection.relation,
+                connection.target,
+                connection.label,
+            )
+
+        edges = self._edges
+        names, members, labels = edges.names, list(edges.relation_type), edges.labels
+        for index in self.edge_indices:
+            yield (
+                names[edges.sources[index]],
+                members[edges.relations[index]],
+                names[edges.targets[index]],
+                None if labels is None else labels[index],
+            )
+
+    def stub(self, name: str) -> str | None:
+        """The stub of a graph drawn on another page
+
+        Args:
+            name (str): The name of the graph
+
+        Returns:
+            str | None: The name of the stub, or None when the graph is on this page
+                or is not a graph of the diagram
+        """
+        number = self._pages.get(name, self.number)
+        if number == self.number:
+            return None
+        return STUB_NAME.format(name=name, number=number)
+
+    def iter_connections(self) -> Iterator[str]:
+        """Render the stubs, then the connections of the page, one by one
+
+        Yields:
+            str: The rendered stub or connection
+        """
+        stubs: dict[str, None] = {}
+        for _, _, target, _ in self.iter_edges():
+            stub = self.stub(target)
+            if stub is not None:
+                stubs.setdefault(stub)
+        for stub in stubs:
+            yield f"{stub} {STUB_PROPERTIES}"
+
+        for source, relation, target, label in self.iter_edges():
+            line = f"{source} {relation.value} {self.stub(target) or target}"
+            yield line if label is None else f"{line} : {label}"
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        """Feed the graphs of the page, then its connections with their stubs
+
+        Args:
+            hasher (hashlib.blake2b): The hasher to update
+        """
+        update_fingerprint(hasher, self.roots)
+        for source, relation, target, label in self.iter_edges():
+            edge = (source, relation.value, self.stub(target) or target, label)
+            hasher.update(f"{edge!r}\n".encode())
+
+    def iter_render(self) -> Iterator[str]:
+        for graph in self.roots:
+            yield "".join(_stream(graph))
+        yield from self.iter_connections()
+
+    def iter_fragments(self) -> Iterator[str]:
+        for graph in self.roots:
+            yield from _stream(graph)
+            yield "\n"
+        for line in self.iter_connections():
+            yield line
+            yield "\n"
+
+
+def paginate(
+    source: Source = None,
+    max_nodes: int | None = None,
+    max_bytes: int | None = None,
+) -> list[Page]:
+    """Lay out a cloud architecture diagram on pages
+
+    A page holds at most `max_nodes` nodes and groups, and at most `max_bytes` bytes
+    once drawn, stubs and connections included. A top-level group over a limit is
+    alone on its page. The connections from graphs which are not in the diagram are
+    drawn on the page of their target, or on the first one, and are not counted.
+
+    Args:
+        source (Diagram | Registry, optional): The diagram to paginate, or its cloud
+            architecture registry. Defaults to the registry of the current context.
+        max_nodes (int, optional): The maximum number of nodes and groups of a page.
+            Defaults to None.
+        max_bytes (int, optional): The maximum size of a page in bytes, as UTF-8.
+            Defaults to None.
+
+    Returns:
+        list[Page]: The pages in order, the graphs are drawn on exactly one page
+
+    Raises:
+        ValueError: If neither `max_nodes` nor `max_bytes` is set
+    """
+    if max_nodes is None and max_bytes is None:
+        raise ValueError("`max_nodes` or `max_bytes` should be set")
+    if source is None:
+        registry = CloudArchitecture.registry()
+    elif isinstance(source, Diagram):
+        registry = source.registry(CloudArchitecture)
+    else:
+        registry = source
+    if isinstance(registry, EdgeRegistry):
+        edges = registry.edges
+    else:
+        edges = EdgeTable(ArrowType)
+
+    connections = [graph for graph in registry.roots() if isinstance(graph, Relations)]
+    weights = _weights(edges, connections)
+    pages: dict[str, int] = {}
+    page = Page(1, pages, edges)
+    result = [page]
+    nodes = size = 0
+    for root in registry.roots():
+        if isinstance(root, Relations):
+            continue
+        names = _names(root)
+        root_size = sum(len(fragment.encode()) for fragment in _stream(root)) + 1
+        root_size += sum(weights.get(name, 0) for name in names)
+        over_nodes = max_nodes is not None and nodes + len(names) > max_nodes
+        over_bytes = max_bytes is not None and size + root_size > max_bytes
+        if page.roots and (over_nodes or over_bytes):
+            page = Page(len(result) + 1, pages, edges)
+            result.append(page)
+            nodes = size = 0
+        page.roots.append(root)
+        nodes += len(names)
+        size += root_size
+        for name in names:
+            pages[name] = page.number
+
+    for connection in connections:
+        number = pages.get(connection.source) or pages.get(connection.target, 1)
+        result[number - 1].connections.append(connection)
+    page_by_id = [pages.get(name, 0) for name in edges.names]
+    for index, (source, target) in enumerate(zip(edges.sources, edges.targets)):
+        number = page_by_id[source] or page_by_id[target] or 1
+        result[number - 1].edge_indices.append(index)
+    return result
+
+
+def write_pages(
+    pattern: str,
+    source: Source = None,
+    max_nodes: int | None = None,
+    max_bytes: int | None = None,
+) -> list[str]:
+    """Write each page of a diagram to its own file, see `paginate()`
+
+    Args:
+        pattern (str): The path of the files, formatted with the page number,
+            e.g. `network-{}.eraser`
+        source (Diagram | Registry, optional): The diagram to paginate. Defaults to
+            the registry of the current context.
+        max_nodes (int, optional): The maximum number of nodes and groups of a page.
+            Defaults to None.
+        max_bytes (int, optional): The maximum size of a page in bytes.
+            Defaults to None.
+
+    Returns:
+        list[str]: The paths of the written files, in page order
+    """
+    paths = []
+    for page in paginate(source, max_nodes, max_bytes):
+        path = pattern.format(page.number)
+        with open(path, "w", encoding="utf-8") as file:
+            page.write(file)
+        paths.append(path)
+    return paths
+
+
+def _stream(root: Graph) -> Iterator[str]:
+    """The fragments of a top-level graph, without memoizing the output of a group"""
+    if isinstance(root, Group):
+        return root.walk()
+    return root.fragments()
+
+
+def _names(root: Graph) -> list[str]:
+    """The names of a top-level graph and of the graphs it contains"""
+    names = []
+    stack = [root]
+    while stack:
+        graph = stack.pop()
+        names.append(graph.name)
+        stack.extend(graph.members())
+    return names
+
+
+def _weights(edges: EdgeTable, connections: list[Relations]) -> dict[str, int]:
+    """The bytes drawn for the connections of each source, at most
+
+    A connection to another page points to a stub, which may be drawn for this
+    connection alone. The page numbers are counted with 10 digits.
+    """
+    # what a stub adds to the name of a target, and the rest of the line of a stub
+    suffix = len(STUB_NAME.format(name="", number=0)) + 9
+    stub = suffix + len(f" {STUB_PROPERTIES}\n")
+    sizes = [len(name.encode()) for name in edges.names]
+    tokens = [len(f" {member.value} ".encode()) for member in edges.relation_type]
+    labels = edges.labels
+
+    by_id = [0] * len(sizes)
+    rows = zip(edges.sources, edges.targets, edges.relations)
+    for index, (source, target, code) in enumerate(rows):
+        weight = sizes[source] + tokens[code] + 2 * sizes[target] + suffix + 1 + stub
+        if labels is not None and labels[index] is not None:
+            weight += len(f" : {labels[index]}".encode())
+        by_id[source] += weight
+    weights = {name: weight for name, weight in zip(edges.names, by_id) if weight}
+
+    for connection in connections:
+        target = len(connection.target.encode())
+        weight = len(connection.render().encode()) + suffix + 1 + target + stub
+        weights[connection.source] = weights.get(connection.source, 0) + weight
+    return weights
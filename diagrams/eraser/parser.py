@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import functools
+import mmap
+import os
+import re
+from typing import IO, Iterable, Iterator, Union
+
+from . import cloud_architecture, entity_relationship, sequence
+from .base import Diagram, Graph
+from .properties import Properties
+from .relations import ArrowType, EntityRelationshipType
+
+__all__ = [
+    "ParseError",
+    "iter_lines",
+    "parse_cloud_architecture",
+    "parse_entity_relationship",
+    "parse_sequence",
+]
+
+Source = Union[str, os.PathLike, IO[str], mmap.mmap, Iterable[str]]
+
+# `name [key: value, ...]`, the properties are optional but not the space
+DEFINITION = re.compile(r"^(?P<name>.+?) (?:\[(?P<properties>[^\[\]]*)\])?$")
+# `source relation target : label`, the label is optional
+RELATION = re.compile(
+    r"^(?P<source>.+?) (?P<relation><>|-->|--|-|>|<) (?P<target>.+?)"
+    r"(?: : (?P<label>.*))?$"
+)
+ACTIVATION = re.compile(r"^(?P<keyword>activate|deactivate) (?P<name>.+)$")
+
+
+class ParseError(ValueError):
+    def __init__(self, message: str, number: int, line: str) -> None:
+        super().__init__(f"line {number}: {message}: {line!r}")
+        self.number = number
+        self.line = line
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """Read the lines of a diagram one by one, without their line endings
+
+    Args:
+        source (Source): A path, a text file, a memory-mapped file of UTF-8 text or any
+            iterable of lines
+
+    Yields:
+        str: The lines
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as file:
+            yield from iter_lines(file)
+        return
+
+    if isinstance(source, mmap.mmap):
+        for line in iter(source.readline, b""):
+            yield line.decode("utf-8").rstrip("\r\n")
+        return
+
+    for line in source:
+        yield line.rstrip("\r\n")
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_properties(text: str | None) -> Properties:
+    """Parse the `key: value, ...` properties of a definition, cached by text
+
+    Raises:
+        ValueError: If a property is malformed or not supported
+    """
+    if text is None:
+        return Properties.of()
+    fields = {}
+    for item in text.split(", "):
+        key, separator, value = item.partition(": ")
+        if not separator:
+            raise ValueError(f"malformed property `{item}`")
+        fields[key] = value
+    if fields.keys() <= {"icon", "color"}:
+        return Properties.of(**fields)
+    try:
+        return Properties(**fields)
+    except TypeError as error:
+        raise ValueError(f"unsupported properties `{text}`") from error
+
+
+def match_definition(line: str) -> re.Match | None:
+    """Match a definition which may also read as a relation
+
+    Names may contain relation tokens, e.g. `a - b [icon: x]`, so a line matching both
+    forms is a definition when its properties are valid, or when it has neither
+    properties nor a relation label, e.g. `a - b `, relations without a label never
+    end with a space. Otherwise it is a relation, e.g. `client > server : fetch [x]`.
+
+    Args:
+        line (str): A line which is not the start of a group
+
+    Returns:
+        re.Match | None: The definition, None for a relation or an unexpected line
+    """
+    match = DEFINITION.match(line)
+    if match is None:
+        return None
+    relation = RELATION.match(line)
+    if relation is None:
+        return match
+    if match["properties"] is None:
+        return match if relation["label"] is None else None
+    try:
+        parse_properties(match["properties"])
+    except ValueError:
+        return None
+    return match
+
+
+def create(cls: type[Graph], match: re.Match) -> Graph:
+    """Create a graph from a matched definition"""
+    properties = parse_properties(match["properties"])
+    graph = cls(match["name"], icon=properties.icon, color=properties.color)
+    if graph.properties is not properties:
+        # label or shape, shared properties are equal but may be evicted
+        graph.properties = properties
+    return graph
+
+
+def parse_cloud_architecture(source: Source) -> Diagram:
+    """Parse a cloud architecture diagram, as drawn by `CloudArchitecture.draw()`
+
+    Connections are created as `Connection` graphs, so they are drawn where they are
+    defined.
+
+    Args:
+        source (Source): The diagram, see `iter_lines()`
+
+    Returns:
+        Diagram: A new diagram with the parsed graphs
+
+    Raises:
+        ParseError: If a line can not be parsed
+    """
+    groups: list[cloud_architecture.Group] = []
+    with Diagram() as diagram:
+        for number, line in enumerate(iter_lines(source), start=1):
+            try:
+                if not line or line.startswith("//"):
+                    continue
+                if line == "}":
+                    if not groups:
+                        raise ValueError("unexpected end of group")
+                    groups.pop()
+                    continue
+
+                is_group = line.endswith(" {")
+                match = (
+                    DEFINITION.match(line[:-2]) if is_group else match_definition(line)
+                )
+                if match is not None:
+                    if is_group:
+                        graph = create(cloud_architecture.Group, match)
+                    else:
+                        graph = create(cloud_architecture.Node, match)
+                    if groups:
+                        groups[-1].append(graph)
+                    if is_group:
+                        groups.append(graph)
+                    continue
+
+                match = RELATION.match(line)
+                if match is None or groups:
+                    # connections are drawn at the top level, never in a group
+                    raise ValueError("unexpected line")
+                cloud_architecture.Connection(
+                    source=match["source"],
+                    target=match["target"],
+                    relation=ArrowType(match["relation"]),
+                    label=match["label"],
+                )
+            except ValueError as error:
+                raise ParseError(str(error), number, line) from error
+
+    if groups:
+        raise ParseError("unclosed group", number, groups[-1].name)
+    return diagram
+
+
+def parse_entity_relationship(source: Source) -> Diagram:
+    """Parse an entity relationship diagram, as drawn by `EntityRelationship.draw()`
+
+    Args:
+        source (Source): The diagram, see `iter_lines()`
+
+    Returns:
+        Diagram: A new diagram with the parsed graphs
+
+    Raises:
+        ParseError: If a line can not be parsed
+    """
+    entity = None
+    with Diagram() as diagram:
+        for number, line in enumerate(iter_lines(source), start=1):
+            try:
+                if entity is not None:
+                    if line == "}":
+                        entity = None
+                    elif line:
+                        name, _, rest = line.partition(" ")
+                        data_type, _, metadata = rest.partition(" ")
+                        entity.add_attribute(name, data_type, metadata)
+                    continue
+                if not line or line.startswith("//"):
+                    continue
+
+                if line.endswith(" {"):
+                    match = DEFINITION.match(line[:-2])
+                    if match is None:
+                        raise ValueError("malformed entity")
+                    entity = create(entity_relationship.Entity, match)
+                    continue
+
+                match = RELATION.match(line)
+                if match is None:
+                    raise ValueError("unexpected line")
+                entity_relationship.Relationship(
+                    source=match["source"],
+                    target=match["target"],
+                    relation=EntityRelationshipType(match["relation"]),
+                    label=match["label"],
+                )
+            except ValueError as error:
+                raise ParseError(str(error), number, line) from error
+
+    if entity is not None:
+        raise ParseError("unclosed entity", number, entity.name)
+    return diagram
+
+
+def parse_sequence(source: Source) -> Diagram:
+    """Parse a sequence diagram, as drawn by `Sequence.draw()`
+
+    Args:
+        source (Source): The diagram, see `iter_lines()`
+
+    Returns:
+        Diagram: A new diagram with the parsed graphs
+
+    Raises:
+        ParseError: If a line can not be parsed
+    """
+    depth = 0
+    with Diagram() as diagram:
+        for number, line in enumerate(iter_lines(source), start=1):
+            try:
+                if not line or line.startswith("//"):
+                    continue
+                if line == "}":
+                    if not depth:
+                        raise ValueError("unexpected end of block")
+                    depth -= 1
+                    sequence.EndGroup()
+                    continue
+
+                if line.endswith(" {"):
+                    match = DEFINITION.match(line[:-2])
+                    if match is None:
+                        raise ValueError("malformed block")
+                    label = parse_properties(match["properties"]).label
+                    sequence.StartGroup(match["name"], label)
+                    depth += 1
+                    continue
+
+                match = match_definition(line)
+                if match is not None:
+                    create(sequence.Node, match)
+                    continue
+
+                match = ACTIVATION.match(line)
+                if match is not None:
+                    if match["keyword"] == "activate":
+                        sequence.Activation(match["name"])
+                    else:
+                        sequence.Deactivate(match["name"])
+                    continue
+
+                match = RELATION.match(line)
+                if match is None:
+                    raise ValueError("unexpected line")
+                sequence.Action(
+                    source=match["source"],
+                    target=match["target"],
+                    relation=ArrowType(match["relation"]),
+                    label=match["label"],
+                )
+            except ValueError as error:
+                raise ParseError(str(error), number, line) from error
+
+    if depth:
+        raise ParseError("unclosed block", number, "")
+    return diagram
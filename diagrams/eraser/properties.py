@@ -1,11 +1,18 @@
+from __future__ import annotations
+
+import functools
+import time
+
 import attrs
 
+from . import instrument
+
 
 class NotSupportedError(Exception):
     pass
 
 
-@attrs.define(kw_only=True)
+@attrs.frozen(kw_only=True)
 class Properties:
     """Supported properties for a diagram node in Eraser
 
@@ -27,6 +34,10 @@ class Properties:
         entity relationship diagrams: https://docs.eraser.io/docs/syntax-1#properties
         sequence diagrams: https://docs.eraser.io/docs/syntax-2#properties
         flow charts (NOT YET SUPPORTED): https://docs.eraser.io/docs/syntax-3#properties
+
+    Properties are immutable, graphs created with the same icon and color share the same
+    instance through `Properties.of()`, and `EMPTY_PROPERTIES` when none is set. The
+    rendered strings are cached by values.
     """
 
     icon: str | None = None
@@ -44,8 +55,49 @@ class Properties:
             A string representation of the properties. There are key-value pairs enclosed in `[ ]`
             brackets or an empty string if no properties are set.
         """
-        filtered_fields = attrs.asdict(self, filter=lambda _, v: v is not None)
-        serialized_items = [f"{key}: {value}" for key, value in filtered_fields.items()]
-        if serialized_items:
-            return f"[{', '.join(serialized_items)}]"
-        return ""
+        return _render_properties(self.icon, self.color, self.label, self.shape)
+
+    @classmethod
+    def of(cls, icon: str | None = None, color: str | None = None) -> Properties:
+        """Create the properties of a graph
+
+        Args:
+            icon (str, optional): The icon of the graph. Defaults to None.
+            color (str, optional): The color of the graph. Defaults to None.
+
+        Returns:
+            Properties: The properties, shared between graphs with the same ones
+        """
+        stats = instrument.active.get()
+        if stats is not None:
+            started = time.perf_counter_ns()
+        if icon is None and color is None:
+            properties = EMPTY_PROPERTIES
+        else:
+            properties = _shared_properties(icon, color)
+        if stats is not None:
+            stats.record("properties", "Properties", time.perf_counter_ns() - started)
+        return properties
+
+
+EMPTY_PROPERTIES = Properties()
+
+
+@functools.lru_cache(maxsize=1024)
+def _shared_properties(icon: str | None, color: str | None) -> Properties:
+    return Properties(icon=icon, color=color)
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_properties(*values: str | None) -> str:
+    serialized_items = [
+        f"{key}: {value}"
+        for key, value in zip(_FIELD_NAMES, values)
+        if value is not None
+    ]
+    if serialized_items:
+        return f"[{', '.join(serialized_items)}]"
+    return ""
+
+
+_FIELD_NAMES = tuple(field.name for field in attrs.fields(Properties))
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import random
+import sys
+import types
+from typing import Any, Callable, Iterable, TypeVar
+
+from .sequence import Block, Node
+
+__all__ = [
+    "Recorder",
+]
+
+T = TypeVar("T")
+
+# A completed call: the participant, the function name and the calls it made as
+# `(call, count)` pairs, consecutive identical calls being counted once
+Call = tuple[str, str, tuple]
+
+# A recorded call as `[call, count, events]`, `events` being the number of calls it
+# retains, its nested calls included
+Entry = list
+
+
+class Recorder:
+    """Record the calls between participants and draw them as a sequence diagram
+
+    Functions and classes are registered as participants with `.participant()`, then
+    the calls between them are recorded with `sys.setprofile()` while the recorder is
+    active. A call from a participant to another one is drawn as a request from the
+    caller, with the callee activated until it returns. Calls of a participant to
+    itself are merged into the caller.
+
+    Memory is bounded:
+        - Consecutive identical calls, with the same calls nested, are recorded once
+          with a count, and drawn as a `loop` block, e.g. `loop [label: x 100]`.
+        - At most `max_events` calls are kept, nested calls included, whatever their
+          depth. The oldest ones are dropped first with the calls they made, and
+          counted in `.dropped`.
+        - Only a sample of the top-level calls is recorded, with their nested calls.
+
+    Only the current thread is recorded, generators and coroutines are recorded each
+    time they are resumed.
+
+    Example:
+        recorder = Recorder()
+
+        @recorder.participant("api")
+        class Api:
+            def get(self):
+                database.query()
+
+        with recorder:
+            Api().get()
+
+        recorder.build()
+        Sequence.draw()
+
+    Args:
+        sample_rate (float, optional): The fraction of the top-level calls recorded.
+            Defaults to 1.0.
+        max_events (int, optional): The number of calls kept. Defaults to 10_000.
+        seed (int, optional): The seed of the sampling. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        max_events: int = 10_000,
+        seed: int | None = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.max_events = max_events
+        self.calls: collections.deque[Entry] = collections.deque()
+        self.dropped = 0
+        # the number of calls kept, in `.calls` and in the open calls
+        self._events = 0
+        self._participants: dict[str, dict[str, Any]] = {}
+        self._codes: dict[types.CodeType, tuple[str, str]] = {}
+        self._random = random.Random(seed)
+        # the open calls of participants as `[frame, participant, label, calls]`
+        self._stack: list[list] = []
+        self._skipped: types.FrameType | None = None
+        self._previous_profile: Callable | None = None
+
+    def participant(
+        self,
+        name: str | None = None,
+        icon: str | None = None,
+        color: str | None = None,
+    ) -> Callable[[T], T]:
+        """Register a function, or the methods of a class, as a participant
+
+        The decorated object is returned unchanged.
+
+        Args:
+            name (str, optional): The name of the participant. Defaults to the
+                qualified name of the decorated object.
+            icon (str, optional): The icon of the participant. Defaults to None.
+            color (str, optional): The color of the participant. Defaults to None.
+
+        Returns:
+            Callable: The decorator
+        """
+
+        def decorator(target: T) -> T:
+            participant = name or target.__qualname__
+            self._participants[participant] = {"icon": icon, "color": color}
+            for function in _functions(target):
+                code = function.__code__
+                self._codes[code] = (participant, code.co_name)
+            return target
+
+        return decorator
+
+    def __enter__(self) -> Recorder:
+        self._previous_profile = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        sys.setprofile(self._previous_profile)
+        self._stack.clear()
+        self._skipped = None
+
+    def _profile(self, frame: types.FrameType, event: str, _: Any) -> None:
+        if event == "call":
+            entry = self._codes.get(frame.f_code)
+            if entry is None or self._skipped is not None:
+                return
+            if not self._stack and self._random.random() >= self.sample_rate:
+                # the top-level call is not sampled, nor the calls it makes
+                self._skipped = frame
+                return
+            participant, label = entry
+            self._stack.append([frame, participant, label, collections.deque()])
+
+        elif event == "return":
+            if self._skipped is frame:
+                self._skipped = None
+                return
+            stack = self._stack
+            if not stack or stack[-1][0] is not frame:
+                return
+            _, participant, label, calls = stack[-1]
+            call = _call(participant, label, calls)
+            siblings = stack[-2][3] if len(stack) > 1 else self.calls
+            if siblings and siblings[-1][0] == call:
+                stack.pop()
+                siblings[-1][1] += 1
+                # the nested calls are already kept by the identical sibling
+                self._events -= sum(events for _, _, events in calls)
+                return
+            if self._events >= self.max_events:
+                # the nested calls of the returning call may be dropped too
+                self._evict()
+                call = _call(participant, label, calls)
+            stack.pop()
+            events = 1 + sum(events for _, _, events in calls)
+            siblings.append([call, 1, events])
+            self._events += 1
+
+    def _evict(self) -> None:
+        """Drop the oldest calls until one more can be kept
+
+        The calls kept in `.calls` are older than the ones of the open calls, and the
+        calls of an open call older than the ones of the calls it made.
+        """
+        for calls in itertools.chain([self.calls], (entry[3] for entry in self._stack)):
+            while calls and self._events >= self.max_events:
+                _, _, events = calls.popleft()
+                self._events -= events
+                self.dropped += events
+            if self._events < self.max_events:
+                return
+
+    def build(self) -> None:
+        """Create the recorded participants and calls in the sequence registry
+
+        The participants are created first, in order of appearance.
+        """
+        calls = [(call, count) for call, count, _ in self.calls]
+        nodes = {
+            name: Node.get_or_create(name, **self._participants[name])
+            for name in _participants(calls)
+        }
+        _build(nodes, None, calls)
+
+
+def _call(participant: str, label: str, calls: Iterable[Entry]) -> Call:
+    """The completed call of a participant, from the calls it made"""
+    return (participant, label, tuple((call, count) for call, count, _ in calls))
+
+
+def _build(
+    nodes: dict[str, Node], caller: str | None, calls: Iterable[tuple[Call, int]]
+) -> None:
+    for call, count in calls:
+        if count > 1:
+            with Block("loop", f"x {count}"):
+                _build_call(nodes, caller, call)
+        else:
+            _build_call(nodes, caller, call)
+
+
+def _build_call(nodes: dict[str, Node], caller: str | None, call: Call) -> None:
+    participant, label, nested = call
+    if caller is None or caller == participant:
+        _build(nodes, participant, nested)
+        return
+    callee = nodes[participant]
+    nodes[caller].request(label, callee)
+    callee.activate()
+    _build(nodes, participant, nested)
+    callee.deactivate()
+
+
+def _functions(target: Any) -> Iterable[types.FunctionType]:
+    """The functions of a function, a method or the methods of a class"""
+    if isinstance(target, type):
+        for value in vars(target).values():
+            if isinstance(value, (staticmethod, classmethod)):
+                value = value.__func__
+            elif isinstance(value, property):
+                yield from (
+                    accessor
+                    for accessor in (value.fget, value.fset, value.fdel)
+                    if accessor is not None
+                )
+                continue
+            if isinstance(value, types.FunctionType):
+                yield value
+        return
+    yield getattr(target, "__func__", target)
+
+
+def _participants(calls: Iterable[tuple[Call, int]]) -> list[str]:
+    """The participants of the calls in order of appearance"""
+    seen: dict[str, None] = {}
+    stack = [iter(calls)]
+    while stack:
+        call = next(stack[-1], None)
+        if call is None:
+            stack.pop()
+            continue
+        (participant, _, nested), _ = call
+        seen.setdefault(participant)
+        stack.append(iter(nested))
+    return list(seen)
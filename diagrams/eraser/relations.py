@@ -1,7 +1,20 @@
+from __future__ import annotations
+
+import array
 import enum
+import itertools
+import sys
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 import attrs
 
+from .base import Registry
+
+if TYPE_CHECKING:
+    import hashlib
+
+    from .diff import Patch
+
 
 class ArrowType(enum.Enum):
     DEFAULT = "-"
@@ -13,6 +26,10 @@ class ArrowType(enum.Enum):
     DOTTED_LINE = "--"
     DOTTED_ARROW = "-->"
 
+    def __init__(self, value: str) -> None:
+        # the separator between the names, pre-rendered once per member
+        self.token = sys.intern(f" {value} ")
+
 
 class EntityRelationshipType(enum.Enum):
     DEFAULT = "-"
@@ -22,16 +39,355 @@ class EntityRelationshipType(enum.Enum):
     MANY_TO_ONE = ">"
     MANY_TO_MANY = "<>"
 
+    def __init__(self, value: str) -> None:
+        # the separator between the names, pre-rendered once per member
+        self.token = sys.intern(f" {value} ")
+
+
+# The separators of the relations between the names, see `ArrowType.token`
+TOKENS: dict[ArrowType | EntityRelationshipType, str] = {
+    member: member.token
+    for relation_type in (ArrowType, EntityRelationshipType)
+    for member in relation_type
+}
+
 
-@attrs.define(kw_only=True)
+def _invalidate(instance: Relations, _: attrs.Attribute, value: object) -> object:
+    # `Relations` subclassing a `Graph` report their changes
+    invalidate = getattr(instance, "invalidate", None)
+    if invalidate is not None:
+        invalidate()
+    return value
+
+
+@attrs.define(kw_only=True, on_setattr=_invalidate)
 class Relations:
     source: str
     target: str
     relation: ArrowType | EntityRelationshipType = ArrowType.DEFAULT
     label: str | None = None
 
+    def state(self) -> tuple:
+        """The values drawn for the relation, see `Graph.state()`"""
+        return (self.source, self.target, self.relation.value, self.label)
+
     def render(self) -> str:
         """Render the relationship between the source and target"""
-        if self.label is None:
-            return f"{self.source} {self.relation.value} {self.target}"
-        return f"{self.source} {self.relation.value} {self.target} : {self.label}"
+        line = self.source + self.relation.token + self.target
+        return line if self.label is None else f"{line} : {self.label}"
+
+
+def render_relations(relations: Iterable[Relations]) -> str:
+    """Render relations with a single join, like `Relations.render()` each
+
+    Args:
+        relations (Iterable[Relations]): The relations
+
+    Returns:
+        str: The relations separated by newlines
+    """
+    return "\n".join(
+        [
+            (
+                relation.source + relation.relation.token + relation.target
+                if relation.label is None
+                else f"{relation.source}{relation.relation.token}{relation.target}"
+                f" : {relation.label}"
+            )
+            for relation in relations
+        ]
+    )
+
+
+class EdgeTable:
+    """Columnar storage of the relations between graphs
+
+    Each edge is stored as integer ids into a table of names, the code of its relation
+    and an optional label, instead of one `Relations` object per edge. The edges render
+    exactly like `Relations.render()`.
+
+    Args:
+        relation_type (type[enum.Enum]): The enum of the relations, e.g. `ArrowType`
+    """
+
+    # The number of edges rendered by a single join
+    BLOCK_SIZE = 4096
+
+    def __init__(self, relation_type: type[ArrowType | EntityRelationshipType]) -> None:
+        self.relation_type = relation_type
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.sources = array.array("I")
+        self.targets = array.array("I")
+        self.relations = array.array("B")
+        # created with the first label, `None` stands for an edge without label
+        self.labels: list[str | None] | None = None
+        self._members = list(relation_type)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+        self._tokens = [TOKENS[member] for member in self._members]
+
+    def __len__(self) -> int:
+        return len(self.relations)
+
+    def __iter__(self) -> Iterator[Relations]:
+        """Iterate over the edges as `Relations` objects"""
+        names, members = self.names, self._members
+        for index in range(len(self)):
+            yield Relations(
+                source=names[self.sources[index]],
+                target=names[self.targets[index]],
+                relation=members[self.relations[index]],
+                label=None if self.labels is None else self.labels[index],
+            )
+
+    def iter_rows(
+        self,
+    ) -> Iterator[tuple[str, str, ArrowType | EntityRelationshipType, str | None]]:
+        """Iterate over the edges as tuples, without creating `Relations` objects
+
+        Yields:
+            tuple: The source name, the target name, the relation and the label
+        """
+        names, members = self.names, self._members
+        labels = self.labels or itertools.repeat(None, len(self))
+        for source, target, code, label in zip(
+            self.sources, self.targets, self.relations, labels
+        ):
+            yield names[source], names[target], members[code], label
+
+    def copy(self) -> EdgeTable:
+        """A copy of the table, the columns are copied in bulk
+
+        Returns:
+            EdgeTable: The new table
+        """
+        table = EdgeTable(self.relation_type)
+        table.names = list(self.names)
+        table.ids = dict(self.ids)
+        table.sources = array.array("I", self.sources)
+        table.targets = array.array("I", self.targets)
+        table.relations = array.array("B", self.relations)
+        table.labels = None if self.labels is None else list(self.labels)
+        return table
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        """Feed the edges to a hasher, see `Drawable.fingerprint()`
+
+        Args:
+            hasher (hashlib.blake2b): The hasher to update
+        """
+        hasher.update(f"{len(self)}\n".encode())
+        hasher.update("\0".join(self.names).encode())
+        for column in (self.sources, self.targets, self.relations):
+            if sys.byteorder == "big":
+                # hashed as little-endian to be stable across platforms
+                column = array.array(column.typecode, column)
+                column.byteswap()
+            hasher.update(column.tobytes())
+        if self.labels is not None:
+            hasher.update(repr(self.labels).encode())
+
+    def name_id(self, name: str) -> int:
+        """The id of a name, added to the table of names if needed
+
+        Args:
+            name (str): The name of a graph
+
+        Returns:
+            int: The index of the name in `.names`
+        """
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def add(
+        self,
+        source: str,
+        target: str,
+        relation: ArrowType | EntityRelationshipType,
+        label: str | None = None,
+    ) -> None:
+        """Add an edge
+
+        Args:
+            source (str): The name of the source graph
+            target (str): The name of the target graph
+            relation (ArrowType | EntityRelationshipType): The relation of the edge
+            label (str, optional): The label of the edge. Defaults to None.
+        """
+        self.extend((source,), (target,), relation, None if label is None else (label,))
+
+    def extend(
+        self,
+        sources: Iterable[str],
+        targets: Iterable[str],
+        relation: ArrowType | EntityRelationshipType,
+        labels: Iterable[str | None] | None = None,
+    ) -> None:
+        """Add edges sharing the same relation
+
+        Args:
+            sources (Iterable[str]): The names of the source graphs
+            targets (Iterable[str]): The names of the target graphs, one per source
+            relation (ArrowType | EntityRelationshipType): The relation of the edges
+            labels (Iterable[str | None], optional): The labels of the edges, one per
+                source. Defaults to None.
+        """
+        code = self._codes[relation]
+        name_id = self.name_id
+        source_ids = [name_id(source) for source in sources]
+        target_ids = [name_id(target) for target in targets]
+        if len(source_ids) != len(target_ids):
+            raise ValueError("`sources` and `targets` should have the same length")
+        if labels is not None:
+            labels = list(labels)
+            if len(labels) != len(source_ids):
+                raise ValueError("`labels` should have one label per edge")
+
+        if labels is not None and self.labels is None:
+            self.labels = [None] * len(self)
+        if self.labels is not None:
+            self.labels.extend([None] * len(source_ids) if labels is None else labels)
+        self.sources.extend(source_ids)
+        self.targets.extend(target_ids)
+        self.relations.extend(bytes((code,)) * len(source_ids))
+
+    def render_lines(self, start: int, stop: int) -> list[str]:
+        """Render a range of edges, one line per edge
+
+        Args:
+            start (int): The index of the first edge
+            stop (int): The index after the last edge
+
+        Returns:
+            list[str]: The rendered edges, a label may contain newlines
+        """
+        names, tokens = self.names, self._tokens
+        rows = zip(
+            self.sources[start:stop],
+            self.relations[start:stop],
+            self.targets[start:stop],
+        )
+        if self.labels is None:
+            return [
+                names[source] + tokens[code] + names[target]
+                for source, code, target in rows
+            ]
+        lines = []
+        for (source, code, target), label in zip(rows, self.labels[start:stop]):
+            line = names[source] + tokens[code] + names[target]
+            lines.append(line if label is None else f"{line} : {label}")
+        return lines
+
+    def render_block(self, start: int, stop: int) -> str:
+        """Render a range of edges with a single join
+
+        Args:
+            start (int): The index of the first edge
+            stop (int): The index after the last edge
+
+        Returns:
+            str: The edges separated by newlines
+        """
+        return "\n".join(self.render_lines(start, stop))
+
+    def iter_blocks(self, block_size: int | None = None) -> Iterator[str]:
+        """Render the edges by blocks
+
+        Args:
+            block_size (int, optional): The number of edges of a block.
+                Defaults to `.BLOCK_SIZE`.
+
+        Yields:
+            str: The blocks of edges separated by newlines, without a trailing newline
+        """
+        block_size = block_size or self.BLOCK_SIZE
+        for start in range(0, len(self), block_size):
+            yield self.render_block(start, start + block_size)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Render the edges one by one
+
+        Yields:
+            str: The rendered edge
+        """
+        block_size = self.BLOCK_SIZE
+        for start in range(0, len(self), block_size):
+            yield from self.render_lines(start, start + block_size)
+
+    def render(self) -> str:
+        """Render all the edges
+
+        Returns:
+            str: The edges separated by newlines
+        """
+        return self.render_block(0, len(self))
+
+
+class EdgeRegistry(Registry):
+    """Registry storing relations in bulk in an edge table
+
+    The edges of `.edges` are drawn after all the other graphs. Subclasses set the
+    `relation_type` of the edges.
+    """
+
+    relation_type: type[ArrowType | EntityRelationshipType]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.edges = EdgeTable(self.relation_type)
+        self._published_edges = 0
+
+    def clear(self) -> None:
+        super().clear()
+        self.edges = EdgeTable(self.relation_type)
+        self._published_edges = 0
+
+    def diff(self) -> Patch:
+        patch = super().diff()
+        count = len(self.edges)
+        if count > self._published_edges:
+            patch.added.extend(self.edges.render_lines(self._published_edges, count))
+        self._published_edges = count
+        return patch
+
+    def update_fingerprint(self, hasher: hashlib.blake2b) -> None:
+        super().update_fingerprint(hasher)
+        self.edges.update_fingerprint(hasher)
+
+    def iter_render(self) -> Iterator[str]:
+        yield from super().iter_render()
+        yield from self.edges.iter_lines()
+
+    def iter_fragments(self) -> Iterator[str]:
+        """Render the graphs, then the edge table
+
+        Consecutive relations drawn at their creation position are rendered by blocks
+        with a single join, see `render_relations()`.
+
+        Yields:
+            str: The fragments of the diagram
+        """
+        block_size = self.edges.BLOCK_SIZE
+        relations: list[Relations] = []
+        for graph in self.roots():
+            if isinstance(graph, Relations):
+                relations.append(graph)
+                if len(relations) < block_size:
+                    continue
+            if relations:
+                yield render_relations(relations)
+                yield "\n"
+                relations = []
+            if not isinstance(graph, Relations):
+                yield from graph.fragments()
+                yield "\n"
+        if relations:
+            yield render_relations(relations)
+            yield "\n"
+
+        for block in self.edges.iter_blocks():
+            yield block
+            yield "\n"
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import contextlib
+import itertools
+import operator
+import os
+import pathlib
+import sqlite3
+from typing import IO, Iterator, TextIO, Union
+
+from .base import DEFAULT_BUFFER_SIZE, Diagram, buffered
+from .entity_relationship import entities_from_rows, relationships_from_rows
+
+__all__ = [
+    "from_ddl",
+    "from_sqlite",
+    "iter_fragments",
+    "sqlite_columns",
+    "sqlite_foreign_keys",
+    "write",
+]
+
+Database = Union[str, os.PathLike, sqlite3.Connection]
+
+# The columns of all the tables in a single query, in creation order
+COLUMNS = """
+SELECT m.name, p.name, p.type, p.pk
+FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p
+WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+ORDER BY m.rowid, p.cid
+"""
+
+# The foreign keys of all the tables in a single query, `to` is NULL when the primary
+# key of the referenced table is implied and `seq` is the position of the column in
+# its foreign key. SQLite numbers the foreign keys of a table from the last declared
+# one.
+FOREIGN_KEYS = """
+SELECT m.name, f."from", f."table", f."to", f.seq
+FROM sqlite_master AS m JOIN pragma_foreign_key_list(m.name) AS f
+WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+ORDER BY m.rowid, f.id DESC, f.seq
+"""
+
+PRIMARY_KEYS = """
+SELECT m.name, p.name
+FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p
+WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' AND p.pk > 0
+ORDER BY m.rowid, p.pk
+"""
+
+
+@contextlib.contextmanager
+def connect(database: Database) -> Iterator[sqlite3.Connection]:
+    """Open a database file read-only, a connection is used as is and left open"""
+    if isinstance(database, sqlite3.Connection):
+        yield database
+        return
+
+    uri = f"{pathlib.Path(database).resolve().as_uri()}?mode=ro"
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def sqlite_columns(connection: sqlite3.Connection) -> Iterator[tuple[str, ...]]:
+    """Read the columns of all the tables, fetched lazily from a single query
+
+    The primary keys have the `pk` metadata and the foreign keys the `fk` one.
+
+    Args:
+        connection (sqlite3.Connection): The database
+
+    Yields:
+        tuple[str, str, str, str]: The `(table, column, type, metadata)` rows, the
+            columns of a table are consecutive, see `entities_from_rows()`
+    """
+    foreign_keys = {
+        (table, column) for table, column, *_ in connection.execute(FOREIGN_KEYS)
+    }
+    for table, column, data_type, primary_key in connection.execute(COLUMNS):
+        if primary_key:
+            metadata = "pk"
+        elif (table, column) in foreign_keys:
+            metadata = "fk"
+        else:
+            metadata = ""
+        yield table, column, data_type, metadata
+
+
+def sqlite_foreign_keys(connection: sqlite3.Connection) -> list[tuple[str, ...]]:
+    """Read the foreign keys of all the tables
+
+    A foreign key referencing a table without naming its columns references its
+    primary key.
+
+    Args:
+        connection (sqlite3.Connection): The database
+
+    Returns:
+        list[tuple[str, str, str, str]]: The
+            `(table, column, referenced_table, referenced_column)` rows, see
+            `relationships_from_rows()`
+    """
+    primary_keys: dict[str, list[str]] = {}
+    for table, column in connection.execute(PRIMARY_KEYS):
+        primary_keys.setdefault(table, []).append(column)
+
+    rows = []
+    cursor = connection.execute(FOREIGN_KEYS)
+    for table, column, referenced_table, referenced_column, position in cursor:
+        if referenced_column is None:
+            # the n-th column of a foreign key references the n-th primary key
+            keys = primary_keys.get(referenced_table, ())
+            if position >= len(keys):
+                continue
+            referenced_column = keys[position]
+        rows.append((table, column, referenced_table, referenced_column))
+    return rows
+
+
+def from_sqlite(database: Database) -> Diagram:
+    """Build the entity relationship diagram of a SQLite database
+
+    Tables, columns and foreign keys are fetched with bulk queries over all the tables
+    and built with `entities_from_rows()` and `relationships_from_rows()`.
+
+    Args:
+        database (Database): The path of the database file, opened read-only, or a
+            connection
+
+    Returns:
+        Diagram: A new diagram with an entity per table
+    """
+    with connect(database) as connection, Diagram() as diagram:
+        entities_from_rows(sqlite_columns(connection))
+        relationships_from_rows(sqlite_foreign_keys(connection))
+    return diagram
+
+
+def from_ddl(source: str | os.PathLike | IO[str]) -> Diagram:
+    """Build the entity relationship diagram of a SQL DDL script
+
+    The script is executed in an in-memory SQLite database, so it should be written in
+    a dialect SQLite accepts.
+
+    Args:
+        source (str | os.PathLike | IO[str]): The path of the script or a text file
+
+    Returns:
+        Diagram: A new diagram with an entity per table
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as file:
+            return from_ddl(file)
+
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.executescript(source.read())
+        return from_sqlite(connection)
+    finally:
+        connection.close()
+
+
+def iter_fragments(database: Database) -> Iterator[str]:
+    """Render the diagram of a SQLite database without building it as a whole
+
+    The tables are built and rendered one at a time as the rows are fetched, so the
+    memory stays bounded by the largest table and the foreign keys.
+
+    Args:
+        database (Database): The path of the database file, opened read-only, or a
+            connection
+
+    Yields:
+        str: The fragments, they add up to `from_sqlite(database).render_to_string()`
+    """
+    scratch = Diagram()
+    with connect(database) as connection:
+        tables = itertools.groupby(
+            sqlite_columns(connection), key=operator.itemgetter(0)
+        )
+        for _, rows in tables:
+            # the scratch diagram is not active while the fragments are consumed
+            with scratch:
+                entities_from_rows(rows)
+            yield from scratch.iter_fragments()
+            scratch.clear()
+
+        with scratch:
+            relationships_from_rows(sqlite_foreign_keys(connection))
+    yield from scratch.iter_fragments()
+
+
+def write(
+    database: Database, file: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> None:
+    """Write the diagram of a SQLite database to a file as it is read
+
+    Args:
+        database (Database): The path of the database file or a connection
+        file (TextIO): The file-like object to write to
+        buffer_size (int, optional): The size of a write. Defaults to 64 KiB.
+    """
+    for chunk in buffered(iter_fragments(database), buffer_size):
+        file.write(chunk)
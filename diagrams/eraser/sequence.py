@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Callable
+import itertools
+from typing import Iterable
 
-from .base import Graph
+from .base import DiagramType, Graph, Registry, Tracked
 from .properties import Properties
 from .relations import ArrowType, Relations
 
@@ -13,40 +14,60 @@ __all__ = [
 ]
 
 
-class Sequence(type):
-    def __new__(mcs, name, bases, dct):
-        mcs._graphs = []
-        return super().__new__(mcs, name, bases, dct)
+class SequenceRegistry(Registry):
+    """Registry of the sequence diagrams
 
-    def __call__(cls, *args, **kwargs):
-        graph = super().__call__(*args, **kwargs)
-        cls._graphs.append(graph)
-        return graph
+    The participants and the events, i.e. the actions, activations and blocks, are
+    kept in separate stores. The participants are drawn first, wherever they are
+    created, then the events in creation order.
+    """
 
-    @classmethod
-    def draw(mcs, stdout: Callable = None):
-        if stdout is None:
-            stdout = print
+    def __init__(self) -> None:
+        super().__init__()
+        self.participants: list[Graph] = []
+        self.events: list[Graph] = []
 
-        for graph in mcs._graphs:
-            output = graph.render()
-            if output:
-                stdout(output)
+    def add(self, graph: Graph) -> None:
+        super().add(graph)
+        if isinstance(graph, Node):
+            self.participants.append(graph)
+        else:
+            self.events.append(graph)
 
-    @classmethod
-    def reset(mcs):
-        mcs._graphs = []
+    def clear(self) -> None:
+        super().clear()
+        self.participants = []
+        self.events = []
 
+    def roots(self) -> Iterable[Graph]:
+        """The participants, then the events
 
-class Action(Relations, Graph, metaclass=Sequence):
-    pass
+        Returns:
+            Iterable[Graph]: The graphs in drawing order
+        """
+        return itertools.chain(self.participants, self.events)
+
+
+class Sequence(DiagramType):
+    """Metaclass of the sequence diagrams"""
+
+    registry_class = SequenceRegistry
+
+
+class Action(Relations, Tracked, metaclass=Sequence):
+    __slots__ = ("_registry",)
 
 
 class StartGroup(Graph, metaclass=Sequence):
+    __slots__ = ("_name", "label")
+
     def __init__(self, name: str, label: str) -> None:
         self.name = name
         self.label = label
 
+    def state(self) -> tuple:
+        return (self.name, self.label)
+
     def render(self) -> str:
         properties = ""
         if self.label:
@@ -55,6 +76,8 @@ class StartGroup(Graph, metaclass=Sequence):
 
 
 class EndGroup(Graph, metaclass=Sequence):
+    __slots__ = ()
+
     def render(self) -> str:
         return "}"
 
@@ -72,27 +95,41 @@ class Block:
 
 
 class Activation(Graph, metaclass=Sequence):
+    __slots__ = ("_name",)
+
     def __init__(self, name: str) -> None:
         self.name = name
 
+    def state(self) -> tuple:
+        return (self.name,)
+
     def render(self) -> str:
         return f"activate {self.name}"
 
 
 class Deactivate(Graph, metaclass=Sequence):
+    __slots__ = ("_name",)
+
     def __init__(self, name: str) -> None:
         self.name = name
 
+    def state(self) -> tuple:
+        return (self.name,)
+
     def render(self) -> str:
         return f"deactivate {self.name}"
 
 
-class Node(Graph, metaclass=Sequence):
+class Node(Tracked, metaclass=Sequence):
+    __slots__ = ("_name", "_properties", "block", "_registry")
+
+    unique_name = True
+
     def __init__(
         self, name: str, icon: str | None = None, color: str | None = None
     ) -> None:
         self.name = name
-        self.properties = Properties(icon=icon, color=color)
+        self.properties = Properties.of(icon=icon, color=color)
         self.block = None
 
     def request(self, message: str, target: Node) -> None:
@@ -163,5 +200,8 @@ class Node(Graph, metaclass=Sequence):
     def deactivate(self) -> None:
         Deactivate(self.name)
 
+    def state(self) -> tuple:
+        return (self.name, self.properties.render())
+
     def render(self) -> str:
         return f"{self.name} {self.properties.render()}"
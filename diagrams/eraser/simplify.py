@@ -0,0 +1,216 @@
+"""Reduce large cloud architecture diagrams before drawing them
+
+The simplified diagram is built in a new `Diagram`, the original graphs are left
+unchanged. Each graph of the original diagram is mapped to the graph standing for it,
+then the connections are rewritten through this mapping with an index of the
+`(source, target, arrow)` triples, so the cost is linear in the number of graphs and
+connections.
+
+Example:
+    simplified = simplify(max_depth=1, aggregate_by=lambda node: node.properties.icon)
+    simplified.draw()
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Callable, Iterator, Union
+
+from .base import Diagram, Graph, Registry
+from .cloud_architecture import CloudArchitecture, Connection, Group, Node
+from .relations import ArrowType, EdgeRegistry, EdgeTable
+
+__all__ = [
+    "simplify",
+]
+
+Source = Union[Diagram, Registry, None]
+
+
+def simplify(
+    source: Source = None,
+    merge_connections: bool = True,
+    max_depth: int | None = None,
+    aggregate_by: Callable[[Node], str | None] | None = None,
+) -> Diagram:
+    """Simplify a cloud architecture diagram
+
+    Args:
+        source (Diagram | Registry, optional): The diagram to simplify, or its cloud
+            architecture registry. Defaults to the registry of the current context.
+        merge_connections (bool, optional): Merge the connections with the same
+            source, target and arrow into one, labelled with their count, e.g.
+            `reads x3`. Defaults to True.
+        max_depth (int, optional): The groups at this depth are replaced by a node
+            with the same name and properties, standing for everything they contain.
+            The top-level groups are at depth 0. Defaults to None, no group is
+            collapsed.
+        aggregate_by (Callable[[Node], str | None], optional): The key of a node, e.g.
+            its icon. The nodes of a group with the same key are replaced by a single
+            node named after the key and their count, e.g. `aws-ec2 x12`, with the
+            properties of the first one. The nodes without a key, or alone with their
+            key, are kept. Defaults to None.
+
+    Returns:
+        Diagram: A new diagram with the simplified graphs and connections. The
+            connections drawn at their creation position, see `Connection`, are drawn
+            with the other connections after all graphs.
+    """
+    if source is None:
+        registry = CloudArchitecture.registry()
+    elif isinstance(source, Diagram):
+        registry = source.registry(CloudArchitecture)
+    else:
+        registry = source
+
+    simplified = Diagram()
+    with simplified:
+        standing_for = _copy_graphs(registry, max_depth, aggregate_by)
+        _copy_connections(registry, standing_for, merge_connections)
+    return simplified
+
+
+def _copy_graphs(
+    registry: Registry,
+    max_depth: int | None,
+    aggregate_by: Callable[[Node], str | None] | None,
+) -> dict[str, Graph]:
+    """Create the simplified nodes and groups in the active diagram
+
+    Returns:
+        dict[str, Graph]: The graph standing for each original graph, by name
+    """
+    standing_for: dict[str, Graph] = {}
+    # (parent name, key) -> [aggregated node, count, name of the first node]
+    aggregates: dict[tuple[str | None, str], list] = {}
+
+    # the original graph, its depth and the parent of its copy
+    stack: list[tuple[Graph, int, Group | None]] = [
+        (root, 0, None)
+        for root in reversed(list(registry.roots()))
+        if isinstance(root, (Node, Group))
+    ]
+    while stack:
+        graph, depth, parent = stack.pop()
+        if isinstance(graph, Group) and (max_depth is None or depth < max_depth):
+            copy = Group(graph.name)
+            copy.properties = graph.properties
+            stack.extend((child, depth + 1, copy) for child in reversed(graph.children))
+        elif isinstance(graph, Group):
+            copy = Node(graph.name)
+            copy.properties = graph.properties
+            for descendant in _descendants(graph):
+                standing_for[descendant.name] = copy
+        else:
+            key = None if aggregate_by is None else aggregate_by(graph)
+            if key is not None:
+                scope = (None if parent is None else parent.name, key)
+                aggregate = aggregates.get(scope)
+                if aggregate is not None:
+                    aggregate[1] += 1
+                    standing_for[graph.name] = aggregate[0]
+                    continue
+                # renamed after its count once all the nodes are aggregated
+                copy = Node(f"\0{len(aggregates)}")
+                aggregates[scope] = [copy, 1, graph.name]
+            else:
+                copy = Node(graph.name)
+            copy.properties = graph.properties
+
+        standing_for[graph.name] = copy
+        if parent is not None:
+            parent.append(copy)
+
+    for (parent_name, key), (copy, count, first_name) in aggregates.items():
+        if count == 1:
+            copy.name = first_name
+            continue
+        name = f"{key} x{count}"
+        if CloudArchitecture.get(name) is not None:
+            name = f"{name} in {parent_name}"
+        copy.name = name
+    return standing_for
+
+
+def _descendants(group: Group) -> Iterator[Graph]:
+    stack = list(group.children)
+    while stack:
+        graph = stack.pop()
+        yield graph
+        if isinstance(graph, Group):
+            stack.extend(graph.children)
+
+
+def _copy_connections(
+    registry: Registry, standing_for: dict[str, Graph], merge_connections: bool
+) -> None:
+    """Rewrite the connections between the simplified graphs in the active diagram
+
+    The edges are rewritten as integer ids, the connections turned into loops by the
+    simplification are dropped.
+    """
+    # the `Connection` graphs are rewritten along with the edge table
+    tables = [EdgeTable(ArrowType)]
+    for graph in registry.graphs:
+        if isinstance(graph, Connection):
+            tables[0].add(graph.source, graph.target, graph.relation, graph.label)
+    if isinstance(registry, EdgeRegistry):
+        tables.append(registry.edges)
+
+    # the names of the graphs standing for the original names, by id
+    names: list[str] = []
+    ids: dict[str, int] = {}
+    remaps = []
+    for table in tables:
+        remap = []
+        for name in table.names:
+            graph = standing_for.get(name)
+            name = name if graph is None else graph.name
+            index = ids.get(name)
+            if index is None:
+                index = ids[name] = len(names)
+                names.append(name)
+            remap.append(index)
+        remaps.append(remap)
+
+    width, arrows = len(names), len(ArrowType)
+    # edge key -> [source, target, arrow code, count, label, whether labels are equal]
+    merged: dict[int, list] = {}
+    kept: list[list] = []
+    for table, remap in zip(tables, remaps):
+        labels = table.labels or itertools.repeat(None, len(table))
+        rows = zip(table.sources, table.targets, table.relations, labels)
+        for source, target, code, label in rows:
+            new_source, new_target = remap[source], remap[target]
+            if new_source == new_target and source != target:
+                continue
+            if not merge_connections:
+                kept.append([new_source, new_target, code, 1, label, True])
+                continue
+            key = (new_source * width + new_target) * arrows + code
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [new_source, new_target, code, 1, label, True]
+            else:
+                entry[3] += 1
+                if entry[5] and entry[4] != label:
+                    entry[5] = False
+    if merge_connections:
+        kept = list(merged.values())
+
+    # grouped by arrow to be added in bulk
+    by_code: dict[int, tuple[list, list, list]] = {}
+    for source, target, code, count, label, same_label in kept:
+        if count > 1:
+            label = f"{label} x{count}" if same_label and label else f"x{count}"
+        sources, targets, labels = by_code.setdefault(code, ([], [], []))
+        sources.append(names[source])
+        targets.append(names[target])
+        labels.append(label)
+    connections = CloudArchitecture.registry().connections
+    members = list(ArrowType)
+    for code, (sources, targets, labels) in by_code.items():
+        labelled = any(label is not None for label in labels)
+        connections.extend(
+            sources, targets, members[code], labels if labelled else None
+        )
@@ -0,0 +1,189 @@
+"""Find the mistakes of a diagram before drawing it
+
+eraser.io draws broken diagrams rather than rejecting them, e.g. a connection to a
+name which is never declared adds an unexpected node. `validate()` reports:
+
+    dangling: a relation, an activation or a relationship referencing a name which is
+        not declared, see `Registry.names` and `EntityRelationshipRegistry.attributes`
+    duplicate: a graph drawn more than once, e.g. appended to two groups, the unique
+        names are already enforced by `Registry.index()`
+    cycle: groups containing each other, which are never drawn
+    unbalanced: a block of a sequence ended without being started, or never ended
+
+The graphs are walked once and the names are checked against the indexes of the
+registries, so the cost is linear in the size of the diagram.
+
+Example:
+    with Diagram() as diagram:
+        build()
+
+    check(diagram)
+    diagram.draw()
+"""
+
+from __future__ import annotations
+
+from collections import ChainMap
+from typing import Iterable, Mapping, Union
+
+import attrs
+
+from .base import Diagram, DiagramType, Graph, Registry
+from .entity_relationship import EntityRelationshipRegistry
+from .relations import EdgeRegistry, Relations
+from .sequence import Activation, Deactivate, EndGroup, StartGroup
+
+__all__ = [
+    "Problem",
+    "ValidationError",
+    "check",
+    "validate",
+]
+
+Source = Union[Diagram, DiagramType]
+
+
+@attrs.define
+class Problem:
+    """A mistake found in a diagram
+
+    Args:
+        kind (str): `dangling`, `duplicate`, `cycle` or `unbalanced`
+        message (str): The description of the mistake
+    """
+
+    kind: str
+    message: str
+
+
+class ValidationError(ValueError):
+    """Raised by `check()`, with the problems found in `.problems`"""
+
+    def __init__(self, problems: list[Problem]) -> None:
+        super().__init__("\n".join(problem.message for problem in problems))
+        self.problems = problems
+
+
+def check(source: Source) -> None:
+    """Validate a diagram, see `validate()`
+
+    Args:
+        source (Diagram | DiagramType): A diagram, or a diagram type to validate its
+            registry in the current context
+
+    Raises:
+        ValidationError: If any problem is found
+    """
+    problems = validate(source)
+    if problems:
+        raise ValidationError(problems)
+
+
+def validate(source: Source) -> list[Problem]:
+    """Find the problems of a diagram
+
+    Args:
+        source (Diagram | DiagramType): A diagram, or a diagram type to validate its
+            registry in the current context, e.g. `CloudArchitecture`
+
+    Returns:
+        list[Problem]: The problems, in drawing order within each diagram type
+    """
+    if isinstance(source, Diagram):
+        registries: Iterable[Registry] = source.registries.values()
+    else:
+        registries = [source.registry()]
+    problems: list[Problem] = []
+    for registry in registries:
+        problems.extend(validate_registry(registry))
+    return problems
+
+
+def validate_registry(registry: Registry) -> list[Problem]:
+    """Find the problems of the graphs of a registry in a single walk
+
+    Args:
+        registry (Registry): The registry of a diagram type
+
+    Returns:
+        list[Problem]: The problems
+    """
+    problems: list[Problem] = []
+    declared: Mapping[str, object] = registry.names
+    if isinstance(registry, EntityRelationshipRegistry):
+        # relationships connect entities or `entity.attribute` names
+        declared = ChainMap(registry.attributes, registry.names)
+    dangling: dict[str, None] = {}
+
+    visited: set[int] = set()
+    depth = 0
+    for root in registry.roots():
+        if isinstance(root, Relations):
+            for name in (root.source, root.target):
+                if name not in declared:
+                    dangling.setdefault(name)
+            continue
+        if isinstance(root, (Activation, Deactivate)):
+            if root.name not in declared:
+                dangling.setdefault(root.name)
+            continue
+        if isinstance(root, StartGroup):
+            depth += 1
+            continue
+        if isinstance(root, EndGroup):
+            if depth == 0:
+                problems.append(
+                    Problem("unbalanced", "a block is ended but not started")
+                )
+            else:
+                depth -= 1
+            continue
+
+        stack = [root]
+        while stack:
+            graph = stack.pop()
+            if id(graph) in visited:
+                problems.append(
+                    Problem("duplicate", f"`{graph.name}` is drawn more than once")
+                )
+                continue
+            visited.add(id(graph))
+            stack.extend(graph.members())
+
+    if depth:
+        problems.append(Problem("unbalanced", f"{depth} block(s) are never ended"))
+
+    if isinstance(registry, EdgeRegistry):
+        dangling.update(
+            (name, None) for name in registry.edges.names if name not in declared
+        )
+    problems.extend(
+        Problem("dangling", f"`{name}` is referenced but not declared")
+        for name in dangling
+    )
+    problems.extend(_cycles(registry.graphs, visited))
+    return problems
+
+
+def _cycles(graphs: Iterable[Graph], visited: set[int]) -> Iterable[Problem]:
+    """The cycles of parents among the graphs not drawn
+
+    A graph is not drawn when it has a parent but is not reached from the top-level
+    graphs, its chain of parents leads to a cycle. Each graph is walked once.
+    """
+    done: set[int] = set()
+    for graph in graphs:
+        if id(graph) in visited or getattr(graph, "parent", None) is None:
+            continue
+        path: list[Graph] = []
+        on_path: dict[int, int] = {}
+        while graph is not None and id(graph) not in visited and id(graph) not in done:
+            if id(graph) in on_path:
+                cycle = path[on_path[id(graph)] :]
+                chain = " > ".join(f"`{member.name}`" for member in (*cycle, graph))
+                yield Problem("cycle", f"{chain} contain each other")
+                break
+            on_path[id(graph)] = len(path)
+            path.append(graph)
+            graph = getattr(graph, "parent", None)
+        done.update(on_path)
@@ -0,0 +1,231 @@
+"""Intermediate representation of the diagrams, shared by the emitters
+
+The IR is built once from the graphs of a diagram, then rendered by any number of
+emitters, see `diagrams.emitters`. It only holds what the providers draw: the names,
+icons and colors of the graphs, their nesting, and the relations between them. The
+connections stored in bulk, see `EdgeTable`, are copied as columns instead of one
+object per edge.
+
+Example:
+    with Diagram() as diagram:
+        build()
+
+    outputs = emit(ir.build(diagram), "eraser", "mermaid", "dot")
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Union
+
+import attrs
+
+from .eraser import cloud_architecture, entity_relationship, sequence
+from .eraser.base import Diagram, DiagramType, Graph, Registry
+from .eraser.relations import (
+    ArrowType,
+    EdgeRegistry,
+    EdgeTable,
+    EntityRelationshipType,
+    Relations,
+)
+
+__all__ = [
+    "IR",
+    "Section",
+    "Node",
+    "Group",
+    "Entity",
+    "Attribute",
+    "Edge",
+    "Activation",
+    "Block",
+    "BlockEnd",
+    "build",
+]
+
+Relation = Union[ArrowType, EntityRelationshipType]
+
+
+@attrs.define
+class Node:
+    """A node of a cloud architecture diagram, or a participant of a sequence"""
+
+    name: str
+    icon: str | None = None
+    color: str | None = None
+
+
+@attrs.define
+class Group:
+    name: str
+    icon: str | None = None
+    color: str | None = None
+    children: list[Node | Group] = attrs.field(factory=list)
+
+
+@attrs.define
+class Attribute:
+    name: str
+    data_type: str = ""
+    metadata: str = ""
+
+
+@attrs.define
+class Entity:
+    name: str
+    icon: str | None = None
+    color: str | None = None
+    attributes: list[Attribute] = attrs.field(factory=list)
+
+
+@attrs.define
+class Edge:
+    """A connection, a relationship between attributes or a sequence action
+
+    The relationships of the entity relationship diagrams connect `entity.attribute`
+    names.
+    """
+
+    source: str
+    target: str
+    relation: Relation
+    label: str | None = None
+
+
+@attrs.define
+class Activation:
+    """The activation, or the deactivation, of a participant of a sequence"""
+
+    name: str
+    active: bool = True
+
+
+@attrs.define
+class Block:
+    """The start of a block of a sequence, e.g. `loop`, closed by a `BlockEnd`"""
+
+    name: str
+    label: str | None = None
+
+
+@attrs.define
+class BlockEnd:
+    pass
+
+
+Item = Union[Node, Group, Entity, Edge, Activation, Block, BlockEnd]
+
+
+@attrs.define
+class Section:
+    """The graphs of one diagram type
+
+    Args:
+        kind (str): The diagram type, `cloud_architecture`, `entity_relationship` or
+            `sequence`
+        items (list): The top-level items in drawing order
+        edges (EdgeTable): The edges drawn after the items
+    """
+
+    kind: str
+    items: list[Item] = attrs.field(factory=list)
+    edges: EdgeTable | None = None
+
+    def iter_edges(self) -> Iterator[Edge]:
+        """The edges of the edge table as `Edge` objects, created one at a time"""
+        if self.edges is not None:
+            for source, target, relation, label in self.edges.iter_rows():
+                yield Edge(source, target, relation, label)
+
+
+@attrs.define
+class IR:
+    sections: list[Section] = attrs.field(factory=list)
+
+
+KINDS: dict[type, str] = {
+    cloud_architecture.CloudArchitecture: "cloud_architecture",
+    entity_relationship.EntityRelationship: "entity_relationship",
+    sequence.Sequence: "sequence",
+}
+
+
+def build(source: Diagram | DiagramType) -> IR:
+    """Build the IR of a diagram
+
+    Args:
+        source (Diagram | DiagramType): A diagram, or a diagram type to build the IR
+            of its registry in the current context, e.g. `CloudArchitecture`
+
+    Returns:
+        IR: One section per diagram type, in drawing order
+    """
+    if isinstance(source, Diagram):
+        registries = list(source.registries.items())
+    else:
+        registries = [(source, source.registry())]
+    return IR(
+        [
+            build_section(KINDS[diagram_type], registry)
+            for diagram_type, registry in registries
+        ]
+    )
+
+
+def build_section(kind: str, registry: Registry) -> Section:
+    """Build the section of a registry
+
+    Args:
+        kind (str): The diagram type of the registry, see `Section`
+        registry (Registry): The registry
+
+    Returns:
+        Section: The section
+    """
+    section = Section(kind)
+    for root in registry.roots():
+        section.items.append(_item(root))
+    if isinstance(registry, EdgeRegistry) and len(registry.edges):
+        section.edges = registry.edges.copy()
+    return section
+
+
+def _item(graph: Graph) -> Item:
+    """Convert a graph, the sub-groups are converted with an explicit stack"""
+    if isinstance(graph, Relations):
+        return Edge(graph.source, graph.target, graph.relation, graph.label)
+    if isinstance(graph, entity_relationship.Entity):
+        return Entity(
+            graph.name,
+            graph.properties.icon,
+            graph.properties.color,
+            [
+                Attribute(attribute.name, attribute.data_type, attribute.metadata)
+                for attribute in graph.attributes
+            ],
+        )
+    if isinstance(graph, sequence.Activation):
+        return Activation(graph.name)
+    if isinstance(graph, sequence.Deactivate):
+        return Activation(graph.name, active=False)
+    if isinstance(graph, sequence.StartGroup):
+        return Block(graph.name, graph.label)
+    if isinstance(graph, sequence.EndGroup):
+        return BlockEnd()
+    if not isinstance(graph, cloud_architecture.Group):
+        return Node(graph.name, graph.properties.icon, graph.properties.color)
+
+    root = Group(graph.name, graph.properties.icon, graph.properties.color)
+    stack = [(graph, root)]
+    while stack:
+        group, converted = stack.pop()
+        for child in group.children:
+            properties = child.properties
+            if isinstance(child, cloud_architecture.Group):
+                sub_group = Group(child.name, properties.icon, properties.color)
+                stack.append((child, sub_group))
+                converted.children.append(sub_group)
+            else:
+                node = Node(child.name, properties.icon, properties.color)
+                converted.children.append(node)
+    return root
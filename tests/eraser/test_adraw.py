@@ -0,0 +1,82 @@
+import asyncio
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+
+
+def teardown_function():
+    diagram.CloudArchitecture.reset()
+
+
+class FakeStreamWriter:
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self.drained = 0
+
+    def write(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+
+    async def drain(self) -> None:
+        self.drained += 1
+
+
+def build(count: int) -> None:
+    for index in range(count):
+        diagram.Node(name=f"node-{index}", icon="aws-ec2")
+
+
+def test_adraw_to_stream_writer():
+    build(1000)
+    writer = FakeStreamWriter()
+
+    asyncio.run(diagram.CloudArchitecture.adraw(writer, buffer_size=1024))
+
+    assert len(writer.chunks) > 1
+    assert writer.drained == len(writer.chunks)
+    assert "".join(writer.chunks) == diagram.CloudArchitecture.render_to_string()
+
+
+def test_adraw_yields_control_between_chunks():
+    build(1000)
+    writer = FakeStreamWriter()
+    ticks = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(len(writer.chunks))
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        task = asyncio.create_task(ticker())
+        await diagram.CloudArchitecture.adraw(writer, buffer_size=1024)
+        task.cancel()
+
+    asyncio.run(main())
+
+    assert len(set(ticks)) > 1, "the ticker should run while drawing"
+
+
+def test_adraw_waits_for_slow_consumers():
+    with Diagram() as scope:
+        build(1000)
+    received = []
+
+    async def main() -> None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def consumer() -> None:
+            while (chunk := await queue.get()) is not None:
+                # at most one chunk waits in the queue
+                assert queue.qsize() <= 1
+                received.append(chunk)
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(consumer())
+        await scope.adraw(queue.put, buffer_size=1024)
+        await queue.put(None)
+        await task
+
+    asyncio.run(main())
+
+    assert len(received) > 1
+    assert "".join(received) == scope.render_to_string()
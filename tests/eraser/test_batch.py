@@ -0,0 +1,55 @@
+import functools
+
+import pytest
+
+from diagrams.eraser import batch
+from diagrams.eraser import cloud_architecture as diagram
+
+
+def build_service(name: str) -> None:
+    proxy = diagram.Node(name=f"{name}-proxy", icon="aws-ec2")
+    service = diagram.Node(name=f"{name}-service", icon="aws-ec2")
+    proxy.connect(service)
+
+
+def expected(name: str) -> str:
+    return (
+        f"{name}-proxy [icon: aws-ec2]\n"
+        f"{name}-service [icon: aws-ec2]\n"
+        f"{name}-proxy > {name}-service\n"
+    )
+
+
+def test_render_job_is_isolated():
+    output = batch.render_job(functools.partial(build_service, "job"))
+
+    assert output == expected("job")
+    assert diagram.CloudArchitecture.render_to_string() == ""
+
+
+def test_render_many_keeps_the_order():
+    names = [f"service-{index}" for index in range(20)]
+    builders = [functools.partial(build_service, name) for name in names]
+
+    outputs = batch.render_many(builders, workers=2)
+
+    assert outputs == [expected(name) for name in names]
+
+
+def test_render_many_writes_output_files(tmp_path):
+    names = ["billing", "search"]
+    paths = [tmp_path / f"{name}.eraser" for name in names]
+
+    batch.render_many(
+        [functools.partial(build_service, name) for name in names],
+        workers=2,
+        outputs=paths,
+    )
+
+    for name, path in zip(names, paths):
+        assert path.read_text(encoding="utf-8") == expected(name)
+
+
+def test_render_many_requires_one_output_per_builder():
+    with pytest.raises(ValueError):
+        batch.render_many([build_service], outputs=[])
@@ -0,0 +1,122 @@
+import io
+import os
+
+import pytest
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser import entity_relationship, sequence
+from diagrams.eraser.cache import RenderCache
+from diagrams.eraser.properties import Properties
+
+
+def build(icon="aws-ec2", order=("proxy", "service")):
+    with Diagram() as built:
+        vpc = diagram.Group(name="vpc")
+        nodes = [diagram.Node(name=name, icon=icon) for name in order]
+        vpc.append(*nodes)
+        nodes[0].connect(nodes[1], label="http")
+        users = entity_relationship.Entity(name="users")
+        users.add_attribute("id", "string", "pk")
+        alice = sequence.Node(name="alice")
+        with sequence.Block("loop"):
+            alice.do("work")
+    return built
+
+
+def test_fingerprint_is_stable_across_builds():
+    assert build().fingerprint() == build().fingerprint()
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"icon": "aws-s3"},
+        {"order": ("service", "proxy")},
+    ],
+)
+def test_fingerprint_changes_with_the_structure(other):
+    assert build().fingerprint() != build(**other).fingerprint()
+
+
+def test_fingerprint_tracks_changes():
+    with Diagram() as built:
+        proxy = diagram.Node(name="proxy")
+        group = diagram.Group(name="group")
+    fingerprints = [built.fingerprint()]
+
+    proxy.properties = Properties.of(color="blue")
+    fingerprints.append(built.fingerprint())
+    with built:
+        group.append(proxy)
+    fingerprints.append(built.fingerprint())
+    with built:
+        proxy.connect(group)
+    fingerprints.append(built.fingerprint())
+
+    assert len(set(fingerprints)) == len(fingerprints)
+
+
+def test_draw_renders_on_miss_only(tmp_path):
+    cache = RenderCache(tmp_path)
+    built = build()
+    expected = built.render_to_string()
+
+    file = io.StringIO()
+    built.draw(file, cache=cache)
+    assert file.getvalue() == expected
+    assert built.fingerprint() in cache
+
+    def fail():
+        raise AssertionError("the diagram should not be rendered on a hit")
+
+    rebuilt = build()
+    rebuilt.iter_fragments = fail
+    file = io.StringIO()
+    rebuilt.draw(file, cache=cache)
+    assert file.getvalue() == expected
+
+
+def test_draw_with_cache_calls_a_callable_once(stdout, tmp_path):
+    with Diagram() as built:
+        diagram.Node(name="proxy")
+        diagram.Node(name="service")
+
+    built.draw(stdout, cache=RenderCache(tmp_path))
+
+    assert stdout == ["proxy \nservice "]
+
+
+def test_cache_evicts_the_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=35)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, "0123456789")
+        os.utime(cache.path(key), ns=(index, index))
+    assert cache.get("a") == "0123456789", "marked as recently used"
+
+    cache.put("d", "0123456789")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert "d" in cache
+    assert cache.size() == 30
+
+
+def test_cache_overwrites_do_not_grow_the_size(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put("a", "0123456789")
+    for _ in range(3):
+        cache.put("b", "0123456789")
+    cache.put("b", "01234")
+
+    assert cache._size == cache.size() == 15
+
+
+def test_cache_misses(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+
+    assert cache.get("missing") is None
+    cache.put("key", "proxy \n")
+    cache.clear()
+    assert "key" not in cache
@@ -1,4 +1,11 @@
+import io
+import sys
+
+import pytest
+
 from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser.base import DuplicateNameError
+from diagrams.eraser.properties import Properties
 
 
 def teardown_function():
@@ -74,3 +81,181 @@ def test_relations_must_be_drawn_last(stdout):
     invalid_message = "should exist and be positioned at the end of the list"
     for conn in ["vpc < gw", "public > private", "proxy > service"]:
         assert conn in stdout[-3:], invalid_message
+
+
+def test_render_to_string_matches_draw(stdout):
+    vpc = diagram.Group(name="vpc", icon="aws-vpc")
+    proxy = diagram.Node(name="proxy", icon="aws-ec2")
+    service = diagram.Node(name="service", icon="aws-ec2")
+    vpc.append(proxy)
+    proxy.connect(service)
+
+    diagram.CloudArchitecture.draw(stdout)
+
+    assert diagram.CloudArchitecture.render_to_string() == "".join(
+        f"{output}\n" for output in stdout
+    )
+
+
+def test_draw_to_file_like_object():
+    buffer = io.StringIO()
+    for index in range(100):
+        diagram.Node(name=f"node-{index}")
+
+    diagram.CloudArchitecture.draw(buffer)
+
+    assert buffer.getvalue() == diagram.CloudArchitecture.render_to_string()
+
+
+def test_write_through_bounded_buffer():
+    writes = []
+
+    class Sink:
+        def write(self, chunk: str) -> None:
+            writes.append(chunk)
+
+    for index in range(100):
+        diagram.Node(name=f"node-{index}", icon="aws-ec2")
+
+    diagram.CloudArchitecture.write(Sink(), buffer_size=256)
+
+    assert 1 < len(writes) < 100, "should batch many graphs into a single write"
+    assert all(len(chunk) >= 256 for chunk in writes[:-1])
+    assert "".join(writes) == diagram.CloudArchitecture.render_to_string()
+
+
+def test_iter_chunks_of_empty_diagram():
+    assert not list(diagram.CloudArchitecture.iter_chunks())
+    assert diagram.CloudArchitecture.render_to_string() == ""
+
+
+def test_nested_groups_render():
+    vpc = diagram.Group(name="vpc")
+    subnet = diagram.Group(name="subnet")
+    vpc.append(subnet, diagram.Node(name="gw"))
+    subnet.append(diagram.Node(name="proxy"), diagram.Node(name="service"))
+
+    assert vpc.render() == "vpc  {\nsubnet  {\nproxy \nservice \n}\ngw \n}"
+    assert "".join(vpc.fragments()) == vpc.render()
+
+
+def test_deeply_nested_groups_do_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    root = parent = diagram.Group(name="group")
+    for index in range(depth):
+        group = diagram.Group(name=f"group-{index}")
+        parent.append(group)
+        parent = group
+
+    content = root.render()
+
+    assert content.count("{") == depth + 1
+    assert content.count("}") == depth + 1
+
+
+def test_graphs_have_no_instance_dict():
+    node = diagram.Node(name="node")
+    group = diagram.Group(name="group")
+    group.append(node)
+    node.connect(group)
+
+    for graph in diagram.CloudArchitecture.registry().graphs:
+        assert not hasattr(graph, "__dict__")
+
+
+def test_connections_are_drawn_after_late_nodes(stdout):
+    proxy = diagram.Node(name="proxy")
+    service = diagram.Node(name="service")
+    proxy.connect(service, label="http")
+    diagram.Node(name="database")
+
+    diagram.CloudArchitecture.draw(stdout)
+
+    assert stdout == ["proxy ", "service ", "database ", "proxy > service : http"]
+
+
+def test_connect_many():
+    nodes = [diagram.Node(name=f"node-{index}") for index in range(5)]
+
+    diagram.connect_many(nodes[:-1], nodes[1:], diagram.ArrowType.DOTTED_ARROW)
+
+    content = diagram.CloudArchitecture.render_to_string()
+    assert content.endswith(
+        "node-0 --> node-1\nnode-1 --> node-2\nnode-2 --> node-3\nnode-3 --> node-4\n"
+    )
+
+
+def test_render_is_memoized():
+    vpc = diagram.Group(name="vpc")
+    vpc.append(diagram.Node(name="proxy"))
+
+    content = diagram.CloudArchitecture.render_to_string()
+
+    assert vpc.render() is vpc.render()
+    assert diagram.CloudArchitecture.render_to_string() == content
+
+
+def test_render_is_invalidated_by_changes():
+    vpc = diagram.Group(name="vpc")
+    subnet = diagram.Group(name="subnet")
+    proxy = diagram.Node(name="proxy")
+    vpc.append(subnet)
+    subnet.append(proxy)
+    assert vpc.render() == "vpc  {\nsubnet  {\nproxy \n}\n}"
+
+    proxy.name = "gateway"
+    assert vpc.render() == "vpc  {\nsubnet  {\ngateway \n}\n}"
+
+    subnet.properties = Properties.of(icon="aws-vpc")
+    assert vpc.render() == "vpc  {\nsubnet [icon: aws-vpc] {\ngateway \n}\n}"
+
+    subnet.render()
+    proxy.name = "proxy"
+    assert subnet.render() == "subnet [icon: aws-vpc] {\nproxy \n}"
+    assert vpc.render() == "vpc  {\nsubnet [icon: aws-vpc] {\nproxy \n}\n}"
+
+    subnet.append(diagram.Node(name="service"))
+    assert vpc.render() == "vpc  {\nsubnet [icon: aws-vpc] {\nproxy \nservice \n}\n}"
+
+
+def test_lookup_by_name():
+    proxy = diagram.Node(name="proxy")
+    vpc = diagram.Group(name="vpc")
+
+    assert diagram.CloudArchitecture.get("proxy") is proxy
+    assert diagram.CloudArchitecture.get("vpc") is vpc
+    assert diagram.CloudArchitecture.get("service") is None
+
+
+def test_duplicate_names_are_rejected():
+    diagram.Node(name="proxy")
+
+    with pytest.raises(DuplicateNameError):
+        diagram.Node(name="proxy")
+    with pytest.raises(DuplicateNameError):
+        diagram.Group(name="proxy")
+
+    assert len(diagram.CloudArchitecture.registry().graphs) == 1
+
+
+def test_get_or_create():
+    proxy = diagram.Node.get_or_create("proxy", icon="aws-ec2")
+
+    assert diagram.Node.get_or_create("proxy") is proxy
+    assert proxy.properties.icon == "aws-ec2"
+    with pytest.raises(DuplicateNameError):
+        diagram.Group.get_or_create("proxy")
+
+
+def test_rename_updates_the_index():
+    proxy = diagram.Node(name="proxy")
+    service = diagram.Node(name="service")
+
+    proxy.name = "gateway"
+
+    assert diagram.CloudArchitecture.get("gateway") is proxy
+    assert diagram.CloudArchitecture.get("proxy") is None
+    with pytest.raises(DuplicateNameError):
+        service.name = "gateway"
+    assert service.name == "service"
+    diagram.Node(name="proxy")
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser import sequence
+
+
+def teardown_function():
+    diagram.CloudArchitecture.reset()
+
+
+def build(prefix: str) -> None:
+    proxy = diagram.Node(name=f"{prefix}-proxy")
+    service = diagram.Node(name=f"{prefix}-service")
+    proxy.connect(service)
+
+
+def test_graphs_are_registered_to_the_active_diagram():
+    with Diagram() as scope:
+        build("scoped")
+
+    assert Diagram.current() is None
+    assert diagram.CloudArchitecture.render_to_string() == ""
+    assert scope.render_to_string() == (
+        "scoped-proxy \nscoped-service \nscoped-proxy > scoped-service\n"
+    )
+
+
+def test_nested_diagrams():
+    with Diagram() as outer:
+        build("outer")
+        with Diagram() as inner:
+            build("inner")
+        assert Diagram.current() is outer
+
+    assert "inner" not in outer.render_to_string()
+    assert "outer" not in inner.render_to_string()
+
+
+def test_draw_the_active_diagram(stdout):
+    build("global")
+    with Diagram():
+        build("scoped")
+        diagram.CloudArchitecture.draw(stdout)
+
+    assert stdout == [
+        "scoped-proxy ",
+        "scoped-service ",
+        "scoped-proxy > scoped-service",
+    ]
+
+
+def test_diagram_with_several_types(stdout):
+    with Diagram() as scope:
+        diagram.Node(name="proxy")
+        client = sequence.Node(name="client")
+        client.do("something")
+
+    scope.draw(stdout)
+
+    assert stdout == ["proxy ", "client ", "client --> client : something"]
+
+
+def test_diagrams_built_in_threads():
+    outputs = {}
+    barrier = threading.Barrier(8)
+
+    def worker(index: int) -> None:
+        with Diagram() as scope:
+            barrier.wait()
+            for number in range(100):
+                build(f"thread-{index}-{number}")
+        outputs[index] = scope.render_to_string()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(outputs) == 8
+    for index, output in outputs.items():
+        assert output.count("-proxy >") == 100
+        assert output.count("thread-") == 400
+        assert output.count(f"thread-{index}-") == 400
+
+
+def test_diagrams_built_in_asyncio_tasks():
+    async def worker(index: int) -> str:
+        with Diagram() as scope:
+            for number in range(10):
+                build(f"task-{index}-{number}")
+                await asyncio.sleep(0)
+        return scope.render_to_string()
+
+    async def main() -> list[str]:
+        return await asyncio.gather(*(worker(index) for index in range(4)))
+
+    for index, output in enumerate(asyncio.run(main())):
+        assert output.count("task-") == 40
+        assert output.count(f"task-{index}-") == 40
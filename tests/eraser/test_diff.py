@@ -0,0 +1,100 @@
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser import entity_relationship
+from diagrams.eraser.diff import Patch
+from diagrams.eraser.properties import Properties
+
+
+def teardown_function():
+    diagram.CloudArchitecture.reset()
+
+
+def test_first_diff_adds_everything():
+    vpc = diagram.Group(name="vpc")
+    proxy = diagram.Node(name="proxy")
+    vpc.append(proxy)
+    proxy.connect(vpc)
+
+    patch = diagram.CloudArchitecture.diff()
+
+    assert patch.added == ["vpc  {\nproxy \n}", "proxy > vpc"]
+    assert not patch.removed
+    assert not patch.changed
+    assert not diagram.CloudArchitecture.diff(), "nothing changed since the last diff"
+
+
+def test_diff_keeps_multiline_labels_whole():
+    proxy = diagram.Node(name="proxy")
+    proxy.connect(diagram.Node(name="service"), label="l1\nl2")
+
+    patch = diagram.CloudArchitecture.diff()
+
+    assert patch.added[-1] == "proxy > service : l1\nl2"
+
+
+def test_diff_reports_changes_only():
+    nodes = [diagram.Node(name=f"node-{index}") for index in range(100)]
+    vpc = diagram.Group(name="vpc")
+    diagram.CloudArchitecture.diff()
+
+    nodes[10].properties = Properties.of(icon="aws-ec2")
+    vpc.append(nodes[20])
+    service = diagram.Node(name="service")
+    service.connect(nodes[0])
+
+    patch = diagram.CloudArchitecture.diff()
+
+    assert patch.added == ["service ", "service > node-0"]
+    assert patch.removed == ["node-20 "]
+    assert patch.changed == [
+        ("node-10 ", "node-10 [icon: aws-ec2]"),
+        ("vpc  {\n\n}", "vpc  {\nnode-20 \n}"),
+    ]
+
+
+def test_diff_reports_nested_changes_to_the_top_level_graph():
+    vpc = diagram.Group(name="vpc")
+    subnet = diagram.Group(name="subnet")
+    proxy = diagram.Node(name="proxy")
+    vpc.append(subnet)
+    subnet.append(proxy)
+    diagram.CloudArchitecture.diff()
+
+    proxy.name = "gateway"
+
+    patch = diagram.CloudArchitecture.diff()
+    assert patch.changed == [
+        ("vpc  {\nsubnet  {\nproxy \n}\n}", "vpc  {\nsubnet  {\ngateway \n}\n}")
+    ]
+    assert list(patch.lines()) == ["- proxy ", "+ gateway "]
+
+
+def test_diff_of_relations_and_attributes():
+    with Diagram() as scope:
+        user = entity_relationship.Entity(name="user")
+        user_id = user.add_attribute("id")
+        team = entity_relationship.Entity(name="team")
+        team_id = team.add_attribute("id")
+        user_id.many_to_one(team_id)
+        scope.diff()
+
+        user_id.data_type = "string"
+        relationship = scope.registry(entity_relationship.EntityRelationship).graphs[-1]
+        relationship.label = "member"
+
+    patch = scope.diff()
+
+    assert patch.changed == [
+        ("user  {\nid\n}", "user  {\nid string\n}"),
+        ("user.id > team.id", "user.id > team.id : member"),
+    ]
+
+
+def test_patch_lines():
+    patch = Patch(
+        added=["added"],
+        removed=["removed"],
+        changed=[("group {\nold\nkept\n}", "group {\nkept\nnew\n}")],
+    )
+
+    assert list(patch.lines()) == ["- removed", "- old", "+ new", "+ added"]
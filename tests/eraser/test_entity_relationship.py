@@ -1,4 +1,9 @@
+import io
+
+import pytest
+
 from diagrams.eraser import entity_relationship as diagram
+from diagrams.eraser.base import DuplicateNameError
 
 
 def teardown_function():
@@ -66,3 +71,150 @@ def test_many_to_many_relationship(stdout):
     diagram.EntityRelationship.draw(stdout)
 
     assert "user.user_id <> task.task_id" in stdout[-1]
+
+
+def test_draw_to_file_like_object():
+    buffer = io.StringIO()
+    user = diagram.Entity(name="user")
+    user.add_attribute("user_id", "string", "pk")
+
+    diagram.EntityRelationship.draw(buffer)
+
+    assert buffer.getvalue() == "user  {\nuser_id string pk\n}\n"
+
+
+def test_render_is_invalidated_by_changes():
+    user = diagram.Entity(name="user")
+    user_id = user.add_attribute("id", "string")
+    assert user.render() is user.render()
+    assert user.render() == "user  {\nid string\n}"
+
+    user_id.metadata = "pk"
+    assert user.render() == "user  {\nid string pk\n}"
+
+    user.add_attribute("name")
+    assert user.render() == "user  {\nid string pk\nname\n}"
+
+
+def test_lookup_attributes():
+    user = diagram.Entity(name="user")
+    user_id = user.add_attribute("id")
+
+    assert diagram.EntityRelationship.get("user") is user
+    assert diagram.EntityRelationship.get_attribute("user.id") is user_id
+    assert diagram.EntityRelationship.get_attribute("user.name") is None
+    with pytest.raises(DuplicateNameError):
+        user.add_attribute("id")
+    with pytest.raises(DuplicateNameError):
+        diagram.Entity(name="user")
+
+
+def test_attributes_are_reindexed_when_renamed():
+    user = diagram.Entity(name="user")
+    user_id = user.add_attribute("id")
+    user.add_attribute("email")
+
+    user_id.name = "uid"
+    assert diagram.EntityRelationship.get_attribute("user.id") is None
+    assert diagram.EntityRelationship.get_attribute("user.uid") is user_id
+    assert user.add_attribute("id").qualified_name == "user.id"
+    with pytest.raises(DuplicateNameError):
+        user_id.name = "email"
+    assert user_id.name == "uid"
+
+    user.name = "users"
+    assert diagram.EntityRelationship.get_attribute("users.uid") is user_id
+    assert diagram.EntityRelationship.get_attribute("user.uid") is None
+    assert sorted(diagram.EntityRelationship.registry().attributes) == [
+        "users.email",
+        "users.id",
+        "users.uid",
+    ]
+
+
+def test_qualified_names_are_cached_until_renamed():
+    user = diagram.Entity(name="user")
+    user_id = user.add_attribute("id")
+
+    assert user_id.qualified_name is user_id.qualified_name
+    user_id.name = "uid"
+    assert user_id.qualified_name == "user.uid"
+    user_id.parent_name = "users"
+    assert user_id.qualified_name == "users.uid"
+
+
+def test_relationships_are_drawn_in_blocks(monkeypatch):
+    entities = diagram.entities_from_rows(
+        [("user", "id", "", "pk"), ("post", "user_id", "", "fk")]
+    )
+    post_user_id = entities["post"].attributes[0]
+    user_id = entities["user"].attributes[0]
+    for _ in range(3):
+        post_user_id.many_to_one(user_id)
+    diagram.Entity(name="team")
+    user_id.one_to_one(user_id)
+    per_graph = "".join(
+        f"{output}\n" for output in diagram.EntityRelationship.iter_render()
+    )
+    monkeypatch.setattr(diagram.EdgeTable, "BLOCK_SIZE", 2)
+
+    fragments = list(diagram.EntityRelationship.iter_fragments())
+
+    assert "".join(fragments) == per_graph
+    assert "post.user_id > user.id\npost.user_id > user.id" in fragments
+
+
+def test_bulk_rows_match_the_per_call_api():
+    columns = [
+        ("users", "id", "string", "pk"),
+        ("teams", "id", "string", "pk"),
+        ("users", "team_id", "string", ""),
+    ]
+    foreign_keys = [("users", "team_id", "teams", "id")]
+
+    users = diagram.Entity(name="users")
+    users.add_attribute("id", "string", "pk")
+    team_id = users.add_attribute("team_id", "string")
+    teams = diagram.Entity(name="teams")
+    team_id.many_to_one(teams.add_attribute("id", "string", "pk"))
+    expected = diagram.EntityRelationship.render_to_string()
+    diagram.EntityRelationship.reset()
+
+    entities = diagram.entities_from_rows(columns)
+    diagram.relationships_from_rows(foreign_keys)
+
+    assert list(entities) == ["users", "teams"]
+    assert diagram.EntityRelationship.render_to_string() == expected
+    team_id = diagram.EntityRelationship.get_attribute("users.team_id")
+    assert team_id.parent is entities["users"]
+
+
+def test_bulk_rows_extend_existing_entities():
+    users = diagram.Entity(name="users")
+    users.add_attribute("id")
+    users.render()
+
+    diagram.entities_from_rows([("users", "name", "string", "")])
+
+    assert users.render() == "users  {\nid\nname string\n}"
+    with pytest.raises(DuplicateNameError):
+        diagram.entities_from_rows([("users", "id", "string", "")])
+
+
+def test_bulk_rows_are_checked_before_any_change():
+    users = diagram.Entity(name="users")
+    users.add_attribute("id")
+    users.render()
+
+    with pytest.raises(DuplicateNameError):
+        diagram.entities_from_rows(
+            [
+                ("users", "email", "string", ""),
+                ("teams", "id", "string", "pk"),
+                ("users", "id", "string", ""),
+            ]
+        )
+
+    assert users.render() == "users  {\nid\n}"
+    assert diagram.EntityRelationship.get("teams") is None
+    assert list(diagram.EntityRelationship.registry().attributes) == ["users.id"]
@@ -0,0 +1,73 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# The self time of the modules of the package may grow up to this factor of the
+# baseline measured for each statement, the median of 10 runs without bytecode caches
+BUDGET_FACTOR = 5
+
+IMPORT_TIME = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \| ( *)(\S+)$")
+
+
+def import_modules(statement: str) -> tuple[set[str], int]:
+    """Run an import statement in a fresh interpreter
+
+    Returns:
+        tuple[set[str], int]: The imported modules and the self time of the modules of
+            the package in microseconds
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{statement}; import sys; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    elapsed = 0
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is not None and match[4].startswith("diagrams"):
+            elapsed += int(match[1])
+    return set(process.stdout.split()), elapsed
+
+
+@pytest.mark.parametrize(
+    "statement, unexpected, baseline_us",
+    [
+        (
+            "import diagrams.eraser",
+            {"diagrams.eraser.base", "attrs", "typing"},
+            600,
+        ),
+        (
+            "from diagrams.eraser import Diagram",
+            {"attrs", "typing", "hashlib", "inspect", "asyncio"},
+            1_600,
+        ),
+        (
+            "from diagrams.eraser import sequence",
+            {
+                "diagrams.eraser.cloud_architecture",
+                "diagrams.eraser.entity_relationship",
+                "diagrams.eraser.diff",
+                "asyncio",
+                "hashlib",
+                "sqlite3",
+                "concurrent.futures",
+            },
+            9_300,
+        ),
+    ],
+)
+def test_imports_are_lazy(statement, unexpected, baseline_us):
+    modules, elapsed = import_modules(statement)
+
+    assert not modules & unexpected
+    assert elapsed < baseline_us * BUDGET_FACTOR
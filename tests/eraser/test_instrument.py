@@ -0,0 +1,83 @@
+import contextvars
+import io
+import json
+import threading
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser import entity_relationship, instrument
+
+
+def test_instrument_records_phases():
+    file = io.StringIO()
+    with Diagram() as built, instrument.instrument(file) as stats:
+        vpc = diagram.Group(name="vpc", icon="aws-vpc")
+        vpc.append(diagram.Node(name="proxy"), diagram.Node(name="service"))
+        users = entity_relationship.Entity(name="users")
+        users.add_attribute("id")
+        built.draw(io.StringIO())
+
+    dumped = json.loads(file.getvalue())
+    counts = {
+        phase: {kind: value["count"] for kind, value in kinds.items()}
+        for phase, kinds in dumped["phases"].items()
+    }
+    assert counts == {
+        "construct": {"Group": 1, "Node": 2, "Entity": 1},
+        "properties": {"Properties": 4},
+        "append": {"Group": 1, "Entity": 1},
+        "draw": {"Diagram": 1},
+        "render": {"Group": 1, "Node": 2, "Attribute": 1, "Entity": 1},
+    }
+    assert dumped["peak_registry_size"] == 3
+    assert stats.as_dict() == dumped
+    assert instrument.active.get() is None
+
+
+def test_instrument_is_disabled_by_default():
+    with Diagram():
+        diagram.Node(name="proxy").render()
+
+    assert instrument.active.get() is None
+
+
+def test_instrument_is_scoped_to_the_context():
+    def build(name: str, results: dict) -> None:
+        with Diagram(), instrument.instrument() as stats:
+            barrier.wait()
+            diagram.Node(name=name)
+            barrier.wait()
+        results[name] = stats.counts["construct"]
+
+    barrier = threading.Barrier(2)
+    results: dict = {}
+    threads = [
+        threading.Thread(target=build, args=(name, results))
+        for name in ("proxy", "service")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"proxy": {"Node": 1}, "service": {"Node": 1}}
+    assert instrument.active.get() is None
+
+
+def test_threads_record_in_a_copy_of_the_context():
+    def build(name: str) -> None:
+        with Diagram():
+            diagram.Node(name=name)
+
+    with instrument.instrument() as stats:
+        threads = [
+            threading.Thread(target=build, args=("ignored",)),
+            threading.Thread(
+                target=contextvars.copy_context().run, args=(build, "recorded")
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+    assert stats.counts["construct"] == {"Node": 1}
@@ -0,0 +1,113 @@
+import pytest
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser.pages import paginate, write_pages
+from diagrams.eraser.properties import Properties
+
+
+def build(groups: int = 4, nodes: int = 3) -> Diagram:
+    with Diagram() as built:
+        previous = None
+        for index in range(groups):
+            group = diagram.Group(name=f"group-{index}")
+            members = [
+                diagram.Node(name=f"node-{index}-{member}", icon="aws-ec2")
+                for member in range(nodes)
+            ]
+            group.append(*members)
+            if previous is not None:
+                previous.connect(members[0], label="next")
+            members[0].connect(members[1])
+            previous = members[-1]
+    return built
+
+
+def test_paginate_by_nodes():
+    pages = paginate(build(), max_nodes=8)
+
+    assert [len(page.roots) for page in pages] == [2, 2]
+    first = pages[0].render_to_string().splitlines()
+    assert "node-1-2 (page 2) [color: gray]" not in first
+    assert "node-0-0 > node-0-1" in first
+    assert "node-0-2 > node-1-0 : next" in first
+    assert "node-2-0 (page 2) [color: gray]" in first
+    assert "node-1-2 > node-2-0 (page 2) : next" in first
+
+    second = pages[1].render_to_string().splitlines()
+    assert second[-3:] == [
+        "node-2-0 > node-2-1",
+        "node-2-2 > node-3-0 : next",
+        "node-3-0 > node-3-1",
+    ]
+
+
+def test_paginate_by_bytes():
+    built = build(groups=20)
+
+    pages = paginate(built, max_bytes=300)
+
+    assert len(pages) > 1
+    for page in pages:
+        assert len(page.render_to_string().encode()) <= 300
+    drawn = [graph for page in pages for graph in page.roots]
+    assert drawn == list(built.registry(diagram.CloudArchitecture).roots())
+
+
+def test_paginate_keeps_oversized_groups_whole():
+    pages = paginate(build(groups=2, nodes=10), max_nodes=5)
+
+    assert [len(page.roots) for page in pages] == [1, 1]
+
+
+def test_pages_do_not_memoize_the_groups():
+    expected = build().render_to_string()
+    built = build()
+
+    pages = paginate(built, max_bytes=10_000)
+
+    assert len(pages) == 1
+    assert pages[0].render_to_string() == expected
+    groups = built.registry(diagram.CloudArchitecture).roots()
+    assert all(group._rendered is None for group in groups)
+
+
+def test_page_fingerprint_without_rendering(monkeypatch):
+    built = build()
+    pages = paginate(built, max_nodes=8)
+    before = [page.fingerprint() for page in pages]
+
+    def render(self):
+        raise AssertionError("rendered")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(diagram.Group, "walk", render)
+        patched.setattr(diagram.Node, "render", render)
+        assert [page.fingerprint() for page in pages] == before
+
+    assert before[0] != before[1]
+    assert [page.fingerprint() for page in paginate(build(), max_nodes=8)] == before
+    # the stubs depend on the pages of the targets
+    assert paginate(build(), max_nodes=4)[0].fingerprint() != before[0]
+    registry = built.registry(diagram.CloudArchitecture)
+    registry.get("node-2-1").properties = Properties.of(color="red")
+    assert [page.fingerprint() for page in pages] == [before[0], pages[1].fingerprint()]
+    assert pages[1].fingerprint() != before[1]
+
+
+def test_paginate_requires_a_limit():
+    with pytest.raises(ValueError):
+        paginate(build())
+
+
+def test_write_pages(tmp_path):
+    paths = write_pages(str(tmp_path / "network-{}.eraser"), build(), max_nodes=4)
+
+    assert [path.rsplit("-", 1)[1] for path in paths] == [
+        "1.eraser",
+        "2.eraser",
+        "3.eraser",
+        "4.eraser",
+    ]
+    with open(paths[-1], encoding="utf-8") as file:
+        assert file.read().startswith("group-3  {\n")
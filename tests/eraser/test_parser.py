@@ -0,0 +1,170 @@
+import io
+import mmap
+
+import pytest
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as cloud
+from diagrams.eraser import entity_relationship as er
+from diagrams.eraser import parser, sequence
+
+
+def build_cloud_architecture() -> Diagram:
+    with Diagram() as diagram:
+        gw = cloud.Node(name="gw", icon="aws-internet-gateway")
+        vpc = cloud.Group(name="vpc", icon="aws-vpc", color="blue")
+        public = cloud.Group(name="public subnet")
+        empty = cloud.Group(name="empty")
+        proxy = cloud.Node(name="proxy", icon="aws-ec2")
+        service = cloud.Node(name="service")
+        vpc.append(public, empty, service)
+        public.append(proxy)
+        vpc.connect(gw, cloud.ArrowType.RIGHT_TO_LEFT_ARROW)
+        proxy.connect(service, cloud.ArrowType.DOTTED_ARROW, label="http")
+        gw.connect(proxy, cloud.ArrowType.LINE)
+    return diagram
+
+
+def build_entity_relationship() -> Diagram:
+    with Diagram() as diagram:
+        users = er.Entity(name="users", icon="user")
+        users_id = users.add_attribute("id", "string", "pk")
+        users.add_attribute("email", "string")
+        users.add_attribute("nickname")
+        posts = er.Entity(name="posts")
+        posts.add_attribute("id", "", "pk")
+        posts_author = posts.add_attribute("author_id", "string")
+        er.Entity(name="empty")
+        users_id.one_to_many(posts_author)
+        posts_author.many_to_many(users_id)
+    return diagram
+
+
+def build_sequence() -> Diagram:
+    with Diagram() as diagram:
+        client = sequence.Node(name="client", icon="monitor")
+        server = sequence.Node(name="server")
+        client.request("SYN", server)
+        with sequence.Block("loop", "every second"):
+            server.activate()
+            server.response("SYN-ACK", client)
+            server.deactivate()
+        with sequence.Block("opt"):
+            client.do("something")
+            client.start_session("session", server)
+    return diagram
+
+
+@pytest.mark.parametrize(
+    "build, parse",
+    [
+        (build_cloud_architecture, parser.parse_cloud_architecture),
+        (build_entity_relationship, parser.parse_entity_relationship),
+        (build_sequence, parser.parse_sequence),
+    ],
+)
+def test_round_trip(build, parse):
+    content = build().render_to_string()
+
+    assert parse(io.StringIO(content)).render_to_string() == content
+
+
+@pytest.mark.parametrize("label", ["fetch [cached]", ""])
+def test_round_trip_relation_labels(label):
+    with Diagram() as diagram:
+        client = cloud.Node(name="client")
+        client.connect(cloud.Node(name="server"), label=label)
+        participant = sequence.Node(name="client")
+        participant.request(label, sequence.Node(name="server"))
+    content = diagram.render_to_string()
+
+    cloud_diagram = parser.parse_cloud_architecture(
+        io.StringIO(diagram.registry(cloud.CloudArchitecture).render_to_string())
+    )
+    sequence_diagram = parser.parse_sequence(
+        io.StringIO(diagram.registry(sequence.Sequence).render_to_string())
+    )
+
+    assert f"client > server : {label}\n" in content
+    registry = cloud_diagram.registry(cloud.CloudArchitecture)
+    assert list(registry.names) == ["client", "server"]
+    assert (
+        cloud_diagram.render_to_string() + sequence_diagram.render_to_string()
+        == content
+    )
+
+
+def test_round_trip_names_with_relation_tokens():
+    with Diagram() as diagram:
+        group = cloud.Group(name="a > b")
+        group.append(
+            cloud.Node(name="a - b", icon="x"),
+            cloud.Node(name="c --> d"),
+        )
+        cloud.Node(name="e <> f", color="blue")
+        sequence.Node(name="g - h")
+    content = diagram.render_to_string()
+
+    cloud_diagram = parser.parse_cloud_architecture(
+        io.StringIO(diagram.registry(cloud.CloudArchitecture).render_to_string())
+    )
+    sequence_diagram = parser.parse_sequence(
+        io.StringIO(diagram.registry(sequence.Sequence).render_to_string())
+    )
+
+    registry = cloud_diagram.registry(cloud.CloudArchitecture)
+    assert [child.name for child in registry.get("a > b").children] == [
+        "a - b",
+        "c --> d",
+    ]
+    assert (
+        cloud_diagram.render_to_string() + sequence_diagram.render_to_string()
+        == content
+    )
+
+
+def test_parse_the_object_model():
+    content = build_cloud_architecture().render_to_string()
+
+    diagram = parser.parse_cloud_architecture(content.splitlines())
+
+    registry = diagram.registry(cloud.CloudArchitecture)
+    vpc = registry.get("vpc")
+    assert isinstance(vpc, cloud.Group)
+    assert vpc.properties.color == "blue"
+    assert [child.name for child in vpc.children] == [
+        "public subnet",
+        "empty",
+        "service",
+    ]
+    assert registry.get("proxy").parent.name == "public subnet"
+
+
+def test_parse_files_and_memory_maps(tmp_path):
+    content = build_entity_relationship().render_to_string()
+    path = tmp_path / "diagram.eraser"
+    path.write_text(content, encoding="utf-8")
+
+    assert parser.parse_entity_relationship(path).render_to_string() == content
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            diagram = parser.parse_entity_relationship(buffer)
+    assert diagram.render_to_string() == content
+
+
+@pytest.mark.parametrize(
+    "parse, content",
+    [
+        (parser.parse_cloud_architecture, "vpc  {\nproxy \n"),
+        (parser.parse_cloud_architecture, "proxy \n}\n"),
+        (parser.parse_cloud_architecture, "proxy [size: large]\n"),
+        (parser.parse_cloud_architecture, "direction right\n"),
+        (parser.parse_cloud_architecture, "vpc {\nproxy > service\n}\n"),
+        (parser.parse_entity_relationship, "users  {\nid\n"),
+        (parser.parse_sequence, "loop  {\n"),
+        (parser.parse_sequence, "}\n"),
+    ],
+)
+def test_parse_errors(parse, content):
+    with pytest.raises(parser.ParseError):
+        parse(io.StringIO(content))
@@ -1,4 +1,7 @@
-from diagrams.eraser.properties import Properties
+import attrs
+import pytest
+
+from diagrams.eraser.properties import EMPTY_PROPERTIES, Properties
 
 
 def test_properties():
@@ -34,3 +37,20 @@ def test_properties_render_icon_color():
     assert props.icon == "any-icon"
     assert props.color == "#color"
     assert props.render() == "[icon: any-icon, color: #color]"
+
+
+def test_properties_are_immutable():
+    props = Properties(icon="any-icon")
+
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        props.icon = "another-icon"
+
+
+def test_properties_are_shared():
+    assert Properties.of() is EMPTY_PROPERTIES
+    assert Properties.of(icon="any-icon") is Properties.of(icon="any-icon")
+    assert Properties.of(icon="any-icon") == Properties(icon="any-icon")
+
+
+def test_properties_render_is_cached():
+    assert Properties(icon="any-icon").render() is Properties(icon="any-icon").render()
@@ -0,0 +1,155 @@
+import io
+import sys
+
+from diagrams.eraser import Diagram
+from diagrams.eraser.recorder import Recorder
+
+
+def record(recorder: Recorder, function, *args) -> str:
+    with recorder:
+        function(*args)
+    output = io.StringIO()
+    with Diagram() as built:
+        recorder.build()
+        built.draw(output)
+    return output.getvalue()
+
+
+def make_services(recorder: Recorder):
+    @recorder.participant("database", icon="database")
+    def query(sql):
+        return sql
+
+    @recorder.participant("api")
+    class Api:
+        def get(self, key):
+            self.check(key)
+            return query(key)
+
+        def check(self, key):
+            return key
+
+    @recorder.participant("client")
+    def client(count):
+        api = Api()
+        for index in range(count):
+            api.get(index % 1)
+
+    return client
+
+
+def test_recorder_draws_calls_between_participants():
+    recorder = Recorder()
+    client = make_services(recorder)
+
+    output = record(recorder, client, 1)
+
+    assert [line.rstrip() for line in output.splitlines()] == [
+        "client",
+        "api",
+        "database [icon: database]",
+        "client > api : get",
+        "activate api",
+        "api > database : query",
+        "activate database",
+        "deactivate database",
+        "deactivate api",
+    ]
+
+
+def test_recorder_collapses_repeated_calls():
+    recorder = Recorder()
+    client = make_services(recorder)
+
+    output = record(recorder, client, 3)
+
+    assert "loop [label: x 3] {" in output
+    assert output.count("client > api : get") == 1
+    assert recorder.calls[0][0][2][0][1] == 3
+
+
+def test_recorder_caps_recorded_calls():
+    recorder = Recorder(max_events=2)
+
+    @recorder.participant("worker")
+    def work(value):
+        return value
+
+    with recorder:
+        for value in range(5):
+            work(value)
+
+    # identical calls without nested calls are collapsed into one
+    assert len(recorder.calls) == 1
+    assert recorder.calls[0][1] == 5
+    assert recorder.dropped == 0
+
+    @recorder.participant("other")
+    def other():
+        pass
+
+    with recorder:
+        for _ in range(3):
+            other()
+            work(0)
+
+    assert len(recorder.calls) == 2
+    assert recorder.dropped == 5
+
+
+def test_recorder_samples_top_level_calls():
+    recorder = Recorder(sample_rate=0.0)
+    client = make_services(recorder)
+
+    with recorder:
+        client(2)
+
+    assert not recorder.calls
+
+
+def test_recorder_restores_previous_profile():
+    recorder = Recorder()
+    previous = sys.getprofile()
+
+    with recorder:
+        assert sys.getprofile() is not None
+
+    assert sys.getprofile() is previous
+
+
+def test_recorder_caps_nested_calls_globally():
+    recorder = Recorder(max_events=25)
+
+    # the calls alternate between two functions, so that none is collapsed
+    @recorder.participant("database")
+    class Database:
+        def read(self):
+            pass
+
+        def write(self):
+            pass
+
+    @recorder.participant("api")
+    class Api:
+        def get(self):
+            for _ in range(5):
+                Database().read()
+                Database().write()
+
+        def put(self):
+            self.get()
+
+    with recorder:
+        for _ in range(2):
+            Api().get()
+            Api().put()
+
+    def retained(calls):
+        return sum(1 + retained(nested) for (_, _, nested), _ in calls)
+
+    # `get` keeps 11 calls with the ones to the database, `put` 12
+    kept = [(call, count) for call, count, _ in recorder.calls]
+    assert retained(kept) == recorder._events == 23
+    assert recorder.dropped == 23
+    # the oldest calls are dropped first
+    assert [call[:2] for call, _ in kept] == [("api", "get"), ("api", "put")]
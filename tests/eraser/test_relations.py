@@ -0,0 +1,62 @@
+import pytest
+
+from diagrams.eraser.relations import (
+    ArrowType,
+    EdgeTable,
+    EntityRelationshipType,
+    Relations,
+)
+
+
+def test_edge_table_renders_like_relations():
+    edges = [
+        Relations(source="a", target="b", relation=ArrowType.LEFT_TO_RIGHT_ARROW),
+        Relations(source="b", target="c", relation=ArrowType.DOTTED_LINE),
+        Relations(source="c", target="a", relation=ArrowType.LINE, label="back"),
+        Relations(source="a", target="a", relation=ArrowType.BI_DIRECTIONAL_ARROW),
+    ]
+    table = EdgeTable(ArrowType)
+    for edge in edges:
+        table.add(edge.source, edge.target, edge.relation, edge.label)
+
+    assert len(table) == 4
+    assert table.names == ["a", "b", "c"]
+    assert table.render() == "\n".join(edge.render() for edge in edges)
+    assert list(table.iter_lines()) == [edge.render() for edge in edges]
+    assert list(table) == edges
+
+
+def test_edge_table_keeps_multiline_labels_whole():
+    table = EdgeTable(ArrowType)
+    table.add("a", "b", ArrowType.LEFT_TO_RIGHT_ARROW, "l1\nl2")
+    table.add("b", "c", ArrowType.LEFT_TO_RIGHT_ARROW)
+
+    assert list(table.iter_lines()) == ["a > b : l1\nl2", "b > c"]
+    assert table.render_lines(1, 2) == ["b > c"]
+
+
+def test_edge_table_blocks():
+    table = EdgeTable(EntityRelationshipType)
+    table.extend(
+        (f"a.{index}" for index in range(10)),
+        (f"b.{index}" for index in range(10)),
+        EntityRelationshipType.ONE_TO_MANY,
+    )
+
+    blocks = list(table.iter_blocks(block_size=4))
+
+    assert len(blocks) == 3
+    assert "\n".join(blocks) == table.render()
+    assert blocks[-1] == "a.8 < b.8\na.9 < b.9"
+
+
+def test_edge_table_rejects_mismatched_columns():
+    table = EdgeTable(ArrowType)
+
+    with pytest.raises(ValueError):
+        table.extend(["a", "b"], ["c"], ArrowType.LINE)
+    with pytest.raises(ValueError):
+        table.extend(["a"], ["c"], ArrowType.LINE, labels=[])
+
+    assert len(table) == 0
+    assert table.labels is None
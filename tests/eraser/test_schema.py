@@ -0,0 +1,72 @@
+import io
+import sqlite3
+
+from diagrams.eraser import schema
+
+DDL = """
+CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    team_id INTEGER REFERENCES teams,
+    manager_id INTEGER,
+    FOREIGN KEY (manager_id) REFERENCES users (id)
+);
+CREATE VIEW names AS SELECT name FROM teams;
+"""
+
+EXPECTED = (
+    "teams  {\nid INTEGER pk\nname TEXT\n}\n"
+    "users  {\nid INTEGER pk\nteam_id INTEGER fk\nmanager_id INTEGER fk\n}\n"
+    "users.team_id > teams.id\nusers.manager_id > users.id\n"
+)
+
+
+def test_from_ddl():
+    diagram = schema.from_ddl(io.StringIO(DDL))
+
+    assert diagram.render_to_string() == EXPECTED
+
+
+def test_from_sqlite_file(tmp_path):
+    path = tmp_path / "schema.db"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(DDL)
+    connection.close()
+
+    assert schema.from_sqlite(path).render_to_string() == EXPECTED
+
+
+def test_stream_a_database():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(DDL)
+
+    fragments = schema.iter_fragments(connection)
+    first = next(fragments)
+    file = io.StringIO()
+    schema.write(connection, file)
+
+    assert first == "teams  {\nid INTEGER pk\nname TEXT\n}"
+    assert file.getvalue() == EXPECTED
+
+
+def test_implied_keys_of_several_foreign_keys():
+    ddl = """
+    CREATE TABLE teams (id INTEGER PRIMARY KEY);
+    CREATE TABLE regions (code TEXT, number INTEGER, PRIMARY KEY (code, number));
+    CREATE TABLE matches (
+        home_id INTEGER REFERENCES teams,
+        away_id INTEGER REFERENCES teams,
+        code TEXT,
+        number INTEGER,
+        FOREIGN KEY (code, number) REFERENCES regions
+    );
+    """
+
+    lines = schema.from_ddl(io.StringIO(ddl)).render_to_string().splitlines()
+
+    assert lines[-4:] == [
+        "matches.home_id > teams.id",
+        "matches.away_id > teams.id",
+        "matches.code > regions.code",
+        "matches.number > regions.number",
+    ]
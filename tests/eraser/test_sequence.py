@@ -76,3 +76,33 @@ def test_relations_must_be_drawn_after_nodes(stdout):
     # draws nodes first
     assert "client [icon: monitor]" in stdout[:2]
     assert "service [icon: service]" in stdout[:2]
+
+
+def test_late_participants_are_drawn_first():
+    client = diagram.Node(name="client")
+    service = diagram.Node(name="service")
+    client.request("query", service)
+    with diagram.Block("loop", "retry"):
+        database = diagram.Node(name="database")
+        service.request("select", database)
+
+    assert diagram.Sequence.render_to_string().splitlines() == [
+        "client ",
+        "service ",
+        "database ",
+        "client > service : query",
+        "loop [label: retry] {",
+        "service > database : select",
+        "}",
+    ]
+
+
+def test_render_to_string():
+    client = diagram.Node(name="client")
+    server = diagram.Node(name="server")
+
+    client.request("request", server)
+
+    assert diagram.Sequence.render_to_string() == (
+        "client \nserver \nclient > server : request\n"
+    )
@@ -0,0 +1,76 @@
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as diagram
+from diagrams.eraser.simplify import simplify
+
+
+def build() -> Diagram:
+    with Diagram() as built:
+        vpc = diagram.Group(name="vpc")
+        subnet = diagram.Group(name="subnet")
+        web = [diagram.Node(name=f"web-{index}", icon="aws-ec2") for index in range(3)]
+        database = diagram.Node(name="database", icon="aws-rds")
+        subnet.append(*web)
+        vpc.append(subnet, database)
+        gateway = diagram.Node(name="gateway")
+        for node in web:
+            gateway.connect(node, label="http")
+            node.connect(database)
+        web[0].connect(web[1])
+    return built
+
+
+def lines(built: Diagram) -> list[str]:
+    return [line.rstrip() for line in built.render_to_string().splitlines()]
+
+
+def test_simplify_keeps_the_graphs():
+    built = build()
+
+    assert lines(simplify(built, merge_connections=False)) == lines(built)
+
+
+def test_simplify_merges_duplicate_connections():
+    with Diagram() as built:
+        proxy = diagram.Node(name="proxy")
+        service = diagram.Node(name="service")
+        for _ in range(3):
+            proxy.connect(service, label="http")
+        proxy.connect(service)
+        service.connect(proxy)
+
+    assert lines(simplify(built))[2:] == [
+        "proxy > service : x4",
+        "service > proxy",
+    ]
+
+
+def test_simplify_collapses_deep_groups():
+    built = build()
+    before = built.render_to_string()
+
+    assert lines(simplify(built, max_depth=1)) == [
+        "vpc  {",
+        "subnet",
+        "database [icon: aws-rds]",
+        "}",
+        "gateway",
+        "gateway > subnet : http x3",
+        "subnet > database : x3",
+    ]
+    assert built.render_to_string() == before
+
+
+def test_simplify_aggregates_nodes_by_key():
+    built = build()
+
+    assert lines(simplify(built, aggregate_by=lambda node: node.properties.icon)) == [
+        "vpc  {",
+        "subnet  {",
+        "aws-ec2 x3 [icon: aws-ec2]",
+        "}",
+        "database [icon: aws-rds]",
+        "}",
+        "gateway",
+        "gateway > aws-ec2 x3 : http x3",
+        "aws-ec2 x3 > database : x3",
+    ]
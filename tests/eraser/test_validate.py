@@ -0,0 +1,79 @@
+import pytest
+
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as cloud
+from diagrams.eraser import entity_relationship as er
+from diagrams.eraser import sequence
+from diagrams.eraser.validate import Problem, ValidationError, check, validate
+
+
+def test_valid_diagram():
+    with Diagram() as diagram:
+        vpc = cloud.Group(name="vpc")
+        proxy = cloud.Node(name="proxy")
+        vpc.append(proxy, cloud.Node(name="service"))
+        proxy.connect(vpc)
+        cloud.Connection(source="proxy", target="service")
+
+        users = er.Entity(name="users")
+        users.add_attribute("id", "int")
+        er.relationships_from_rows([("users", "id", "users", "id")])
+
+        client = sequence.Node(name="client")
+        with sequence.Block("loop"):
+            client.request("get", sequence.Node(name="server"))
+
+    assert validate(diagram) == []
+    check(diagram)
+
+
+def test_dangling_references():
+    with Diagram() as diagram:
+        proxy = cloud.Node(name="proxy")
+        cloud.CloudArchitecture.registry().connections.add(
+            "proxy", "missing", cloud.ArrowType.DEFAULT
+        )
+        cloud.Connection(source="gateway", target="proxy")
+        er.relationships_from_rows([("users", "id", "posts", "user_id")])
+        sequence.Activation("server")
+        proxy.connect(proxy)
+
+    assert validate(diagram) == [
+        Problem("dangling", "`gateway` is referenced but not declared"),
+        Problem("dangling", "`missing` is referenced but not declared"),
+        Problem("dangling", "`users.id` is referenced but not declared"),
+        Problem("dangling", "`posts.user_id` is referenced but not declared"),
+        Problem("dangling", "`server` is referenced but not declared"),
+    ]
+
+
+def test_duplicates_and_cycles():
+    with Diagram():
+        first, second = cloud.Group(name="first"), cloud.Group(name="second")
+        node = cloud.Node(name="node")
+        first.append(node)
+        second.append(node)
+
+        outer, inner = cloud.Group(name="outer"), cloud.Group(name="inner")
+        outer.append(inner)
+        inner.append(outer)
+
+        assert validate(cloud.CloudArchitecture) == [
+            Problem("duplicate", "`node` is drawn more than once"),
+            Problem("cycle", "`outer` > `inner` > `outer` contain each other"),
+        ]
+
+
+def test_unbalanced_blocks():
+    with Diagram() as diagram:
+        sequence.EndGroup()
+        sequence.StartGroup("loop", "x 3")
+        sequence.StartGroup("alt", "")
+
+    with pytest.raises(ValidationError) as error:
+        check(diagram)
+
+    assert error.value.problems == [
+        Problem("unbalanced", "a block is ended but not started"),
+        Problem("unbalanced", "2 block(s) are never ended"),
+    ]
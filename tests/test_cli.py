@@ -0,0 +1,66 @@
+import os
+
+from diagrams import cli
+
+SCRIPT = """
+from diagrams.eraser import cloud_architecture as diagram
+
+proxy = diagram.Node(name="proxy")
+proxy.connect(diagram.Node(name="{target}"))
+
+if __name__ == "__main__":
+    diagram.CloudArchitecture.draw()
+"""
+
+
+def run(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    return cli.main([str(tmp_path / "diagrams"), "--manifest", str(manifest)])
+
+
+def test_render_scripts_to_files(tmp_path, capsys):
+    directory = tmp_path / "diagrams"
+    directory.mkdir()
+    (directory / "web.py").write_text(SCRIPT.format(target="web"))
+    (directory / "api.py").write_text(SCRIPT.format(target="api"))
+    (directory / "_helpers.py").write_text("raise RuntimeError")
+
+    assert run(tmp_path) == 0
+    assert (directory / "web.eraser").read_text() == "proxy \nweb \nproxy > web\n"
+    assert (directory / "api.eraser").read_text() == "proxy \napi \nproxy > api\n"
+    assert "2 rendered, 0 skipped, 0 failed" in capsys.readouterr().out
+
+    (directory / "api.py").write_text(SCRIPT.format(target="service"))
+    assert run(tmp_path) == 0
+    assert "1 rendered, 1 skipped, 0 failed" in capsys.readouterr().out
+    assert (directory / "api.eraser").read_text().endswith("proxy > service\n")
+
+    # touched but unchanged, compared by hash
+    os.utime(directory / "web.py", ns=(0, 0))
+    assert run(tmp_path) == 0
+    assert "0 rendered, 2 skipped, 0 failed" in capsys.readouterr().out
+
+
+def test_report_failing_scripts(tmp_path, capsys):
+    directory = tmp_path / "diagrams"
+    directory.mkdir()
+    (directory / "broken.py").write_text("raise ValueError('broken')")
+
+    assert run(tmp_path) == 1
+    output = capsys.readouterr().out
+    assert "ValueError('broken')" in output
+    assert "0 rendered, 0 skipped, 1 failed" in output
+
+
+def test_report_exiting_scripts(tmp_path, capsys):
+    directory = tmp_path / "diagrams"
+    directory.mkdir()
+    (directory / "web.py").write_text(SCRIPT.format(target="web"))
+    (directory / "exits.py").write_text("import sys\n\nsys.exit(0)\n")
+
+    assert run(tmp_path) == 1
+    output = capsys.readouterr().out
+    assert "the script exited with 0" in output
+    assert "1 rendered, 0 skipped, 1 failed" in output
+    assert (directory / "web.eraser").exists()
+    assert (tmp_path / "manifest.json").exists()
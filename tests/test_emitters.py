@@ -0,0 +1,125 @@
+import pytest
+
+from diagrams import ir
+from diagrams.emitters import EMITTERS, Emitter, emit, register
+from diagrams.eraser import Diagram
+from diagrams.eraser import cloud_architecture as cloud
+from diagrams.eraser import entity_relationship as er
+from diagrams.eraser import sequence
+from diagrams.eraser.properties import NotSupportedError
+
+
+@pytest.fixture(name="diagram")
+def fixture_diagram() -> Diagram:
+    with Diagram() as diagram:
+        vpc = cloud.Group(name="vpc", icon="aws-vpc")
+        proxy = cloud.Node(name="proxy", icon="aws-ec2")
+        service = cloud.Node(name="service")
+        vpc.append(proxy, cloud.Group(name="empty"))
+        proxy.connect(service, label="http")
+        service.connect(vpc, cloud.ArrowType.DOTTED_LINE)
+
+        users = er.Entity(name="users")
+        users.add_attribute("id", "int", "pk")
+        posts = er.Entity(name="posts", color="blue")
+        posts.add_attribute("id", "", "pk")
+        posts.add_attribute("user_id", "int", "fk")
+        er.relationships_from_rows([("posts", "user_id", "users", "id")])
+
+        client = sequence.Node(name="client")
+        server = sequence.Node(name="server")
+        client.request("get", server)
+        with sequence.Block("loop", "x 3"):
+            server.do("work")
+    return diagram
+
+
+def test_eraser_emitter_matches_the_drawn_diagram(diagram):
+    outputs = emit(ir.build(diagram), "eraser")
+
+    assert outputs["eraser"] == diagram.render_to_string()
+
+
+def test_build_a_diagram_type():
+    with Diagram():
+        cloud.Node(name="proxy")
+        section = ir.build(cloud.CloudArchitecture).sections[0]
+
+    assert section == ir.Section("cloud_architecture", [ir.Node("proxy")])
+
+
+def test_mermaid_emitter(diagram):
+    lines = emit(ir.build(diagram), "mermaid")["mermaid"].splitlines()
+
+    assert lines[:8] == [
+        "flowchart LR",
+        '    subgraph vpc["vpc"]',
+        '        proxy["proxy"]',
+        '        subgraph empty["empty"]',
+        "        end",
+        "    end",
+        '    service["service"]',
+        '    proxy -->|"http"| service',
+    ]
+    assert '    posts }o--|| users : "user_id"' in lines
+    assert "        int user_id FK" in lines
+    assert "    loop x 3" in lines
+    assert "        server-->>server: work" in lines
+
+
+def test_plantuml_emitter(diagram):
+    output = emit(ir.build(diagram), "plantuml")["plantuml"]
+
+    assert output.count("@startuml") == output.count("@enduml") == 3
+    assert 'rectangle "vpc" as vpc {\n  node "proxy" as proxy\n' in output
+    assert "service .. vpc\n" in output
+    assert "  * id : int <<pk>>\n" in output
+    assert "client -> server : get\n" in output
+
+
+def test_identifiers_are_unique():
+    with Diagram() as diagram:
+        web = cloud.Node(name="web-1")
+        web.connect(cloud.Node(name="web_1"))
+        cloud.Node(name="web 1")
+
+    lines = emit(ir.build(diagram), "mermaid")["mermaid"].splitlines()
+
+    assert lines == [
+        "flowchart LR",
+        '    web_1["web-1"]',
+        '    web_1_2["web_1"]',
+        '    web_1_3["web 1"]',
+        "    web_1 --> web_1_2",
+    ]
+
+
+def test_dot_emitter(diagram):
+    output = emit(ir.build(diagram), "dot")["dot"]
+
+    assert '  subgraph "cluster_vpc" {\n    label="vpc";\n    "proxy";\n' in output
+    assert '  "service" -> "vpc" [dir=none, style=dashed];\n' in output
+    assert '  "posts" [label="{posts|id pk|user_id int fk}"];\n' in output
+    assert '  "client" -> "server" [label="1. get"];\n' in output
+
+
+def test_register_an_emitter(diagram):
+    @register
+    class NamesEmitter(Emitter):
+        name = "names"
+
+        def cloud_architecture(self, section):
+            for item in section.items:
+                yield item.name
+
+    try:
+        with Diagram() as names:
+            cloud.Node(name="proxy")
+            cloud.Node(name="service")
+
+        assert EMITTERS["names"] is NamesEmitter
+        assert emit(ir.build(names), "names") == {"names": "proxy\nservice\n"}
+        with pytest.raises(NotSupportedError):
+            emit(ir.build(diagram), "names")
+    finally:
+        del EMITTERS["names"]